@@ -0,0 +1,212 @@
+"""
+Columnar OHLCV ring buffer
+——————————————————————————
+• one preallocated float64 column per field, no per-bar Python objects
+• ``window(n)`` returns contiguous zero-copy views of the last *n* bars
+• iterating / indexing still yields ``(o, h, l, c)`` tuples for old callers
+• ``BarRollup`` derives 5m/15m/1h bars incrementally from closed 1m bars
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator, NamedTuple, Tuple
+
+try:
+    import numpy as _np
+
+    _HAVE_NP = hasattr(_np, "frombuffer")
+except ImportError:  # pragma: no cover - numpy is a hard dependency
+    _HAVE_NP = False
+
+FIELDS = ("ts", "open", "high", "low", "close", "volume", "trades")
+
+
+class Bar(NamedTuple):
+    """Closed OHLCV bar keyed by its exchange-time start (epoch seconds)."""
+
+    ts: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    trades: int
+
+
+class BarWindow(NamedTuple):
+    """Column views over the last *n* bars, oldest first.
+
+    Each field is a float64 NumPy array sharing the store's memory (a
+    ``memoryview`` when NumPy is unavailable). Views stay valid until the
+    store compacts, so copy anything held across bar closes.
+    """
+
+    ts: object
+    open: object
+    high: object
+    low: object
+    close: object
+    volume: object
+    trades: object
+
+
+class BarStore:
+    """Fixed-capacity bar history for one symbol.
+
+    Rows are written to the end of ``capacity + slack`` preallocated slots;
+    when the tail is reached the newest ``capacity`` rows are moved back to
+    the front in one memmove, so the last *n* rows are always contiguous.
+    """
+
+    def __init__(self, capacity: int, slack: int | None = None):
+        self.capacity = capacity
+        self._slots = capacity + (slack or max(capacity // 4, 1))
+        zeros = bytes(8 * self._slots)
+        self._cols = {f: array("d", zeros) for f in FIELDS}
+        self._start = 0
+        self._end = 0
+        self.seq = 0  # bars ever appended; bumps on every close
+
+    @classmethod
+    def from_bars(
+        cls, bars: Iterable[Tuple[float, float, float, float]], capacity: int = 5_000
+    ) -> "BarStore":
+        """Build a store from ``(o, h, l, c)`` tuples (tests, fixtures)."""
+        store = cls(capacity)
+        for i, (o, h, low, c) in enumerate(bars):
+            store.append(Bar(float(i), o, h, low, c, 0.0, 0))
+        return store
+
+    # ————— writes —————
+    def append(self, bar: Bar) -> None:
+        if self._end == self._slots:
+            self._compact()
+        i = self._end
+        for f, v in zip(FIELDS, bar):
+            self._cols[f][i] = v
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+        self.seq += 1
+
+    def replace_last(self, bar: Bar) -> None:
+        """Overwrite the newest bar in place (merging a partial minute)."""
+        i = self._end - 1
+        for f, v in zip(FIELDS, bar):
+            self._cols[f][i] = v
+        self.seq += 1
+
+    def _compact(self) -> None:
+        n = self._end - self._start
+        for col in self._cols.values():
+            col[0:n] = col[self._start : self._end]
+        self._start, self._end = 0, n
+
+    # ————— reads —————
+    def window(self, n: int | None = None) -> BarWindow:
+        """Zero-copy column views of the last *n* bars (all when ``None``)."""
+        size = self._end - self._start
+        n = size if n is None else max(0, min(n, size))
+        lo, hi = self._end - n, self._end
+        views = []
+        for f in FIELDS:
+            mv = memoryview(self._cols[f])[lo:hi]
+            views.append(_np.frombuffer(mv, dtype=_np.float64) if _HAVE_NP else mv)
+        return BarWindow(*views)
+
+    def last(self) -> Bar | None:
+        if self._end == self._start:
+            return None
+        i = self._end - 1
+        ts, o, h, low, c, v, n = (self._cols[f][i] for f in FIELDS)
+        return Bar(ts, o, h, low, c, v, int(n))
+
+    def nbytes(self) -> int:
+        return sum(col.itemsize * len(col) for col in self._cols.values())
+
+    # ————— ``minute_bars()`` compatibility: sequence of (o, h, l, c) —————
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __bool__(self) -> bool:
+        return self._end > self._start
+
+    def __getitem__(self, idx):
+        size = self._end - self._start
+        if isinstance(idx, slice):
+            return [self[j] for j in range(*idx.indices(size))]
+        if idx < 0:
+            idx += size
+        if not 0 <= idx < size:
+            raise IndexError("bar index out of range")
+        i = self._start + idx
+        c = self._cols
+        return (c["open"][i], c["high"][i], c["low"][i], c["close"][i])
+
+    def __iter__(self) -> Iterator[Tuple[float, float, float, float]]:
+        c = self._cols
+        o, h, low, cl = c["open"], c["high"], c["low"], c["close"]
+        for i in range(self._start, self._end):
+            yield (o[i], h[i], low[i], cl[i])
+
+
+class BarRollup:
+    """Higher-timeframe bars folded in O(1) from each closed base bar.
+
+    A rollup bar closes as soon as the last base bar of its bucket arrives
+    (or, after a gap, on the first bar of a later bucket). Re-sending the
+    newest base bar with the same ``ts`` revises it in place.
+    """
+
+    def __init__(self, seconds: int, capacity: int, base_sec: int = 60):
+        self.seconds = seconds
+        self.base_sec = base_sec
+        self.store = BarStore(capacity)
+        self._cur: list | None = None
+        self._last_in: Bar | None = None
+
+    def update(self, bar: Bar) -> Bar | None:
+        """Fold *bar* in; return the rollup bar it closed, if any."""
+        prev, self._last_in = self._last_in, bar
+        if prev is not None and bar.ts == prev.ts:
+            self._revise(prev, bar)
+            return None
+        start = bar.ts - bar.ts % self.seconds
+        closed = None
+        cur = self._cur
+        if cur is not None and start != cur[0]:
+            closed = self._close()
+            cur = None
+        if cur is None:
+            self._cur = [start, *bar[1:]]
+        else:
+            cur[2] = max(cur[2], bar.high)
+            cur[3] = min(cur[3], bar.low)
+            cur[4] = bar.close
+            cur[5] += bar.volume
+            cur[6] += bar.trades
+        if bar.ts + self.base_sec >= start + self.seconds:
+            closed = self._close()
+        return closed
+
+    def partial(self) -> Bar | None:
+        """The still-forming rollup bar, if any."""
+        return Bar(*self._cur) if self._cur is not None else None
+
+    def _close(self) -> Bar:
+        bar = Bar(*self._cur)
+        self._cur = None
+        self.store.append(bar)
+        return bar
+
+    def _revise(self, prev: Bar, bar: Bar) -> None:
+        reopened = self._cur is None
+        cur = list(self.store.last()) if reopened else self._cur
+        cur[2] = max(cur[2], bar.high)
+        cur[3] = min(cur[3], bar.low)
+        cur[4] = bar.close
+        cur[5] += bar.volume - prev.volume
+        cur[6] += bar.trades - prev.trades
+        if reopened:
+            self.store.replace_last(Bar(*cur))
@@ -0,0 +1,104 @@
+"""
+Cross-symbol batch indicators
+—————————————————————————————
+• ``BarMatrix`` keeps the last ``WINDOW`` closed bars of every symbol as
+  (symbols × window) float64 arrays, updated in place on bar close
+• ``bar_features`` evaluates ATR, volatility, momentum and breakout for all
+  symbols in a few vectorised NumPy passes instead of per-symbol Python
+• results are memoised per matrix version, so between bar closes a cycle
+  only pays for indexing
+• same definitions and warm-up rules as ``indicators.Indicators``
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from atlasbot.bar_store import Bar
+from atlasbot.indicators import (
+    ATR_PERIOD,
+    BREAKOUT_WINDOW,
+    MOMENTUM_WINDOW,
+    VOL_PERIOD,
+)
+
+WINDOW = max(ATR_PERIOD + 1, VOL_PERIOD, MOMENTUM_WINDOW, BREAKOUT_WINDOW + 1)
+
+
+class BarMatrix:
+    """Newest ``window`` bars per symbol, oldest column first, NaN-padded."""
+
+    def __init__(self, symbols: Sequence[str], window: int = WINDOW):
+        self.symbols: List[str] = list(symbols)
+        self.rows: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self.window = window
+        shape = (len(self.symbols), window)
+        self.open = np.full(shape, np.nan)
+        self.high = np.full(shape, np.nan)
+        self.low = np.full(shape, np.nan)
+        self.close = np.full(shape, np.nan)
+        self.count = np.zeros(len(self.symbols), dtype=np.int64)
+        self._last_ts: List[float | None] = [None] * len(self.symbols)
+        self.version = 0
+        self._lock = threading.Lock()
+        self._features: Dict[str, np.ndarray] | None = None
+        self._features_version = -1
+
+    def seed(self, sym: str, bars: Iterable[Bar]) -> None:
+        for bar in bars:
+            self.update(sym, bar)
+
+    def update(self, sym: str, bar: Bar) -> None:
+        """Shift in a closed bar; a repeated ``ts`` revises the newest column."""
+        i = self.rows.get(sym)
+        if i is None:
+            return
+        cols = (self.open, self.high, self.low, self.close)
+        with self._lock:
+            if bar.ts != self._last_ts[i]:
+                for col in cols:
+                    col[i, :-1] = col[i, 1:]
+                self.count[i] += 1
+                self._last_ts[i] = bar.ts
+            for col, v in zip(cols, (bar.open, bar.high, bar.low, bar.close)):
+                col[i, -1] = v
+            self.version += 1
+
+    def features(self) -> Dict[str, np.ndarray]:
+        """``bar_features`` of the current bars, recomputed only after a close."""
+        with self._lock:
+            if self._features_version != self.version:
+                self._features = bar_features(self)
+                self._features_version = self.version
+            return self._features
+
+
+def bar_features(m: BarMatrix) -> Dict[str, np.ndarray]:
+    """ATR, volatility, momentum and breakout for every row of *m*."""
+    o, h, low, c, n = m.open, m.high, m.low, m.close, m.count
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = ATR_PERIOD
+        pc = c[:, -p - 1 : -1]
+        tr = np.maximum(h[:, -p:], pc) - np.minimum(low[:, -p:], pc)
+        atr = np.where(n >= p + 1, tr.sum(axis=1) / p, np.nan)
+
+        cw = c[:, -VOL_PERIOD:]
+        dev = np.abs(cw - cw.sum(axis=1, keepdims=True) / VOL_PERIOD)
+        vol = np.where(n >= VOL_PERIOD, dev.sum(axis=1) / VOL_PERIOD, np.nan)
+
+        k = MOMENTUM_WINDOW
+        tp = (o[:, -k:] + h[:, -k:] + low[:, -k:] + c[:, -k:]) / 4
+        denom = tp.max(axis=1) - tp.min(axis=1)
+        score = np.clip((tp[:, -1] - tp[:, 0]) / denom, -1.0, 1.0)
+        mom = np.where((n >= k) & (denom != 0), score, 0.0)
+
+        b = BREAKOUT_WINDOW
+        prev, last = c[:, -b - 1 : -1], c[:, -1]
+        brk = np.where(
+            last > prev.max(axis=1), 1.0, np.where(last < prev.min(axis=1), -1.0, 0.0)
+        )
+        brk = np.where(n > b, brk, 0.0)
+    return {"atr": atr, "volatility": vol, "momentum": mom, "breakout": brk}
@@ -0,0 +1,85 @@
+"""
+On-disk 1-minute candle cache
+—————————————————————————————
+• one append-only file per symbol of fixed 48-byte float64 records
+  ``(ts, low, high, open, close, volume)`` – Coinbase ``/candles`` order
+• read back through ``mmap`` so a restart only has to fetch the missing tail
+• only completed minutes are stored; files are trimmed to ``keep`` records
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from pathlib import Path
+from typing import List, Sequence
+
+CACHE_DIR = Path(os.getenv("CANDLE_CACHE_DIR", "data/candles"))
+FIELDS = 6
+RECORD = 8 * FIELDS
+
+
+class CandleCache:
+    def __init__(self, root: Path | str = CACHE_DIR, keep: int = 5_000):
+        self.root = Path(root)
+        self.keep = keep
+
+    def _path(self, sym: str) -> Path:
+        return self.root / f"{sym}.bin"
+
+    def load(self, sym: str) -> List[tuple]:
+        """Cached rows for *sym*, oldest first."""
+        path = self._path(sym)
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return []
+        size -= size % RECORD  # ignore a torn trailing write
+        if not size:
+            return []
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mm:
+            view = memoryview(mm)[:size].cast("d")
+            try:
+                vals = view.tolist()
+            finally:
+                view.release()
+        return [tuple(vals[i : i + FIELDS]) for i in range(0, len(vals), FIELDS)]
+
+    def last_ts(self, sym: str) -> float | None:
+        path = self._path(sym)
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                end = f.tell() - f.tell() % RECORD
+                if not end:
+                    return None
+                f.seek(end - RECORD)
+                return array("d", f.read(8))[0]
+        except FileNotFoundError:
+            return None
+
+    def append(self, sym: str, rows: Sequence[Sequence[float]]) -> None:
+        """Append completed candles (oldest first) and trim to ``keep``."""
+        if not rows:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        buf = array("d", [float(v) for row in rows for v in row[:FIELDS]])
+        path = self._path(sym)
+        with open(path, "ab") as f:
+            f.write(buf.tobytes())
+        if path.stat().st_size > 2 * self.keep * RECORD:
+            tail = self.load(sym)[-self.keep :]
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(array("d", [v for row in tail for v in row]).tobytes())
+            os.replace(tmp, path)
+
+    def clear(self, sym: str) -> None:
+        """Drop *sym*'s cache (e.g. when it is too stale to extend)."""
+        try:
+            self._path(sym).unlink()
+        except FileNotFoundError:
+            pass
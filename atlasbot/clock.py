@@ -0,0 +1,109 @@
+"""
+Injectable clock
+————————————————
+• ``get_clock()`` is the process-wide time source – wall time by default,
+  a stepped ``VirtualClock`` with ``CLOCK_MODE=virtual`` (sim sessions)
+• ``VirtualClock`` runs on simulated time: ``sleep`` advances it instead of
+  blocking, optionally through a *pump* that feeds recorded market events up
+  to the wake-up time (see ``atlasbot.replay``)
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+CLOCK_MODE = os.getenv("CLOCK_MODE", "wall").lower()
+
+
+class Clock:
+    """Wall-clock time source."""
+
+    def now(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Simulated time that only moves when advanced.
+
+    With a *pump* installed, ``sleep`` on the driver thread calls
+    ``pump(wake_at)`` so events due before the wake-up are processed first;
+    other threads block until the driver has advanced past their wake-up.
+    Without a pump, sleeping simply jumps the clock forward.
+    """
+
+    def __init__(self, start: float = 0.0):
+        self._now = start
+        self._cond = threading.Condition()
+        self._pump: Callable[[float], None] | None = None
+        self._driver: int | None = None
+
+    def now(self) -> float:
+        return self._now
+
+    monotonic = now
+
+    def set_pump(self, pump: Callable[[float], None] | None) -> None:
+        """Drive the clock with *pump* from the calling thread."""
+        self._pump = pump
+        self._driver = threading.get_ident() if pump is not None else None
+
+    def advance_to(self, t: float) -> None:
+        if t <= self._now:
+            return
+        with self._cond:
+            self._now = t
+            self._cond.notify_all()
+
+    def sleep(self, seconds: float) -> None:
+        wake = self._now + max(seconds, 0.0)
+        if self._pump is None:
+            self.advance_to(wake)
+        elif threading.get_ident() == self._driver:
+            self._pump(wake)
+            self.advance_to(wake)
+        else:
+            with self._cond:
+                while self._now < wake and self._pump is not None:
+                    self._cond.wait(1.0)
+
+
+_clock: Clock = VirtualClock(time.time()) if CLOCK_MODE == "virtual" else Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Install *clock* process-wide and return the previous one."""
+    global _clock
+    prev, _clock = _clock, clock
+    return prev
+
+
+def now() -> float:
+    """Epoch seconds on the active clock."""
+    return _clock.now()
+
+
+def utcnow() -> datetime:
+    """Aware UTC ``datetime`` on the active clock."""
+    return datetime.fromtimestamp(_clock.now(), timezone.utc)
+
+
+def monotonic() -> float:
+    return _clock.monotonic()
+
+
+def sleep(seconds: float) -> None:
+    _clock.sleep(seconds)
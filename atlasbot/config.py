@@ -14,6 +14,14 @@ FEE_BPS_MAKER = 0
 FEE_BPS_TAKER = 25
 FEE_FLAT = 0.10
 MIN_EDGE_BPS = int(os.getenv("MIN_EDGE_BPS", "5"))
+# evaluate signals as one vectorised batch from this many symbols upward
+BATCH_MIN_SYMBOLS = int(os.getenv("BATCH_MIN_SYMBOLS", "32"))
+# worker threads for DecisionEngine.next_advice_many
+ADVICE_WORKERS = int(os.getenv("ADVICE_WORKERS", "8"))
+# signals whose |weight| is below this are not evaluated
+SIGNAL_MIN_WEIGHT = float(os.getenv("SIGNAL_MIN_WEIGHT", "0.001"))
+# symbols whose last price is older than this many seconds are not traded
+STALE_PRICE_SEC = float(os.getenv("STALE_PRICE_SEC", "120"))
 FALLBACK_DELAY = float(os.getenv("FALLBACK_DELAY", "1.5"))
 TARGET_VOL_BPS = 35
 CURRENT_TAKER_BPS = FEE_BPS_TAKER
@@ -91,12 +99,12 @@ def refresh_fee_tier() -> None:
     global CURRENT_MAKER_BPS, CURRENT_TAKER_BPS, MIN_EDGE_BPS, _last_fee_check
     import time
 
-    import requests
+    from atlasbot import http_client as http
 
     if time.time() - _last_fee_check < 3600:
         return
     try:
-        r = requests.get("https://api.exchange.coinbase.com/fees", timeout=5)
+        r = http.get("https://api.exchange.coinbase.com/fees", timeout=5)
         if r.ok:
             j = r.json()
             CURRENT_MAKER_BPS = int(float(j.get("maker_fee_rate", 0)) * 10_000)
@@ -1,127 +1,302 @@
 import json
 import os
+import threading
 import time
-from collections import defaultdict, deque
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
 from math import exp
 from pathlib import Path
 
+import numpy as np
 from numpy import corrcoef as _corr
 
-from atlasbot import risk
+from atlasbot import clock, risk
 from atlasbot.config import (
+    ADVICE_WORKERS,
     BREAKOUT_WEIGHT,
     FEE_BPS_MAKER,
     MIN_EDGE_BPS,
+    SIGNAL_MIN_WEIGHT,
     SLIPPAGE_BPS,
     W_MACRO,
     W_MOMENTUM,
     W_ORDERFLOW,
 )
-from atlasbot.market_data import get_spread_bps
+from atlasbot.market_data import get_market, get_spread_bps
+from atlasbot.rolling import RollingMean, RollingStats
 from atlasbot.run_logger import log_decision
-from atlasbot.signals import breakout, imbalance, macro_bias, momentum
+from atlasbot.signals import breakout, imbalance, macro_bias, momentum, registry
+from atlasbot.snapshot import MarketSnapshot
 from atlasbot.utils import fetch_price
 
 ADAPT_TEMP = float(os.getenv("ADAPT_TEMP", "2.0"))
 WEIGHTS_FILE = Path("data/weights.json")
 
-# price history for hybrid signal
-_tick_history: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=10))
-_window_history: dict[str, deque[tuple[float, float]]] = defaultdict(lambda: deque())
+HYBRID_WINDOW_SEC = 30
+VOL_WINDOW = 30  # samples
+TICK_MEAN_N = 10
 
 
-def vol_window_std(window: int = 30) -> float:
-    """Return rolling standard deviation of mid-price over *window* seconds."""
-    hist = _window_history.get(_cur_symbol, deque())
-    if not hist:
-        return 0.0
-    prices = [p for _, p in list(hist)[-window:]]
-    if len(prices) < 2:
-        return 0.0
-    mean = sum(prices) / len(prices)
-    var = sum((px - mean) ** 2 for px in prices) / len(prices)
-    return var**0.5
+class SymbolState:
+    """Streaming price statistics behind one symbol's hybrid signal and edge.
 
+    Each symbol owns its state and lock, so symbols can be evaluated from
+    different threads without a shared cursor.
+    """
 
-_cur_symbol = ""
+    __slots__ = ("window", "vol", "ticks", "lock")
 
+    def __init__(self) -> None:
+        self.window = RollingStats(horizon=HYBRID_WINDOW_SEC)
+        self.vol = RollingStats(maxlen=VOL_WINDOW, horizon=HYBRID_WINDOW_SEC)
+        self.ticks = RollingMean(TICK_MEAN_N)
+        self.lock = threading.Lock()
+
+    def update(self, price: float, now: float) -> float:
+        """Add a price sample and return the hybrid score."""
+        with self.lock:
+            self.ticks.push(price)
+            self.window.push(price, now)
+            self.vol.push(price, now)
+            momentum = self.window.zscore()
+            avg = self.ticks.mean()
+        mean_rev = -(price - avg) / avg if avg else 0.0
+        return max(-1.0, min(1.0, momentum + mean_rev))
+
+    def vol_std(self, window: int = VOL_WINDOW) -> float:
+        with self.lock:
+            if window == VOL_WINDOW:
+                return self.vol.std() if len(self.vol) >= 2 else 0.0
+            prices = self.window.values()[-window:]
+        if len(prices) < 2:
+            return 0.0
+        mean = sum(prices) / len(prices)
+        var = sum((px - mean) ** 2 for px in prices) / len(prices)
+        return var**0.5
+
+
+_states: dict[str, SymbolState] = {}
+_states_lock = threading.Lock()
 
-def _zscore(seq: list[float]) -> float:
-    if len(seq) < 2:
-        return 0.0
-    mean = sum(seq) / len(seq)
-    var = sum((x - mean) ** 2 for x in seq) / len(seq)
-    std = var**0.5
-    return 0.0 if std == 0 else (seq[-1] - mean) / std
+
+def symbol_state(symbol: str) -> SymbolState:
+    state = _states.get(symbol)
+    if state is None:
+        with _states_lock:
+            state = _states.setdefault(symbol, SymbolState())
+    return state
+
+
+def vol_window_std(window: int = VOL_WINDOW, symbol: str = "") -> float:
+    """Return standard deviation of *symbol*'s last *window* mid-price samples.
+
+    Samples come from ``hybrid_signal`` and never span more than 30 seconds.
+    """
+    state = _states.get(symbol)
+    return state.vol_std(window) if state is not None else 0.0
 
 
 def hybrid_signal(symbol: str) -> float:
     """Return 30 s momentum z-score plus 10-tick mean reversion."""
-    price = fetch_price(symbol)
-    _tick_history[symbol].append(price)
-    now = time.time()
-    window = _window_history[symbol]
-    window.append((now, price))
-    while window and now - window[0][0] > 30:
-        window.popleft()
-    momentum = _zscore([p for _, p in window])
-    ticks = _tick_history[symbol]
-    mean_rev = 0.0
-    if ticks:
-        avg = sum(ticks) / len(ticks)
-        if avg:
-            mean_rev = -(price - avg) / avg
-    score = momentum + mean_rev
-    return max(-1.0, min(1.0, score))
-
-
-def expected_edge_bps(signal: float, mid: float, spread_bps: float) -> float:
-    """Return expected edge in basis points."""
-    vol = vol_window_std()
+    return symbol_state(symbol).update(fetch_price(symbol), clock.now())
+
+
+def expected_edge_bps(
+    signal: float, mid: float, spread_bps: float, symbol: str = ""
+) -> float:
+    """Return expected edge in basis points using *symbol*'s price std."""
+    vol = vol_window_std(symbol=symbol) if symbol else vol_window_std()
     gross = 1e4 * signal * vol / mid
     costs = FEE_BPS_MAKER + SLIPPAGE_BPS + 0.2 * spread_bps
     return gross - costs
 
 
+# built-in ensemble; the lambdas resolve the signal functions through this
+# module at call time, so patching ``decision_engine.imbalance`` etc. applies
+registry.register(
+    "orderflow", lambda s: imbalance(s), weight=W_ORDERFLOW, inputs=("book",)
+)
+registry.register(
+    "momentum",
+    lambda s: momentum(s),
+    weight=W_MOMENTUM,
+    inputs=("bars",),
+    feature="momentum",
+)
+registry.register(
+    "macro",
+    lambda s: macro_bias(s),
+    weight=W_MACRO,
+    cost=50.0,  # a TTL refresh blocks on the LLM
+    inputs=("llm",),
+)
+registry.register(
+    "breakout",
+    lambda s: breakout(s),
+    weight=BREAKOUT_WEIGHT,
+    inputs=("bars",),
+    feature="breakout",
+)
+
+
 class DecisionEngine:
     """Combine multiple signals into a trading bias with adaptive weights."""
 
     def __init__(self) -> None:
-        self.weights = {
-            "orderflow": W_ORDERFLOW,
-            "momentum": W_MOMENTUM,
-            "macro": W_MACRO,
-            "breakout": BREAKOUT_WEIGHT,
-        }
+        self.weights = {sig.name: sig.weight for sig in registry.signals()}
         self._last_adapt = 0.0
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._plan_key: tuple | None = None
+        self._plan_cache: tuple[list, list] = ([], [])
 
     # --------------------------------------------------------------- public API
-    def next_advice(self, symbol: str) -> dict:
-        """Return trading advice for *symbol* with scaled edge."""
+    def next_advice(self, symbol: str, snap: MarketSnapshot | None = None) -> dict:
+        """Return trading advice for *symbol* with scaled edge.
+
+        Registered signals are evaluated cheapest first; those whose weight
+        is too small to matter report 0.0. Every other signal is evaluated
+        even when the advice is flat, because the decision log records the
+        raw blended score. Price and spread come from *snap* when given,
+        else from the live feed.
+        """
         start = time.perf_counter_ns()
-        if time.time() - self._last_adapt >= 3600:
-            self._adapt_weights()
-        im = imbalance(symbol)
-        mo = momentum(symbol)
-        ma = macro_bias(symbol)
-        br = breakout(symbol)
-        score = (
-            self.weights["orderflow"] * im
-            + self.weights["momentum"] * mo
-            + self.weights["macro"] * ma
-            + self.weights["breakout"] * br
+        self._maybe_adapt()
+        w = self.weights
+        if snap is None:
+            price, spread_bps = fetch_price(symbol), get_spread_bps(symbol)
+        else:
+            price, spread_bps = snap.price(symbol), snap.spreads[symbol]
+        gain = 1e4 * vol_window_std(symbol=symbol) / price
+        costs = FEE_BPS_MAKER + SLIPPAGE_BPS + 0.2 * spread_bps
+        values = dict.fromkeys(registry.names(), 0.0)
+        score = 0.0
+        for sig in self._plan(w):
+            v = registry.value(sig, symbol)
+            values[sig.name] = v
+            score += w.get(sig.name, sig.weight) * v
+        edge_bps = gain * score - costs  # == expected_edge_bps(...)
+        latency_ms = (time.perf_counter_ns() - start) / 1e6
+        return self._advice(
+            symbol,
+            clock.utcnow().isoformat(),
+            latency_ms,
+            price,
+            spread_bps,
+            score,
+            edge_bps,
+            values,
         )
-        price = fetch_price(symbol)
-        bias = "long" if score > 0 else "short" if score < 0 else "flat"
-        global _cur_symbol
-        _cur_symbol = symbol
-        spread_bps = get_spread_bps(symbol)
-        edge_bps = expected_edge_bps(score, price, spread_bps)
+
+    def next_advice_batch(
+        self, symbols: list[str], snap: MarketSnapshot | None = None
+    ) -> dict[str, dict]:
+        """Advice for every symbol with signals, scores and edges as arrays.
+
+        Signals with a bar ``feature`` come from one vectorised pass over the
+        market's ``BarMatrix``; the rest, price, spread and the 30 s price
+        std are gathered per symbol. All decisions share one timestamp. Markets without a bar matrix fall back to ``next_advice``.
+        """
+        md = get_market()
+        if not hasattr(md, "bar_matrix"):
+            return {sym: self.next_advice(sym, snap) for sym in symbols}
+        start = time.perf_counter_ns()
+        self._maybe_adapt()
+        w = self.weights
+        m = md.bar_matrix()
+        feats = m.features()
+        rows = [m.rows[sym] for sym in symbols]
+        if snap is None:
+            price = np.array([fetch_price(sym) for sym in symbols], dtype=float)
+            spread = np.array([get_spread_bps(sym) for sym in symbols], dtype=float)
+        else:
+            price = np.array([snap.price(sym) for sym in symbols], dtype=float)
+            spread = np.array([snap.spreads[sym] for sym in symbols], dtype=float)
+        vol = np.array([vol_window_std(symbol=sym) for sym in symbols], dtype=float)
+        gain = 1e4 * vol / price
+        costs = FEE_BPS_MAKER + SLIPPAGE_BPS + 0.2 * spread
+        values = {name: np.zeros(len(symbols)) for name in registry.names()}
+        score = np.zeros(len(symbols))
+        for sig in self._plan(w, len(symbols)):
+            if sig.feature is not None:
+                col = np.asarray(feats[sig.feature][rows], dtype=float)
+            else:
+                col = np.array([registry.value(sig, sym) for sym in symbols])
+            values[sig.name] = col
+            score = score + w.get(sig.name, sig.weight) * col
+        edge = gain * score - costs
+        ts = clock.utcnow().isoformat()
         latency_ms = (time.perf_counter_ns() - start) / 1e6
+        names = list(values)
+        per_symbol = zip(*(values[name].tolist() for name in names))
+        cols = zip(
+            price.tolist(), spread.tolist(), score.tolist(), edge.tolist(), per_symbol
+        )
+        return {
+            sym: self._advice(sym, ts, latency_ms, *row[:4], dict(zip(names, row[4])))
+            for sym, row in zip(symbols, cols)
+        }
+
+    def next_advice_many(
+        self,
+        symbols: list[str],
+        workers: int = ADVICE_WORKERS,
+        snap: MarketSnapshot | None = None,
+    ) -> dict[str, dict]:
+        """Evaluate ``next_advice`` for *symbols* concurrently on a worker pool.
+
+        Results match sequential evaluation. Worth it when signal lookups
+        block (REST fallbacks, a macro refresh) rather than for pure CPU work.
+        """
+        self._maybe_adapt()
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        workers, thread_name_prefix="Advice"
+                    )
+        advice = self._pool.map(lambda sym: self.next_advice(sym, snap), symbols)
+        return dict(zip(symbols, advice))
+
+    # --------------------------------------------------------------- internals
+    def _maybe_adapt(self) -> None:
+        if clock.now() - self._last_adapt < 3600:
+            return
+        with self._lock:
+            if clock.now() - self._last_adapt >= 3600:
+                self._adapt_weights()
+
+    def _plan(self, w: dict[str, float], n: int = 1) -> list[registry.Signal]:
+        """Signals worth evaluating under weights *w*, cheapest first."""
+        key = (tuple(sorted(w.items())), registry.version)  # in-place edits too
+        if self._plan_key != key:
+            plan, dropped = [], []
+            for sig in registry.signals():
+                if abs(w.get(sig.name, sig.weight)) * sig.bound < SIGNAL_MIN_WEIGHT:
+                    dropped.append(sig)
+                else:
+                    plan.append(sig)
+            self._plan_cache = (plan, dropped)
+            self._plan_key = key
+        plan, dropped = self._plan_cache
+        for sig in dropped:
+            registry.skip(sig, "weight", n)
+        return plan
+
+    def _advice(
+        self,
+        symbol: str,
+        ts: str,
+        latency_ms: float,
+        price: float,
+        spread_bps: float,
+        score: float,
+        edge_bps: float,
+        rationale: dict[str, float],
+    ) -> dict:
+        bias = "long" if score > 0 else "short" if score < 0 else "flat"
         log_decision(
             {
-                "ts": datetime.now(timezone.utc).isoformat(),
+                "ts": ts,
                 "symbol": symbol,
                 "px": price,
                 "side": bias,
@@ -138,15 +313,9 @@ class DecisionEngine:
             "bias": bias,
             "confidence": abs(score),
             "edge": edge_bps / 10_000,
-            "rationale": {
-                "orderflow": im,
-                "momentum": mo,
-                "macro": ma,
-                "breakout": br,
-            },
+            "rationale": rationale,
         }
 
-    # --------------------------------------------------------------- internals
     def _adapt_weights(self, n: int = 200) -> None:
         trades = risk.last_fills(n)
         if not trades:
@@ -155,7 +324,7 @@ class DecisionEngine:
         if len(set(returns)) <= 1:
             return
         edges = {}
-        for key in ("orderflow", "momentum", "macro", "breakout"):
+        for key in registry.names():
             sigs = [t.get("signals", {}).get(key, 0.0) for t in trades]
             if len(set(sigs)) <= 1:
                 corr = 0.0
@@ -173,5 +342,5 @@ class DecisionEngine:
         self.weights = dict(zip(edges.keys(), weights))
         WEIGHTS_FILE.parent.mkdir(exist_ok=True)
         with open(WEIGHTS_FILE, "w") as f:
-            json.dump({"ts": time.time(), **self.weights}, f)
-        self._last_adapt = time.time()
+            json.dump({"ts": clock.now(), **self.weights}, f)
+        self._last_adapt = clock.now()
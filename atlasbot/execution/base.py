@@ -3,12 +3,11 @@ import logging
 import os
 import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import Any, Callable
 
 import pandas as pd
 
-from atlasbot import risk, run_logger
+from atlasbot import clock, risk, run_logger
 from atlasbot.config import FEE_MIN_USD, TAKER_FEE
 
 logger = logging.getLogger(__name__)
@@ -61,12 +60,15 @@ def log_fill(
     book_after: list[tuple[float, float]] | None = None,
     response: dict | None = None,
     latency_ms: float | None = None,
+    order_id: str = "",
 ) -> None:
     """Print fill info and append to pnl.csv and jsonl fills."""
     fee = max(notional * TAKER_FEE, FEE_MIN_USD)
-    realised, mtm = risk.record_fill(symbol, side, notional, price, fee, slip, maker)
+    realised, mtm = risk.record_fill(
+        symbol, side, notional, price, fee, slip, maker, order_id
+    )
     risk.check_circuit_breaker()
-    ts = datetime.now(timezone.utc)
+    ts = clock.utcnow()
     logger.info(
         "TRADE %s %s @ %.2f  notional=%.2f",
         side,
@@ -126,5 +128,5 @@ def maker_to_taker(
         filled = exec_api.submit_maker_order(side, size_usd, symbol)
         if filled:
             return filled
-    time.sleep(wait_s)
+    clock.sleep(wait_s)
     return exec_api.submit_order(side, size_usd, symbol)
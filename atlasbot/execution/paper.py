@@ -3,19 +3,30 @@ import random
 import time
 from typing import Any, List, Tuple
 
-import requests
-
+from atlasbot import http_client as http
+from atlasbot.market_data import get_market
 from atlasbot.utils import fetch_price
 
 from .base import Fill, log_fill, request_with_retries
 
+ORDERS_URL = "https://api.coinbase.com/api/v3/brokerage/orders"  # paper
+BOOK_URL = "https://api.exchange.coinbase.com/products/{}/book?level=2"
+
+
+def _order_book(
+    symbol: str, levels: int = 5, max_age: float | None = None
+) -> List[Tuple[float, float]]:
+    """Return top *levels* of the order book as [(price, qty)].
 
-def _order_book(symbol: str, levels: int = 5) -> List[Tuple[float, float]]:
-    """Return top *levels* of the order book as [(price, qty)]."""
+    The REST fallback may share a book fetched up to *max_age* seconds ago
+    (``http_client.get``); pass 0 for the book right after an order.
+    """
 
-    url = f"https://api.exchange.coinbase.com/products/{symbol}/book?level=2"
+    book = get_market().book(symbol)
+    if book is not None:
+        return book.depth(levels)
     try:
-        resp = request_with_retries(requests.get, url)
+        resp = request_with_retries(http.get, BOOK_URL.format(symbol), max_age=max_age)
         data = resp.json()
         bids = [(float(p), float(q)) for p, q, _ in data.get("bids", [])[:levels]]
         asks = [(float(p), float(q)) for p, q, _ in data.get("asks", [])[:levels]]
@@ -27,7 +38,6 @@ def _order_book(symbol: str, levels: int = 5) -> List[Tuple[float, float]]:
 def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
     """Send order to Coinbase paper API or fall back to instant fill."""
     api_key = os.getenv("COINBASE_PAPER_KEY")
-    endpoint = "https://api.coinbase.com/api/v3/brokerage/orders"  # paper
     if not api_key:
         price = fetch_price(symbol)
         qty = size_usd / price
@@ -43,6 +53,7 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
             book_before=book,
             book_after=book,
             latency_ms=0.0,
+            order_id="paper-sim",
         )
         return Fill("paper-sim", qty, fill_price)
 
@@ -59,8 +70,8 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
     for attempt in range(3):
         try:
             r = request_with_retries(
-                requests.post,
-                endpoint,
+                http.post,
+                ORDERS_URL,
                 json=payload,
                 headers=headers,
             )
@@ -69,7 +80,7 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
             price = float(data.get("average_filled_price", fetch_price(symbol)))
             qty = float(data.get("filled_size", 0))
             latency_ms = (time.perf_counter() - start) * 1000
-            book_after = _order_book(symbol)
+            book_after = _order_book(symbol, max_age=0)
             log_fill(
                 symbol,
                 side,
@@ -80,6 +91,7 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
                 book_after=book_after,
                 response=data,
                 latency_ms=latency_ms,
+                order_id=order_id,
             )
             return Fill(order_id, qty, price)
         except Exception:
@@ -87,7 +99,16 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
     price = fetch_price(symbol)
     qty = size_usd / price
     book = _order_book(symbol)
-    log_fill(symbol, side, size_usd, price, 0.0, book_before=book, book_after=book)
+    log_fill(
+        symbol,
+        side,
+        size_usd,
+        price,
+        0.0,
+        book_before=book,
+        book_after=book,
+        order_id="paper-error",
+    )
     return Fill("paper-error", qty, price)
 
 
@@ -96,7 +117,6 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
     api_key = os.getenv("COINBASE_PAPER_KEY")
     if not api_key:
         return None
-    endpoint = "https://api.coinbase.com/api/v3/brokerage/orders"  # paper
     payload = {
         "side": side,
         "client_order_id": f"maker-{int(time.time())}",
@@ -110,7 +130,7 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
     book_before = _order_book(symbol)
     start = time.perf_counter()
     try:
-        r = request_with_retries(requests.post, endpoint, json=payload, headers=headers)
+        r = request_with_retries(http.post, ORDERS_URL, json=payload, headers=headers)
         data = r.json()
         if not data.get("success", True):
             return None
@@ -119,7 +139,7 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
         qty = float(data.get("filled_size", 0))
         if qty:
             latency_ms = (time.perf_counter() - start) * 1000
-            book_after = _order_book(symbol)
+            book_after = _order_book(symbol, max_age=0)
             log_fill(
                 symbol,
                 side,
@@ -131,6 +151,7 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
                 book_after=book_after,
                 response=data,
                 latency_ms=latency_ms,
+                order_id=order_id,
             )
             return Fill(order_id, qty, price)
     except Exception:
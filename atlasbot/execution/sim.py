@@ -1,12 +1,15 @@
+import itertools
 import random
-import time
 from typing import List, Tuple
 
+from atlasbot import clock
 from atlasbot.config import SLIPPAGE_BPS
 from atlasbot.utils import fetch_price
 
 from .base import Fill, log_fill
 
+_seq = itertools.count(1)  # keeps fill ids unique within one clock instant
+
 
 def _sim_book(price: float) -> List[Tuple[float, float]]:
     """Return a fake order book around *price*."""
@@ -27,7 +30,7 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
     slip_pct = random.gauss(0, SLIPPAGE_BPS / 10_000)
     fill_price = price * (1 + slip_pct if side == "buy" else 1 - slip_pct)
     qty = size_usd / fill_price
-    exec_id = f"sim-{time.time()}"
+    exec_id = f"sim-{clock.now()}-{next(_seq)}"
     log_fill(
         symbol,
         side,
@@ -37,6 +40,7 @@ def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
         book_before=book,
         book_after=book,
         latency_ms=0.0,
+        order_id=exec_id,
     )
     return Fill(exec_id, qty, fill_price)
 
@@ -49,7 +53,7 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
     prob = 0.7
     if random.random() < prob:
         qty = size_usd / price
-        exec_id = f"maker-{time.time()}"
+        exec_id = f"maker-{clock.now()}-{next(_seq)}"
         log_fill(
             symbol,
             side,
@@ -60,6 +64,7 @@ def submit_maker_order(side: str, size_usd: float, symbol: str) -> Fill | None:
             book_before=book,
             book_after=book,
             latency_ms=0.0,
+            order_id=exec_id,
         )
         return Fill(exec_id, qty, price)
     return None
@@ -1,9 +1,8 @@
 from __future__ import annotations
 
-import time
-
 from atlasbot.config import CURRENT_TAKER_BPS, FALLBACK_DELAY
 from atlasbot.execution.base import Fill
+from atlasbot.order_manager import OrderManager
 
 
 def fill_probability(edge_bps: float, spread_bps: float) -> float:
@@ -21,16 +20,18 @@ def place_maker(
     edge_bps: float,
     spread_bps: float,
 ) -> Fill | None:
-    """Place maker-first order with timed fallback to taker."""
-    filled = None
-    if hasattr(exec_api, "submit_maker_order"):
-        filled = exec_api.submit_maker_order(side, size_usd, symbol)
-        if filled:
-            return filled
-        wait_s = max(
-            FALLBACK_DELAY, 1.0 / max(fill_probability(edge_bps, spread_bps), 1e-6)
-        )
-        time.sleep(wait_s)
-    if edge_bps > CURRENT_TAKER_BPS:
-        return exec_api.submit_order(side, size_usd, symbol)
-    return None
+    """Place maker-first order with timed fallback to taker.
+
+    Blocks until the order is final; the trading loop hands orders to an
+    ``OrderManager`` instead and never waits on them.
+    """
+    wait_s = max(
+        FALLBACK_DELAY, 1.0 / max(fill_probability(edge_bps, spread_bps), 1e-6)
+    )
+    om = OrderManager(maker_tries=1, retry_sec=wait_s)
+    order = om.run(
+        om.submit(symbol, side, size_usd, exec_api, taker=edge_bps > CURRENT_TAKER_BPS)
+    )
+    if not order.qty:
+        return None
+    return Fill(order.fill_ids[-1], order.qty, order.avg_price)
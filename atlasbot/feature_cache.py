@@ -0,0 +1,68 @@
+"""
+Bar-versioned feature cache
+———————————————————————————
+• memoises derived bar features per (symbol, feature, params, bar seq)
+• bar-based features only change when a bar closes, so between closes every
+  read after the first is a dict lookup
+• ``MarketData`` bumps a symbol's version after each close (once its bars
+  and indicators are updated), which invalidates that symbol's entries
+• hit / miss counts per feature are kept as plain ints on the hot path and
+  published to Prometheus by the metrics loop
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+_Key = Tuple[str, str, Hashable]
+
+
+class FeatureCache:
+    """Feature values valid until their symbol's next bar close."""
+
+    def __init__(self) -> None:
+        self._seq: Dict[str, int] = {}
+        self._data: Dict[_Key, Tuple[int, Any]] = {}
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def bump(self, symbol: str, seq: int) -> None:
+        """Mark *symbol*'s bars as advanced to sequence number *seq*."""
+        self._seq[symbol] = seq
+
+    def seq(self, symbol: str) -> int:
+        return self._seq.get(symbol, 0)
+
+    def get(
+        self,
+        symbol: str,
+        feature: str,
+        params: Hashable,
+        compute: Callable[[], Any],
+    ) -> Any:
+        """Return the cached value or ``compute()`` it for the current bar."""
+        seq = self._seq.get(symbol, 0)
+        key = (symbol, feature, params)
+        entry = self._data.get(key)
+        if entry is not None and entry[0] == seq:
+            self.hits[feature] += 1
+            return entry[1]
+        value = compute()
+        # an entry computed under an older seq is never served again
+        self._data[key] = (seq, value)
+        self.misses[feature] += 1
+        return value
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+def cached(
+    md: Any, symbol: str, feature: str, params: Hashable, compute: Callable[[], Any]
+) -> Any:
+    """Read *feature* through *md*'s cache; markets without one just compute."""
+    get = getattr(md, "feature", None)
+    if get is None:
+        return compute()
+    return get(symbol, feature, params, compute)
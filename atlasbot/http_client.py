@@ -0,0 +1,217 @@
+"""
+Shared HTTP client
+——————————————————
+• one process-wide ``requests.Session`` with a keep-alive connection pool per
+  host (``HTTP_POOL_SIZE`` connections each), so only the first call to a
+  host pays the TCP + TLS handshake
+• every REST caller – order submission, book and ticker polls, price seeding,
+  fee refresh – goes through ``get`` / ``post``, which time each call into
+  ``atlasbot_http_latency_seconds`` per endpoint (host and path, product id
+  folded out)
+• ``prewarm`` opens connections to the order and market-data hosts at
+  startup, so the first order does not pay the handshake either
+• one token bucket per endpoint class (``RATE_LIMITS``) paces calls from all
+  subsystems together, so REST-fallback mode stays under the exchange limit
+• identical concurrent GETs to public hosts share one in-flight call, and
+  answers are reused for ``REST_CACHE_MS``; authenticated hosts are never
+  shared. ``coalesced`` / ``cached`` / ``throttled`` count per endpoint,
+  published by ``metrics``
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))  # connections per host
+POOL_HOSTS = 8  # per-host pools kept alive
+# GET answers reused for this long; 0 turns caching and coalescing off
+CACHE_TTL = float(os.getenv("REST_CACHE_MS", "500")) / 1000
+# requests/s and burst per endpoint class (Coinbase public: 10/s, burst 15)
+RATE_LIMITS = {
+    "public": (float(os.getenv("REST_RATE_PUBLIC", "10")), 15),
+    "private": (30.0, 30),
+}
+HOST_CLASS = {"api.exchange.coinbase.com": "public", "api.coinbase.com": "private"}
+
+_PRODUCT = re.compile(r"/[A-Z0-9]+-[A-Z0-9]+(?=/|$)")
+
+_session: "requests.Session | None" = None
+_lock = threading.Lock()
+
+coalesced: Counter = Counter()  # endpoint -> GETs that joined an in-flight call
+cached: Counter = Counter()  # endpoint -> GETs answered from the TTL cache
+throttled: Counter = Counter()  # endpoint -> calls that waited for a token
+
+
+class TokenBucket:
+    """*rate* calls per second with bursts of up to *burst*."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Reserve one call; returns how long the caller must wait for it.
+
+        Reservations queue up (the balance goes negative), so waiting callers
+        are served in order rather than racing for the next token.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._t) * self.rate)
+            self._t = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class _Call:
+    """One in-flight GET that later identical GETs wait on."""
+
+    __slots__ = ("done", "resp", "exc")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.resp: Any = None
+        self.exc: BaseException | None = None
+
+
+_buckets = {name: TokenBucket(*limit) for name, limit in RATE_LIMITS.items()}
+_inflight: Dict[Hashable, _Call] = {}
+_cache: Dict[Hashable, Tuple[float, Any]] = {}
+
+
+def session() -> "requests.Session":
+    """The shared keep-alive session, created on first use."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=POOL_HOSTS, pool_maxsize=POOL_SIZE
+                )
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                _session = s
+    return _session
+
+
+def endpoint(url: str) -> str:
+    """Latency label for *url*: host and path with the product id as ``{}``."""
+    parts = urlsplit(url)
+    return parts.netloc + _PRODUCT.sub("/{}", parts.path)
+
+
+def request(method: str, url: str, **kwargs: Any) -> "requests.Response":
+    """Send *method* to *url* over the shared session, paced and timed."""
+    host = urlsplit(url).netloc
+    bucket = _buckets.get(HOST_CLASS.get(host, ""))
+    if bucket is not None:
+        wait = bucket.take()
+        if wait > 0:
+            throttled[endpoint(url)] += 1
+            time.sleep(wait)
+    t0 = time.perf_counter()
+    try:
+        return session().request(method, url, **kwargs)
+    finally:
+        _observe(url, time.perf_counter() - t0)
+
+
+def get(url: str, max_age: float | None = None, **kwargs: Any) -> "requests.Response":
+    """GET *url*, sharing the answer with identical calls.
+
+    For a ``public`` host (``HOST_CLASS``), a call made while the same GET
+    is in flight waits for that one, and an OK answer younger than
+    *max_age* seconds (default ``REST_CACHE_MS``) is returned as is. Other
+    hosts, and ``max_age=0``, always send a fresh request.
+    """
+    ttl = CACHE_TTL if max_age is None else max_age
+    if ttl <= 0 or HOST_CLASS.get(urlsplit(url).netloc) != "public":
+        return request("GET", url, **kwargs)
+    params = kwargs.get("params")
+    key = (url, tuple(sorted(params.items())) if params else None)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] <= ttl:
+            cached[endpoint(url)] += 1
+            return hit[1]
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+        else:
+            coalesced[endpoint(url)] += 1
+    if not leader:
+        call.done.wait()
+        if call.exc is not None:
+            raise call.exc
+        return call.resp
+    try:
+        call.resp = request("GET", url, **kwargs)
+        return call.resp
+    except BaseException as exc:
+        call.exc = exc
+        raise
+    finally:
+        with _lock:
+            del _inflight[key]
+            if getattr(call.resp, "ok", False):
+                now = time.monotonic()
+                _prune(now - max(ttl, CACHE_TTL))
+                _cache[key] = (now, call.resp)
+        call.done.set()
+
+
+def _prune(cutoff: float) -> None:
+    """Drop cached answers stored before *cutoff*; caller holds ``_lock``."""
+    for key in [k for k, (t, _) in _cache.items() if t < cutoff]:
+        del _cache[key]
+
+
+def post(url: str, **kwargs: Any) -> "requests.Response":
+    return request("POST", url, **kwargs)
+
+
+def prewarm(urls: Iterable[str], timeout: float = 5.0) -> int:
+    """Open a pooled connection to each of *urls*; returns how many answered.
+
+    Any HTTP status counts – only the connection matters, and it stays in
+    the pool for the next real request.
+    """
+    urls = list(urls)
+    if not urls:
+        return 0
+
+    def touch(url: str) -> bool:
+        try:
+            request("HEAD", url, timeout=timeout)
+            return True
+        except Exception as exc:  # noqa: BLE001
+            logging.debug("prewarm %s failed: %s", url, exc)
+            return False
+
+    with ThreadPoolExecutor(len(urls), thread_name_prefix="HTTPWarm") as pool:
+        return sum(pool.map(touch, urls))
+
+
+def _observe(url: str, seconds: float) -> None:
+    from atlasbot import metrics
+
+    h = metrics.http_latency_seconds
+    if hasattr(h, "labels"):
+        h = h.labels(endpoint(url))
+    h.observe(seconds)
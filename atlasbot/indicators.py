@@ -0,0 +1,192 @@
+"""
+Incremental bar indicators
+——————————————————————————
+• updated once per closed 1m bar, so every read is O(1)
+• ATR (simple and Wilder) from a running true-range sum
+• volatility: mean absolute deviation of the last closes
+• breakout and momentum from monotonic-deque rolling max/min
+• same definitions and warm-up rules as ``utils`` / ``signals``, which fall
+  back to recomputing from the bar window for markets without an engine
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, Iterable, Tuple
+
+from atlasbot.bar_store import Bar
+
+ATR_PERIOD = 10
+VOL_PERIOD = 30
+MOMENTUM_WINDOW = 15
+BREAKOUT_WINDOW = 20
+
+_NAN = float("nan")
+
+
+class RollingExtremes:
+    """Max and min of the last *n* values via monotonic deques (amortised O(1))."""
+
+    __slots__ = ("n", "_i", "_hi", "_lo")
+
+    def __init__(self, n: int):
+        self.n = n
+        self._i = 0
+        self._hi: Deque[Tuple[int, float]] = deque()
+        self._lo: Deque[Tuple[int, float]] = deque()
+
+    def push(self, x: float) -> None:
+        i = self._i
+        self._i += 1
+        hi, lo = self._hi, self._lo
+        while hi and hi[-1][1] <= x:
+            hi.pop()
+        hi.append((i, x))
+        while lo and lo[-1][1] >= x:
+            lo.pop()
+        lo.append((i, x))
+        if hi[0][0] <= i - self.n:
+            hi.popleft()
+        if lo[0][0] <= i - self.n:
+            lo.popleft()
+
+    def __len__(self) -> int:
+        return min(self._i, self.n)
+
+    def max(self) -> float:
+        return self._hi[0][1]
+
+    def min(self) -> float:
+        return self._lo[0][1]
+
+
+class Indicators:
+    """Rolling indicator state for one symbol's closed bars."""
+
+    def __init__(
+        self,
+        atr_period: int = ATR_PERIOD,
+        vol_period: int = VOL_PERIOD,
+        momentum_window: int = MOMENTUM_WINDOW,
+        breakout_window: int = BREAKOUT_WINDOW,
+    ):
+        self.atr_period = atr_period
+        self.vol_period = vol_period
+        self.momentum_window = momentum_window
+        self.breakout_window = breakout_window
+        # bars needed to rebuild every window when the newest bar is revised
+        self.keep = max(
+            atr_period + 1, vol_period, momentum_window, breakout_window + 1
+        )
+        self._bars: Deque[Bar] = deque(maxlen=self.keep)
+        self._reset()
+
+    def _reset(self) -> None:
+        self.count = 0
+        self._prev_close: float | None = None
+        self._trs: Deque[float] = deque()
+        self._tr_sum = 0.0
+        self._wilder = self._wilder_prev = _NAN
+        self._closes: Deque[float] = deque()
+        self._mad = _NAN
+        self._tps: Deque[float] = deque()
+        self._tp_ext = RollingExtremes(self.momentum_window)
+        self._close_ext = RollingExtremes(self.breakout_window)
+        self._breakout = 0.0
+
+    # ————— writes —————
+    def seed(self, bars: Iterable[Bar]) -> None:
+        """Rebuild from history (oldest first), e.g. after a warm start."""
+        self._bars.clear()
+        self._reset()
+        for bar in bars:
+            self.update(bar)
+
+    def update(self, bar: Bar) -> None:
+        """Fold in a closed bar; a repeated ``ts`` revises the newest one."""
+        if self._bars and bar.ts == self._bars[-1].ts:
+            self._revise(bar)
+            return
+        self._bars.append(bar)
+        self._step(bar)
+
+    def _revise(self, bar: Bar) -> None:
+        self._bars[-1] = bar
+        bars = list(self._bars)
+        count, wilder = self.count - 1, self._wilder_prev
+        self._reset()
+        for b in bars[:-1]:
+            self._step(b)
+        self.count, self._wilder = count, wilder
+        self._step(bar)
+
+    def _step(self, bar: Bar) -> None:
+        self.count += 1
+        close = bar.close
+        pc = self._prev_close
+        if pc is not None:
+            tr = max(bar.high, pc) - min(bar.low, pc)
+            trs, p = self._trs, self.atr_period
+            trs.append(tr)
+            self._tr_sum += tr
+            if len(trs) > p:
+                self._tr_sum -= trs.popleft()
+            self._wilder_prev = self._wilder
+            if not math.isnan(self._wilder):
+                self._wilder = (self._wilder * (p - 1) + tr) / p
+            elif len(trs) == p:
+                self._wilder = self._tr_sum / p
+        self._prev_close = close
+
+        closes, n = self._closes, self.vol_period
+        closes.append(close)
+        if len(closes) > n:
+            closes.popleft()
+        if len(closes) == n:  # O(n) once per bar close keeps reads O(1)
+            mean = sum(closes) / n
+            self._mad = sum(abs(px - mean) for px in closes) / n
+
+        ext = self._close_ext
+        if len(ext) == self.breakout_window:
+            if close > ext.max():
+                self._breakout = 1.0
+            elif close < ext.min():
+                self._breakout = -1.0
+            else:
+                self._breakout = 0.0
+        ext.push(close)
+
+        tp = (bar.open + bar.high + bar.low + close) / 4
+        tps = self._tps
+        tps.append(tp)
+        if len(tps) > self.momentum_window:
+            tps.popleft()
+        self._tp_ext.push(tp)
+
+    # ————— reads —————
+    def atr(self, wilder: bool = False) -> float:
+        """Mean true range over ``atr_period`` bars (``nan`` until warm)."""
+        if wilder:
+            return self._wilder
+        if len(self._trs) < self.atr_period:
+            return _NAN
+        return self._tr_sum / self.atr_period
+
+    def volatility(self) -> float:
+        """Mean absolute deviation of the last ``vol_period`` closes."""
+        return self._mad
+
+    def momentum(self) -> float:
+        """Typical-price slope over the window, scaled by its range, in [-1, 1]."""
+        tps = self._tps
+        if len(tps) < self.momentum_window:
+            return 0.0
+        denom = self._tp_ext.max() - self._tp_ext.min()
+        if denom == 0:
+            return 0.0
+        return max(-1.0, min(1.0, (tps[-1] - tps[0]) / denom))
+
+    def breakout(self) -> float:
+        """1 / -1 when the last close broke the prior window's high / low."""
+        return self._breakout if self.count > self.breakout_window else 0.0
@@ -1,30 +1,48 @@
 """
 Real-time Coinbase price streamer + 1-minute bar cache
 —————————————————————————————————————————————————————————
-• tries legacy Pro WS first, auto-fails over to Advanced-Trade WS
+• one asyncio hub thread owns every socket, timer and REST poller
+• tries legacy Pro WS first, auto-fails over to Advanced-Trade WS; with
+  ``WS_DUAL_FEED`` both stay live and ticks merge first-arrival-wins
 • if first tick hasn’t arrived in 3 s → seed with REST /ticker
-• builds rolling OHLC bars for ATR/vol
+• builds OHLCV bars from ticks, closed on exchange-time minute boundaries
+• keeps a local L2 book per product from the level2 channel
+• optionally records every tick to disk (``TICK_RECORD_DIR``)
 • exponential back-off reconnect, no log spam
 """
 
 from __future__ import annotations
 
+import asyncio
 import collections as _collections
 import json
 import logging
 import math as _math
 import os as _os
 import threading
-import threading as _threading
 import time
-import time as _time
-from collections import defaultdict, deque
-from datetime import datetime, timedelta, timezone
-from typing import Deque, Dict, List, Tuple
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    Hashable,
+    List,
+    Tuple,
+)
 
-import requests as _requests
-import websocket  # type: ignore
+import websockets  # type: ignore
 
+from atlasbot import clock
+from atlasbot import http_client as http
+from atlasbot.bar_store import Bar, BarRollup, BarStore, BarWindow
+from atlasbot.candle_cache import CandleCache
+from atlasbot.feature_cache import FeatureCache
+from atlasbot.indicators import Indicators
 from atlasbot.config import (
     REST_TICKER_FMT,
     SYMBOLS,
@@ -32,15 +50,219 @@ from atlasbot.config import (
     WS_URL_ADVANCED,
     WS_URL_PRO,
 )
+from atlasbot.order_book import OrderBook
+from atlasbot.snapshot import MarketSnapshot
+from atlasbot.tick_recorder import RECORD_DIR, TickRecorder
+from atlasbot.ws_decode import (
+    BOOK_TYPES,
+    Decoder,
+    Tick,
+    get_decoder,
+    parse_ts,
+    sniff_channel,
+    sniff_type,
+)
+
+if TYPE_CHECKING:
+    from atlasbot.batch import BarMatrix
+    from atlasbot.replay import Replay
 
 ONE_MIN = 60
 BAR_SEC = ONE_MIN
 BAR_HISTORY = 5_000  # ≈ 3.5 days
+RESOLUTIONS = {"1m": ONE_MIN, "5m": 300, "15m": 900, "1h": 3_600}
+ROLLUP_HISTORY = 1_000  # bars kept per higher resolution
 SEED_TIMEOUT = 3  # s to wait before REST seed
-REST_POLL_INTERVAL = 5  # seconds between REST polling
+REST_POLL_INTERVAL = 5  # seconds between REST polls of a symbol
+REST_HOT_INTERVAL = 1  # … of a symbol with an open position
+REST_CONCURRENCY = int(_os.getenv("REST_CONCURRENCY", "8"))  # tickers in flight
+REST_STALE_BUDGET = 15  # s a REST price may age before it rides every round
+CANDLES_URL = "https://api.exchange.coinbase.com/products/{}/candles"
+WARM_BARS = 150  # candles fetched on a cold start
+MAX_CANDLES = 300  # Coinbase cap per /candles request
+WARM_CONCURRENCY = int(_os.getenv("WARM_CONCURRENCY", "8"))
+L2_CHANNEL = _os.getenv("L2_CHANNEL", "level2_batch")  # public L2 feed
+# keep the legacy and Advanced Trade feeds connected together
+WS_DUAL_FEED = _os.getenv("WS_DUAL_FEED", "").lower() in ("1", "true")
+MERGE_SEEN = 4_096  # trade ids remembered for cross-feed dedupe
+MERGE_WINDOW = 0.5  # s: id-less ticks this close at one price are one trade
+FEED_SILENT_SEC = 15  # a connected feed without ticks this long counts as down
+BOOK_STALE_SEC = 30  # a book silent this long is not trusted
+BAR_CLOSE_GRACE = 2.0  # s after a minute boundary before idle bars are closed
+
+
+class BarAggregator:
+    """Incremental per-symbol OHLCV builder fed straight from the tick path.
+
+    A bar is closed by the first tick of the next minute or, when a symbol
+    goes quiet, by :meth:`close_due` at the boundary. Ticks older than the
+    open bucket are dropped.
+    """
+
+    def __init__(self, bar_sec: int = BAR_SEC):
+        self.bar_sec = bar_sec
+        self._open: Dict[str, list] = {}
+
+    def ingest(self, sym: str, ts: float, price: float, size: float = 0.0):
+        """Fold one tick into *sym*'s bucket; return the bar it closed, if any."""
+        start = ts - ts % self.bar_sec
+        cur = self._open.get(sym)
+        if cur is not None and start < cur[0]:
+            return None
+        closed = None
+        if cur is not None and start > cur[0]:
+            closed = Bar(*cur)
+            cur = None
+        if cur is None:
+            self._open[sym] = [start, price, price, price, price, size, int(size > 0)]
+            return closed
+        if price > cur[2]:
+            cur[2] = price
+        if price < cur[3]:
+            cur[3] = price
+        cur[4] = price
+        if size > 0:
+            cur[5] += size
+            cur[6] += 1
+        return closed
+
+    def close_due(self, now: float) -> List[Tuple[str, Bar]]:
+        """Close every open bucket whose minute ended at or before *now*."""
+        out = []
+        for sym, cur in list(self._open.items()):
+            if cur[0] + self.bar_sec <= now:
+                out.append((sym, Bar(*cur)))
+                del self._open[sym]
+        return out
+
+
+class FeedMerger:
+    """First-tick-wins merge of redundant trade feeds.
+
+    Both feeds stamp a trade with its exchange ``trade_id``, so a trade is
+    taken from whichever feed delivers it first and the other feed's copy
+    is dropped, adding the winner's lead over it to ``lead_ns``. Ticks
+    without an id fall back to a window match: same price, within
+    ``MERGE_WINDOW`` seconds of the last tick taken from the other feed.
+    Runs on the hub thread.
+    """
+
+    def __init__(self) -> None:
+        self._seen: Dict[Tuple[str, int], Tuple[str, int]] = {}  # -> (feed, ns)
+        # symbol -> (trade ts, price, feed, arrival monotonic ns) of last taken
+        self._last: Dict[str, Tuple[float, float, str, int]] = {}
+        self.source: Dict[str, str] = {}  # symbol -> feed of its last tick
+        self.first: Counter = Counter()  # feed -> ticks it delivered first
+        self.dupes: Counter = Counter()  # feed -> ticks dropped as seen
+        self.lead_ns: Counter = Counter()  # feed -> summed lead over the other
+
+    def accept(self, feed: str, tick: Tick) -> bool:
+        """Whether *tick* from *feed* is new and should be applied."""
+        now = time.monotonic_ns()
+        if tick.trade_id:
+            key = (tick.symbol, tick.trade_id)
+            hit = self._seen.get(key)
+            if hit is not None:
+                return self._drop(feed, *hit, now)
+            self._seen[key] = (feed, now)
+            if len(self._seen) > MERGE_SEEN:
+                del self._seen[next(iter(self._seen))]  # oldest first
+        else:
+            last = self._last.get(tick.symbol)
+            if last is not None:
+                ts, price, won, at = last
+                if (
+                    won != feed
+                    and price == tick.price
+                    and abs(tick.ts - ts) <= MERGE_WINDOW
+                ):
+                    return self._drop(feed, won, at, now)
+        self._last[tick.symbol] = (tick.ts, tick.price, feed, now)
+        self.source[tick.symbol] = feed
+        self.first[feed] += 1
+        return True
+
+    def _drop(self, feed: str, won: str, at: int, now: int) -> bool:
+        self.dupes[feed] += 1
+        if won != feed:
+            self.lead_ns[won] += now - at
+        return False
+
+
+# ----------------------------- event-loop hub
+class MarketDataHub:
+    """Single asyncio loop running every feed connection and poller.
+
+    All sockets, reconnect/back-off timers and REST fallbacks live here as
+    coroutines, so a failover cancels tasks instead of leaking threads.
+    """
+
+    def __init__(self, name: str = "MDHub"):
+        self.loop = asyncio.new_event_loop()
+        self._tasks: set[asyncio.Task] = set()
+        self._lag: Dict[str, float] = {}
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    # ————— scheduling —————
+    def spawn(self, coro: Coroutine, name: str = "") -> asyncio.Task:
+        """Schedule *coro* on the hub; safe from any thread or from the loop."""
+        if self.running_in_loop():
+            return self._track(self.loop.create_task(coro, name=name or None))
+        fut = asyncio.run_coroutine_threadsafe(self._spawn(coro, name), self.loop)
+        return fut.result()
+
+    def call_soon(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Run ``fn(*args)`` on the hub loop; safe from any thread."""
+        self.loop.call_soon_threadsafe(fn, *args)
+
+    async def _spawn(self, coro: Coroutine, name: str) -> asyncio.Task:
+        return self._track(self.loop.create_task(coro, name=name or None))
 
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
 
-# ----------------------------- WebSocket client (vanilla)
+    def running_in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+
+    async def sleep(self, delay: float, conn: str = "hub") -> None:
+        """``asyncio.sleep`` that records how late the loop woke us up."""
+        t0 = time.monotonic()
+        await asyncio.sleep(delay)
+        self._lag[conn] = max(0.0, time.monotonic() - t0 - delay)
+
+    def loop_lag(self) -> Dict[str, float]:
+        """Latest wake-up overshoot in seconds keyed by connection/task."""
+        return dict(self._lag)
+
+    def stop(self) -> None:
+        """Cancel every task, closing sockets, then stop the loop."""
+        if not self.loop.is_running():
+            return
+
+        async def _cancel_all() -> None:
+            tasks = [t for t in self._tasks if not t.done()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_all(), self.loop).result(5)
+        except Exception:  # noqa: BLE001
+            pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+# ----------------------------- WebSocket client (asyncio)
 class _WSClient:
     def __init__(
         self,
@@ -50,159 +272,304 @@ class _WSClient:
         on_open_cb=None,
         on_fail_cb=None,
         on_tick_cb=None,
+        on_book_cb=None,
+        channels: List[str] | None = None,
+        hub: MarketDataHub | None = None,
+        decoder: Decoder | None = None,
+        name: str = "ws",
+        merger: FeedMerger | None = None,
+        advanced: bool = False,
     ):
         self._url, self._products, self._store = url, products, price_store
         self._on_open_cb = on_open_cb
         self._on_fail_cb = on_fail_cb
         self._on_tick_cb = on_tick_cb
-        self._ws: websocket.WebSocketApp | None = None
+        self._on_book_cb = on_book_cb
+        self.channels = channels or ["ticker"]
+        self._decoder = decoder or get_decoder()
+        self._hub = hub
+        self._merger = merger
+        self.advanced = advanced  # Advanced Trade protocol rather than legacy
+        self.name = name
+        self.last_tick = 0.0  # monotonic time of the last well-formed tick
+        self._ws = None
+        self._closed = False
 
     # ————— public —————
-    def run_forever(self):
+    async def run(self) -> None:
+        """Connect and consume messages, reconnecting with back-off."""
         backoff = 1
-        while True:
-            self._ws = websocket.WebSocketApp(
-                self._url,
-                on_open=self._on_open,
-                on_message=self._on_msg,
-                on_error=self._on_err,
-                on_close=self._on_close,
-            )
-            try:
-                self._ws.run_forever(ping_interval=20, ping_timeout=10)
-            except Exception as exc:  # noqa: BLE001
-                logging.error("WS error: %s", exc)
-                if self._on_fail_cb:
-                    self._on_fail_cb()
-            else:
+        probe = asyncio.ensure_future(self._lag_probe())
+        try:
+            while not self._closed:
+                try:
+                    async with websockets.connect(
+                        self._url, ping_interval=20, ping_timeout=10
+                    ) as ws:
+                        self._ws = ws
+                        await self._on_open()
+                        async for msg in ws:
+                            self._on_msg(ws, msg)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:  # noqa: BLE001
+                    logging.error("WS error: %s", exc)
+                finally:
+                    self._ws = None
+                if self._closed:
+                    return
                 if self._on_fail_cb:
                     self._on_fail_cb()
-            logging.error("WS closed – retrying in %ds", backoff)
-            time.sleep(backoff)
-            backoff = min(backoff * 2, 16)
+                logging.error("WS closed – retrying in %ds", backoff)
+                await self._sleep(backoff)
+                backoff = min(backoff * 2, 16)
+        finally:
+            probe.cancel()
+
+    @property
+    def connected(self) -> bool:
+        return self._ws is not None
+
+    @property
+    def live(self) -> bool:
+        """Connected and ticking within ``FEED_SILENT_SEC``, merged or not."""
+        return self.connected and time.monotonic() - self.last_tick <= FEED_SILENT_SEC
+
+    async def close(self) -> None:
+        """Stop reconnecting and close the live socket, if any."""
+        self._closed = True
+        if self._ws is not None:
+            try:
+                await self._ws.close()
+            except Exception:  # noqa: BLE001
+                pass
 
     # ————— internals —————
-    def _on_open(self, _):
+    async def _sleep(self, delay: float) -> None:
+        if self._hub is not None:
+            await self._hub.sleep(delay, self.name)
+        else:
+            await asyncio.sleep(delay)
+
+    async def _lag_probe(self, interval: float = 1.0) -> None:
+        while not self._closed:
+            await self._sleep(interval)
+
+    async def _on_open(self) -> None:
         print("-- Subscribed! --")
-        sub = {
-            "type": "subscribe",
-            "product_ids": self._products,
-            "channels": ["ticker"],
-        }
-        self._ws.send(json.dumps(sub))
+        self.last_tick = time.monotonic()  # the subscription gets a grace period
+        if self.advanced:  # Advanced Trade takes one channel per subscribe
+            subs = [
+                {"type": "subscribe", "product_ids": self._products, "channel": ch}
+                for ch in self.channels
+            ]
+        else:
+            subs = [
+                {
+                    "type": "subscribe",
+                    "product_ids": self._products,
+                    "channels": self.channels,
+                }
+            ]
+        for sub in subs:
+            await self._ws.send(json.dumps(sub))
         if self._on_open_cb:
             self._on_open_cb()
 
     def _on_msg(self, _, msg: str):
         try:
-            j = json.loads(msg)
-            if j.get("type") == "ticker":
-                self._store[j["product_id"]] = float(j["price"])
-                self._last_update = time.monotonic()
-                if self._on_tick_cb:
-                    self._on_tick_cb(j)
+            if self.advanced:
+                if sniff_channel(msg) == "market_trades":
+                    for tick in self._decoder.ticks(msg, time.time()):
+                        self._apply(tick)
+                return
+            kind = sniff_type(msg)
+            if kind == "ticker":
+                self._apply(self._decoder.tick(msg, time.time()))
+            elif kind in BOOK_TYPES and self._on_book_cb:
+                self._on_book_cb(self._decoder.loads(msg))
         except Exception as exc:  # noqa: BLE001
             logging.debug("malformed ws msg: %s (%s)", msg[:120], exc)
 
-    def _on_err(self, _, err):
-        logging.error("WS error: %s", err)
-        if self._on_fail_cb:
-            self._on_fail_cb()
+    def _apply(self, tick: Tick) -> None:
+        self.last_tick = time.monotonic()
+        if self._merger is not None and not self._merger.accept(self.name, tick):
+            return
+        self._store[tick.symbol] = tick.price
+        self._last_update = time.monotonic()
+        if self._on_tick_cb:
+            self._on_tick_cb(tick)
+
+
+def _iso(ts: float) -> str:
+    """Epoch seconds → ISO-8601 UTC with a ``Z`` suffix (no ``+`` to escape)."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _held(symbols: List[str]) -> set:
+    """Those of *symbols* with an open position in the risk ledger."""
+    from atlasbot import risk
 
-    def _on_close(self, *_):
-        if self._on_fail_cb:
-            self._on_fail_cb()
+    return risk.open_symbols().intersection(symbols)
 
 
 def _seed_prices(products: List[str], price_store: Dict[str, float]):
     """Best-effort REST seed so we’re never empty."""
     import warnings
 
-    import requests
-
     warnings.filterwarnings("ignore", category=UserWarning)
     for p in products:
         try:
-            r = requests.get(REST_TICKER_FMT.format(p), timeout=2).json()
+            r = http.get(REST_TICKER_FMT.format(p), timeout=2).json()
             price_store[p] = float(r["price"])
-            try:
-                _md = get_market()
-                _md._last_update = time.monotonic()
-            except Exception:
-                pass
         except Exception:  # noqa: BLE001
             pass
 
 
+class StalePrice(RuntimeError):
+    """*symbol*'s last price is older than the caller accepts."""
+
+    def __init__(self, symbol: str, age: float):
+        super().__init__(f"Price for {symbol} is {age:.1f}s old")
+        self.symbol = symbol
+        self.age = age
+
+
 # ---------------------------------------------------------------- MarketData singleton
 class MarketData:
     _instance: "MarketData | None" = None
 
-    def __new__(cls, symbols: List[str]):
+    def __new__(cls, symbols: List[str], source: "Replay | None" = None):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
-            cls._instance._init(symbols)
+            try:
+                cls._instance._init(symbols, source)
+            except BaseException:
+                cls._instance = None
+                raise
         return cls._instance
 
     # ————— internal init —————
-    def _init(self, symbols: List[str]):
+    def _init(self, symbols: List[str], source: "Replay | None" = None):
         self._symbols = symbols
         self._prices: Dict[str, float] = {}
-        self._bars: Dict[str, Deque[Tuple[float, float, float, float]]] = {
-            s: deque(maxlen=BAR_HISTORY) for s in symbols
+        self._price_ts: Dict[str, float] = {}  # clock.monotonic() of last update
+        self._rest_ts: Dict[str, float] = {}  # time.monotonic() of last REST price
+        self._bars: Dict[str, BarStore] = {s: BarStore(BAR_HISTORY) for s in symbols}
+        self._rollups: Dict[str, Dict[str, BarRollup]] = {
+            s: {
+                res: BarRollup(sec, ROLLUP_HISTORY, BAR_SEC)
+                for res, sec in RESOLUTIONS.items()
+                if sec > BAR_SEC
+            }
+            for s in symbols
         }
-        self._last_update = time.monotonic()
+        self._ind: Dict[str, Indicators] = {s: Indicators() for s in symbols}
+        self._features = FeatureCache()
+        self._matrix: "BarMatrix | None" = None
+        self._matrix_lock = threading.Lock()
+        self._agg = BarAggregator()
+        self._bar_subs: List[Callable[[str, Bar], None]] = []
+        self._books: Dict[str, OrderBook] = {s: OrderBook(s) for s in symbols}
+        self._last_update = clock.monotonic()
         self.mode = "websocket"
         self.reconnects = 0
-        self._rest_thread: threading.Thread | None = None
+        self._rest_task: asyncio.Task | None = None
+        self._feeds: List[_WSClient] = []
+        self.merger = FeedMerger() if WS_DUAL_FEED else None
         self.warmup_complete = False
+        self.warmup_seconds = 0.0
+        self._recorder = None
+        self._hub: MarketDataHub | None = None
+        if source is not None:
+            # recorded ticks / candles stand in for every socket and poller
+            self.mode = "replay"
+            source.attach(self)
+            return
+        if RECORD_DIR:
+            self._recorder = TickRecorder(RECORD_DIR)
 
         self._warm_start()
 
-        # start socket thread (legacy first → auto-fallback handled in _ws_runner)
-        threading.Thread(target=self._ws_runner, name="CBWS", daemon=True).start()
-
-        # start bar builder
-        threading.Thread(
-            target=self._bar_worker, name="BarBuilder", daemon=True
-        ).start()
+        # one loop owns sockets (legacy first → auto-fallback in _ws_runner),
+        # the bar builder and the spread poller
+        self._hub = MarketDataHub()
+        self._hub.spawn(self._ws_runner(), "CBWS")
+        self._hub.spawn(self._bar_closer(), "BarBuilder")
+        self._hub.spawn(_spread_loop(self._hub, self), "Spread")
 
     def _warm_start(self) -> None:
-        import requests
+        t0 = time.monotonic()
+        cache = CandleCache(keep=BAR_HISTORY)
+        workers = max(1, min(WARM_CONCURRENCY, len(self._symbols)))
 
-        url_fmt = (
-            "https://api.exchange.coinbase.com/products/{}/candles"
-            "?granularity=60&limit=150"
-        )
-        for sym in self._symbols:
+        def fetch(sym: str) -> List[tuple]:
             try:
-                r = requests.get(url_fmt.format(sym), timeout=5)
-                data = r.json()
-
-                # API returns newest-first; iterate oldest-first for bar history
-                for row in reversed(data):
-                    _, low, high, open_, close, *_ = row
-                    self._bars[sym].append((open_, high, low, close))
-
-                # —— FIX ——
-                # Only set a live price when we *will* wait for WebSocket ticks.
-                # Unit-tests monkey-patch SEED_TIMEOUT = 0 to force REST seeding.
-                if data and SEED_TIMEOUT:
-                    self._prices[sym] = float(data[0][4])  # latest close
-                    self._last_update = time.monotonic()
-            except Exception:
-                pass
+                return self._fetch_candles(cache, sym)
+            except Exception as exc:  # noqa: BLE001
+                logging.debug("candle fetch for %s failed: %s", sym, exc)
+                return cache.load(sym)  # keep what the cache already holds
+
+        # candle connections stay pooled for the ticker and book polls
+        with ThreadPoolExecutor(workers, thread_name_prefix="WarmStart") as pool:
+            history = dict(zip(self._symbols, pool.map(fetch, self._symbols)))
+
+        for sym, rows in history.items():
+            bars = [Bar(ts, o, h, low, c, v, 0) for ts, low, h, o, c, v in rows]
+            for bar in bars:
+                self._bars[sym].append(bar)
+                for roll in self._rollups[sym].values():
+                    roll.update(bar)
+            ind = self._ind[sym]
+            ind.seed(bars[-ind.keep :])
+            self._features.bump(sym, self._bars[sym].seq)
+
+            # —— FIX ——
+            # Only set a live price when we *will* wait for WebSocket ticks.
+            # Unit-tests monkey-patch SEED_TIMEOUT = 0 to force REST seeding.
+            if rows and SEED_TIMEOUT:
+                self._prices[sym] = float(rows[-1][4])  # latest close
+                self._last_update = self._price_ts[sym] = clock.monotonic()
 
         self.warmup_complete = all(self._bars[s] for s in self._symbols)
+        self.warmup_seconds = time.monotonic() - t0
+
+    @staticmethod
+    def _fetch_candles(cache: CandleCache, sym: str) -> List[tuple]:
+        """Cached candles for *sym* plus the missing tail from ``/candles``."""
+        rows = cache.load(sym)
+        now = time.time()
+        params: Dict[str, Any] = {"granularity": BAR_SEC}
+        if rows and now - rows[-1][0] < MAX_CANDLES * BAR_SEC:
+            params["start"] = _iso(rows[-1][0])
+            params["end"] = _iso(now)
+        else:
+            if rows:  # too stale to bridge – start over
+                cache.clear(sym)
+                rows = []
+            params["limit"] = WARM_BARS
+
+        # API returns newest-first; keep oldest-first, strictly increasing ts
+        last = rows[-1][0] if rows else float("-inf")
+        fresh = []
+        resp = http.get(CANDLES_URL.format(sym), params=params, timeout=5)
+        for row in sorted(resp.json(), key=lambda r: r[0]):
+            ts, low, high, open_, close, *rest = row
+            if ts > last:
+                fresh.append((ts, low, high, open_, close, rest[0] if rest else 0.0))
+                last = ts
+        # never persist the still-forming minute
+        cache.append(sym, [r for r in fresh if r[0] + BAR_SEC <= now])
+        return rows + fresh
 
     # ————— public API —————
     def wait_ready(self, timeout: int = 15) -> bool:
         """True if every symbol has at least one price within *timeout* seconds."""
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
+        deadline = clock.monotonic() + timeout
+        while clock.monotonic() < deadline:
             if all(s in self._prices for s in self._symbols):
                 return True
-            time.sleep(0.2)
+            clock.sleep(0.2)
         return False
 
     def latest_trade(self, sym: str) -> float:
@@ -211,48 +578,169 @@ class MarketData:
         except KeyError as exc:
             raise RuntimeError(f"No live price yet for {sym}") from exc
 
-    def minute_bars(self, sym: str) -> Deque[Tuple[float, float, float, float]]:
+    def price_age(self, sym: str) -> float:
+        """Seconds since *sym*'s price last changed hands (``inf`` if never)."""
+        return clock.monotonic() - self._price_ts.get(sym, float("-inf"))
+
+    def minute_bars(self, sym: str) -> BarStore:
+        """Bar history as a sequence of ``(o, h, l, c)`` (compatibility shim)."""
         return self._bars[sym]
 
+    def bar_window(self, sym: str, n: int | None = None) -> BarWindow:
+        """Zero-copy OHLCV column views of *sym*'s last *n* minute bars."""
+        return self._bars[sym].window(n)
+
+    def bars(self, sym: str, resolution: str = "1m") -> BarStore:
+        """Closed bars for *sym* at *resolution* (one of ``RESOLUTIONS``)."""
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"unknown resolution {resolution}")
+        if RESOLUTIONS[resolution] <= BAR_SEC:
+            return self._bars[sym]
+        return self._rollups[sym][resolution].store
+
+    def indicators(self, sym: str) -> Indicators:
+        """Incrementally maintained ATR / volatility / momentum / breakout."""
+        return self._ind[sym]
+
+    def bar_matrix(self) -> "BarMatrix":
+        """Recent bars of every symbol as 2-D arrays for the batch signal path.
+
+        Built from the bar stores on first use, then kept current on close.
+        """
+        if self._matrix is None:
+            from atlasbot.batch import BarMatrix
+
+            with self._matrix_lock:
+                if self._matrix is None:
+                    m = BarMatrix(self._symbols)
+                    for sym in self._symbols:
+                        w = self._bars[sym].window(m.window)
+                        m.seed(sym, (Bar(*row) for row in zip(*w)))
+                    self._matrix = m
+        return self._matrix
+
+    def feature(
+        self, sym: str, name: str, params: Hashable, compute: Callable[[], Any]
+    ) -> Any:
+        """``compute()`` memoised until *sym*'s next bar close."""
+        return self._features.get(sym, name, params, compute)
+
+    def book(self, sym: str) -> OrderBook | None:
+        """Live local L2 book for *sym*, or ``None`` if unsynced/stale."""
+        book = self._books.get(sym)
+        if book is None or not book.synced or book.age() > BOOK_STALE_SEC:
+            return None
+        return book
+
+    def subscribe_bars(self, cb: Callable[[str, Bar], None]) -> None:
+        """Call ``cb(symbol, bar)`` on the hub loop whenever a bar closes."""
+        self._bar_subs.append(cb)
+
+    def snapshot(self, symbols: List[str] | None = None) -> MarketSnapshot:
+        """Prices, spreads, last closed bars and feed age of *symbols*, now."""
+        syms = self._symbols if symbols is None else symbols
+        prices = self._prices.copy()  # one atomic read; the feed keeps writing
+        stamps = self._price_ts.copy()
+        now = clock.monotonic()
+        return MarketSnapshot.of(
+            {s: prices[s] for s in syms if s in prices},
+            {s: get_spread_bps(s) for s in syms},
+            {s: self._bars[s].last() if s in self._bars else None for s in syms},
+            feed_age=now - self._last_update,
+            ages={s: now - stamps.get(s, float("-inf")) for s in syms},
+            symbols=syms,
+        )
+
     def feed_latency(self) -> float:
         """Seconds since the last price update."""
-        return time.monotonic() - self._last_update
+        return clock.monotonic() - self._last_update
+
+    def loop_lag(self) -> Dict[str, float]:
+        """Seconds the hub loop was late waking each connection/task."""
+        return self._hub.loop_lag() if self._hub is not None else {}
+
+    def close(self) -> None:
+        """Tear down every feed connection and background task."""
+        if self._hub is not None:
+            self._hub.stop()
+        if self._recorder is not None:
+            self._recorder.close()
+
+    # ————— hub coroutines —————
+    def _new_client(
+        self, url: str, name: str, channels: List[str] | None = None
+    ) -> _WSClient:
+        advanced = url == WS_URL_ADVANCED  # trades only: no level2_batch there
+        ws = _WSClient(
+            url,
+            self._symbols,
+            self._prices,
+            on_open_cb=self._on_ws_open,
+            on_fail_cb=lambda: self._on_ws_fail(ws),
+            on_tick_cb=self._on_ticker,
+            on_book_cb=self._on_book,
+            channels=channels
+            or (["market_trades"] if advanced else ["ticker", L2_CHANNEL]),
+            hub=self._hub,
+            name=name,
+            merger=self.merger,
+            advanced=advanced,
+        )
+        self._feeds.append(ws)
+        return ws
 
-    # ————— threads —————
-    def _ws_runner(self):
+    async def _ws_runner(self):
+        if self.merger is not None:
+            await self._dual_ws_runner()
+            return
         # first try legacy; if nothing arrives in SEED_TIMEOUT fallback → advanced
-        for url in (WS_URL_PRO, WS_URL_ADVANCED):
+        for url, name in ((WS_URL_PRO, "ws_pro"), (WS_URL_ADVANCED, "ws_advanced")):
             seed_t0 = time.monotonic()
-            ws = _WSClient(
-                url,
-                self._symbols,
-                self._prices,
-                on_open_cb=self._on_ws_open,
-                on_fail_cb=self._on_ws_fail,
-                on_tick_cb=on_tick,
-            )
-            t = threading.Thread(target=ws.run_forever, daemon=True)
-            t.start()
+            ws = self._new_client(url, name)
+            task = self._hub.spawn(ws.run(), name)
             while time.monotonic() - seed_t0 < SEED_TIMEOUT:
                 if self._prices:
                     return
-                time.sleep(0.2)
-            if ws._ws:
-                ws._ws.close()
-
-        _seed_prices(self._symbols, self._prices)
-        self._last_update = time.monotonic()
+                await self._hub.sleep(0.2, "failover")
+            await ws.close()
+            task.cancel()
+            self._feeds.remove(ws)
+
+        await asyncio.to_thread(_seed_prices, self._symbols, self._prices)
+        self._last_update = clock.monotonic()
+        self._price_ts.update(dict.fromkeys(self._prices, self._last_update))
         self._switch_to_rest()
 
-        ws = _WSClient(
-            WS_URL_ADVANCED,
-            self._symbols,
-            self._prices,
-            on_open_cb=self._on_ws_open,
-            on_fail_cb=self._on_ws_fail,
-            on_tick_cb=on_tick,
-        )
-        threading.Thread(target=ws.run_forever, daemon=True).start()
+        ws = self._new_client(WS_URL_ADVANCED, "ws_advanced")
+        self._hub.spawn(ws.run(), "ws_advanced")
+
+    async def _dual_ws_runner(self) -> None:
+        """Run the legacy and Advanced Trade feeds side by side.
+
+        Both carry trades – the legacy ``ticker``, Advanced Trade
+        ``market_trades`` – merged by trade id in ``self.merger``; the L2 book comes
+        from the legacy feed only. Each reconnects on its own, and REST
+        polling takes over only while neither is ``live`` – a feed that
+        stays connected but stops ticking counts as down.
+        """
+        for url, name, channels in (
+            (WS_URL_PRO, "ws_pro", ["ticker", L2_CHANNEL]),
+            (WS_URL_ADVANCED, "ws_advanced", ["market_trades"]),
+        ):
+            self._hub.spawn(self._new_client(url, name, channels).run(), name)
+        seed_t0 = time.monotonic()
+        while not self._prices and time.monotonic() - seed_t0 < SEED_TIMEOUT:
+            await self._hub.sleep(0.2, "failover")
+        if not self._prices:
+            await asyncio.to_thread(_seed_prices, self._symbols, self._prices)
+            self._last_update = clock.monotonic()
+            self._price_ts.update(dict.fromkeys(self._prices, self._last_update))
+        while True:  # silence never fires on_fail: watch tick ages instead
+            if not any(f.live for f in self._feeds):
+                self._switch_to_rest()
+            elif self.mode == "rest":
+                self._on_ws_open()
+            await self._hub.sleep(1.0, "failover")
 
     # --- websocket callbacks & REST polling ---
     def _on_ws_open(self) -> None:
@@ -260,92 +748,197 @@ class MarketData:
             logging.warning("WS reconnected – switching back to WebSocket")
         self.mode = "websocket"
 
-    def _on_ws_fail(self) -> None:
+    def _on_ws_fail(self, feed: _WSClient | None = None) -> None:
         self.reconnects += 1
+        if feed is None or L2_CHANNEL in feed.channels:
+            for book in self._books.values():
+                book.reset()
+        if any(f.live for f in self._feeds):
+            return  # a redundant feed is still ticking
         self._switch_to_rest()
 
     def _switch_to_rest(self) -> None:
         if self.mode != "rest":
             logging.warning("⚠️  WS failed – switching to REST polling")
             self.mode = "rest"
-        self._start_rest_thread()
+        self._start_rest_task()
 
-    def _start_rest_thread(self) -> None:
-        if self._rest_thread and self._rest_thread.is_alive():
+    def _start_rest_task(self) -> None:
+        if self._rest_task and not self._rest_task.done():
             return
-        self._rest_thread = threading.Thread(
-            target=self._rest_poller, name="RESTPoll", daemon=True
-        )
-        self._rest_thread.start()
-
-    def _rest_poller(self) -> None:
-        import requests
-
+        self._rest_task = self._hub.spawn(self._rest_poller(), "RESTPoll")
+
+    async def _rest_poller(self) -> None:
+        """Poll ``/ticker`` for every due symbol at once.
+
+        At most ``REST_CONCURRENCY`` requests are in flight, so a round takes
+        as long as its slowest request rather than the sum of them. Symbols
+        with an open position are due every ``REST_HOT_INTERVAL``, the rest
+        every ``REST_POLL_INTERVAL``; the stalest go first, and one whose REST
+        price is older than ``REST_STALE_BUDGET`` joins every round.
+        """
+        window = asyncio.Semaphore(max(1, REST_CONCURRENCY))
+        due = dict.fromkeys(self._symbols, 0.0)
         while self.mode == "rest":
-            for sym in self._symbols:
-                try:
-                    r = requests.get(REST_TICKER_FMT.format(sym), timeout=5)
-                    if r.ok:
-                        self._prices[sym] = float(r.json()["price"])
-                        self._last_update = time.monotonic()
-                except Exception:  # noqa: BLE001
-                    pass
-            time.sleep(REST_POLL_INTERVAL)
-
-    def _bar_worker(self):
-        last = datetime.now(timezone.utc).replace(second=0, microsecond=0)
-        bucket: Dict[str, List[float]] = defaultdict(list)
+            now = time.monotonic()
+            batch = sorted(
+                (
+                    s
+                    for s in self._symbols
+                    if due[s] <= now or self.rest_age(s) > REST_STALE_BUDGET
+                ),
+                key=self.rest_age,
+                reverse=True,
+            )
+            await asyncio.gather(*(self._poll_ticker(s, window) for s in batch))
+            hot, done = _held(batch), time.monotonic()
+            for s in batch:
+                due[s] = done + (REST_HOT_INTERVAL if s in hot else REST_POLL_INTERVAL)
+            await self._hub.sleep(max(min(due.values()) - done, 0.0), "rest")
+
+    async def _poll_ticker(self, sym: str, window: asyncio.Semaphore) -> None:
+        async with window:
+            try:
+                r = await asyncio.to_thread(
+                    http.get, REST_TICKER_FMT.format(sym), timeout=5
+                )
+                if not r.ok:
+                    return
+                j = r.json()
+                price = float(j["price"])
+            except Exception:  # noqa: BLE001
+                return
+        self._on_rest_price(sym, price, j.get("time"))
+
+    def _on_rest_price(self, sym: str, price: float, ts: str | None = None) -> None:
+        """Apply a REST ``/ticker`` price the way a WebSocket tick is applied."""
+        self._prices[sym] = price
+        self._last_update = clock.monotonic()
+        self._rest_ts[sym] = time.monotonic()
+        self._on_trade(sym, parse_ts(ts, time.time()), price)
+
+    def rest_age(self, sym: str) -> float:
+        """Seconds since the REST poller last priced *sym* (``inf`` if never)."""
+        return time.monotonic() - self._rest_ts.get(sym, float("-inf"))
+
+    def rest_ages(self) -> Dict[str, float]:
+        """``rest_age`` of every symbol the REST poller has priced."""
+        now = time.monotonic()
+        return {s: now - t for s, t in list(self._rest_ts.items())}
+
+    # --- L2 book ---
+    def _on_book(self, msg: dict) -> None:
+        book = self._books.get(msg.get("product_id"))
+        if book is None:
+            return
+        if msg["type"] == "snapshot":
+            book.apply_snapshot(msg.get("bids", ()), msg.get("asks", ()))
+        else:
+            book.apply_changes(msg.get("changes", ()))
+        spread = book.spread_bps()
+        if spread is not None:
+            _SPREAD[book.symbol] = _clamp_spread(spread)
+
+    # --- bar building (tick driven) ---
+    def _on_ticker(self, tick: Tick) -> None:
+        if self._recorder is not None:
+            self._recorder.record(tick)
+        on_tick(tick)
+        self._on_trade(tick.symbol, tick.ts, tick.price, tick.size)
+
+    def _on_trade(self, sym: str, ts: float, price: float, size: float = 0.0):
+        self._price_ts[sym] = clock.monotonic()
+        closed = self._agg.ingest(sym, ts, price, size)
+        if closed is not None:
+            self._emit_bar(sym, closed)
+
+    def _emit_bar(self, sym: str, bar: Bar) -> None:
+        if sym not in self._bars:
+            return
+        store = self._bars[sym]
+        last = store.last()
+        if last is not None and bar.ts <= last.ts:
+            if bar.ts < last.ts:
+                return
+            # warm start ended on this (then partial) minute – merge into it
+            bar = bar._replace(
+                open=last.open,
+                high=max(last.high, bar.high),
+                low=min(last.low, bar.low),
+                volume=last.volume + bar.volume,
+                trades=last.trades + bar.trades,
+            )
+            store.replace_last(bar)
+        else:
+            store.append(bar)
+        for roll in self._rollups[sym].values():
+            roll.update(bar)
+        self._ind[sym].update(bar)
+        with self._matrix_lock:  # a first bar_matrix() may be seeding it
+            if self._matrix is not None:
+                self._matrix.update(sym, bar)
+        self._features.bump(sym, store.seq)
+        for cb in self._bar_subs:
+            try:
+                cb(sym, bar)
+            except Exception as exc:  # noqa: BLE001
+                logging.error("bar subscriber failed: %s", exc)
+
+    async def _bar_closer(self) -> None:
+        """Close quiet symbols' bars just after each minute boundary."""
         while True:
-            now = datetime.now(timezone.utc)
-            for s, px in self._prices.items():
-                bucket[s].append(px)
-            if now >= last + timedelta(minutes=1):
-                for s, prices in bucket.items():
-                    if prices:
-                        o, h, low, c = (
-                            prices[0],
-                            max(prices),
-                            min(prices),
-                            prices[-1],
-                        )
-                        self._bars[s].append((o, h, low, c))
-                bucket.clear()
-                last = now.replace(second=0, microsecond=0)
-            time.sleep(1)
+            now = clock.now()
+            boundary = now - now % BAR_SEC + BAR_SEC
+            await self._hub.sleep(boundary + BAR_CLOSE_GRACE - now, "bars")
+            self._close_bars(boundary)
+
+    def _close_bars(self, boundary: float) -> None:
+        for sym, bar in self._agg.close_due(boundary):
+            self._emit_bar(sym, bar)
 
 
 # ---------------------------------------------------------------- helper
 _market: MarketData | None = None
 
 
-def get_market(symbols: List[str] = SYMBOLS) -> MarketData:
+_market_lock = threading.Lock()
+
+
+def get_market(
+    symbols: List[str] = SYMBOLS, source: "Replay | None" = None
+) -> MarketData:
+    """The shared ``MarketData``; passing *source* replaces it with a replay."""
     global _market
-    if _market is None:
-        MarketData._instance = None
-        _market = MarketData(symbols)
+    if _market is None or source is not None:
+        with _market_lock:
+            if _market is None or source is not None:
+                if MarketData._instance is not None:
+                    MarketData._instance.close()
+                MarketData._instance = None
+                _market = MarketData(symbols, source)
     return _market
 
 
 _SPREAD = _collections.defaultdict(lambda: 8)
 
 
-def on_tick(msg: dict) -> None:
+def on_tick(tick: Tick) -> None:
     """Update latency metrics on each tick."""
 
     md = get_market()
-    md._last_update = time.monotonic()
-    now = time.time()
-    gap = (now - on_tick.last_seen[msg["product_id"]]) * 1000
+    md._last_update = clock.monotonic()
+    now = clock.now()
+    gap = (now - on_tick.last_seen[tick.symbol]) * 1000
     from atlasbot import metrics
 
     h = metrics.feed_latency_ms
     if hasattr(h, "labels"):
-        h = h.labels(msg["product_id"])
+        h = h.labels(tick.symbol)
     h.observe(gap)
-    on_tick.last_seen[msg["product_id"]] = now
+    on_tick.last_seen[tick.symbol] = now
 
 
-on_tick.last_seen = _collections.defaultdict(lambda: time.time())
+on_tick.last_seen = _collections.defaultdict(lambda: clock.now())
 
 
 def get_spread_bps(sym: str) -> int:
@@ -355,24 +948,30 @@ def get_spread_bps(sym: str) -> int:
     return max(1, min(15, int(val)))
 
 
-def _spread_loop() -> None:
-    """Background spread fetcher updating ``_SPREAD`` every minute."""
+def _clamp_spread(spread_bps: float) -> int:
+    return max(1, min(15, int(_math.ceil(spread_bps * 2))))
+
+
+async def _spread_loop(hub: MarketDataHub, md: "MarketData | None" = None) -> None:
+    """Hub coroutine polling ``_SPREAD`` for symbols without a live L2 book."""
 
     while True:
         for s in SYMBOLS_DEFAULT:
+            if md is not None and md.book(s) is not None:
+                continue
             try:
-                book = _requests.get(
-                    f"https://api.exchange.coinbase.com/products/{s}/book",
-                    params={"level": 1},
-                    timeout=1,
+                book = (
+                    await asyncio.to_thread(
+                        http.get,
+                        f"https://api.exchange.coinbase.com/products/{s}/book",
+                        params={"level": 1},
+                        timeout=1,
+                    )
                 ).json()
                 bid = float(book["bids"][0][0])
                 ask = float(book["asks"][0][0])
                 spread = (ask - bid) * 1e4 / ((ask + bid) / 2)
-                _SPREAD[s] = max(1, min(15, int(_math.ceil(spread * 2))))
+                _SPREAD[s] = _clamp_spread(spread)
             except Exception:  # noqa: BLE001
                 pass
-        _time.sleep(int(_os.getenv("SPREAD_SEC", "60")))
-
-
-_threading.Thread(target=_spread_loop, daemon=True).start()
+        await hub.sleep(int(_os.getenv("SPREAD_SEC", "60")), "spread")
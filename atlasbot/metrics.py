@@ -1,7 +1,6 @@
 import threading
 import time
 
-import requests
 from prometheus_client import (
     CollectorRegistry,
     Counter,
@@ -11,10 +10,12 @@ from prometheus_client import (
 )
 
 import atlasbot.risk as risk
+from atlasbot import http_client as http
 from atlasbot.config import REST_TICKER_FMT
 from atlasbot.market_data import get_market
 from atlasbot.risk import cash, daily_pnl, equity, gross, maker_fill_ratio, total_mtm
 from atlasbot.signals import poll_latency
+from atlasbot.signals import registry as signal_registry
 
 REGISTRY = CollectorRegistry()
 feed_latency_ms = Histogram(
@@ -34,6 +35,18 @@ rest_latency_g = Gauge(
     "REST poll latency (ms)",
     registry=REGISTRY,
 )
+loop_lag_ms = Gauge(
+    "atlasbot_loop_lag_ms",
+    "Market-data hub loop lag per connection (ms)",
+    ["conn"],
+    registry=REGISTRY,
+)
+rest_price_age_g = Gauge(
+    "atlasbot_rest_price_age_seconds",
+    "Seconds since the REST fallback poller last priced each symbol",
+    ["symbol"],
+    registry=REGISTRY,
+)
 reconnects_g = Gauge(
     "atlasbot_reconnects_total",
     "WebSocket reconnect count",
@@ -62,6 +75,33 @@ edge_hist = Histogram(
     registry=REGISTRY,
     buckets=(5, 10, 15, 20, 25, 30, 40, 50, 80, 100, 150),
 )
+cycle_stage_seconds = Histogram(
+    "atlasbot_cycle_stage_seconds",
+    "Wall time of each IntradayTrader.run_cycle stage",
+    ["stage"],
+    registry=REGISTRY,
+    buckets=(1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 300, 3600),
+)
+order_fill_seconds = Histogram(
+    "atlasbot_order_fill_seconds",
+    "Clock time from order submission to complete fill",
+    registry=REGISTRY,
+    buckets=(0.1, 0.5, 1, 2, 3, 5, 10, 30, 60, 300),
+)
+order_state_seconds = Histogram(
+    "atlasbot_order_state_seconds",
+    "Clock time orders spend in each state before leaving it",
+    ["state"],
+    registry=REGISTRY,
+    buckets=(0.1, 0.5, 1, 2, 3, 5, 10, 30, 60, 300),
+)
+http_latency_seconds = Histogram(
+    "atlasbot_http_latency_seconds",
+    "REST call latency over the shared keep-alive client",
+    ["endpoint"],
+    registry=REGISTRY,
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1, 2, 5),
+)
 trade_count_day_g = Gauge(
     "atlasbot_trade_count_day", "Trades executed today", registry=REGISTRY
 )
@@ -75,11 +115,82 @@ gpt_last_success_ts = Gauge(
 warmup_complete_g = Gauge(
     "atlasbot_warmup_complete", "Initial bar warmup complete", registry=REGISTRY
 )
+warmup_seconds_g = Gauge(
+    "atlasbot_warmup_seconds", "Initial bar warmup duration", registry=REGISTRY
+)
 feed_watchdog_total = Counter(
     "atlasbot_feed_watchdog_total",
     "Feed latency watchdog triggers",
     registry=REGISTRY,
 )
+feature_cache_hits = Counter(
+    "atlasbot_feature_cache_hits_total",
+    "Bar-feature reads served from the cache",
+    ["feature"],
+    registry=REGISTRY,
+)
+feature_cache_misses = Counter(
+    "atlasbot_feature_cache_misses_total",
+    "Bar-feature reads that recomputed the value",
+    ["feature"],
+    registry=REGISTRY,
+)
+signal_evals_total = Counter(
+    "atlasbot_signal_evals_total",
+    "Ensemble signal evaluations",
+    ["signal"],
+    registry=REGISTRY,
+)
+signal_eval_seconds = Counter(
+    "atlasbot_signal_eval_seconds_total",
+    "Time spent evaluating ensemble signals",
+    ["signal"],
+    registry=REGISTRY,
+)
+signal_skips_total = Counter(
+    "atlasbot_signal_skips_total",
+    "Signal evaluations skipped (reason: weight)",
+    ["signal", "reason"],
+    registry=REGISTRY,
+)
+
+http_coalesced_total = Counter(
+    "atlasbot_http_coalesced_total",
+    "REST GETs that shared an identical in-flight call",
+    ["endpoint"],
+    registry=REGISTRY,
+)
+http_cached_total = Counter(
+    "atlasbot_http_cached_total",
+    "REST GETs answered from the short-TTL response cache",
+    ["endpoint"],
+    registry=REGISTRY,
+)
+http_throttled_total = Counter(
+    "atlasbot_http_throttled_total",
+    "REST calls delayed by the per-endpoint-class rate limiter",
+    ["endpoint"],
+    registry=REGISTRY,
+)
+
+feed_first_total = Counter(
+    "atlasbot_feed_first_total",
+    "Ticks a WebSocket feed delivered first (WS_DUAL_FEED)",
+    ["feed"],
+    registry=REGISTRY,
+)
+feed_dupes_total = Counter(
+    "atlasbot_feed_dupes_total",
+    "Ticks dropped because the other feed delivered them first",
+    ["feed"],
+    registry=REGISTRY,
+)
+feed_lead_seconds = Counter(
+    "atlasbot_feed_lead_seconds_total",
+    "Summed time a feed's first ticks led the other feed's copies",
+    ["feed"],
+    registry=REGISTRY,
+)
 
 exit_tp_total = Counter(
     "atlasbot_exit_tp_total", "Take-profit exits", registry=REGISTRY
@@ -98,12 +209,22 @@ def start_metrics_server(port: int = 9000) -> None:
 
 
 def _refresh_prices(symbols: list[str]) -> None:
-    """Update price cache from REST endpoints for *symbols*."""
+    """Update price cache from REST endpoints for *symbols*.
+
+    Prices are applied on the market's hub loop, which owns the bar state.
+    """
+    md = get_market()
+    hub = getattr(md, "_hub", None)
     for sym in symbols:
         try:
-            r = requests.get(REST_TICKER_FMT.format(sym), timeout=5)
+            r = http.get(REST_TICKER_FMT.format(sym), timeout=5)
             if r.ok:
-                get_market()._prices[sym] = float(r.json()["price"])
+                j = r.json()
+                args = (sym, float(j["price"]), j.get("time"))
+                if hub is None:  # replay: no hub thread to hand over to
+                    md._on_rest_price(*args)
+                else:
+                    hub.call_soon(md._on_rest_price, *args)
         except Exception:  # noqa: BLE001
             pass
 
@@ -121,6 +242,56 @@ def heartbeat_watchdog(timeout: int = 120) -> None:
         heartbeat_g.set(0)
 
 
+_published: dict[tuple, float] = {}
+
+
+def _sync(counter, counts, scale: float = 1.0) -> None:
+    """Add to labelled *counter* what the plain *counts* gained since last sync."""
+    for key, n in list(counts.items()):
+        labels = key if isinstance(key, tuple) else (key,)
+        delta = n - _published.get((counter, labels), 0)
+        if delta <= 0:
+            continue
+        _published[(counter, labels)] = n
+        c = counter
+        if hasattr(c, "labels"):
+            c = c.labels(*labels)
+        c.inc(delta * scale)
+
+
+def publish_feature_cache(md) -> None:
+    """Add feature-cache hits/misses counted since the last call."""
+    cache = getattr(md, "_features", None)
+    if cache is None:
+        return
+    _sync(feature_cache_hits, cache.hits)
+    _sync(feature_cache_misses, cache.misses)
+
+
+def publish_signals() -> None:
+    """Add signal evaluations, evaluation time and skips since the last call."""
+    _sync(signal_evals_total, signal_registry.evals)
+    _sync(signal_eval_seconds, signal_registry.eval_ns, 1e-9)
+    _sync(signal_skips_total, signal_registry.skips)
+
+
+def publish_http() -> None:
+    """Add REST calls coalesced, cached and throttled since the last call."""
+    _sync(http_coalesced_total, http.coalesced)
+    _sync(http_cached_total, http.cached)
+    _sync(http_throttled_total, http.throttled)
+
+
+def publish_feeds(md) -> None:
+    """Add dual-feed first deliveries, drops and lead time since the last call."""
+    merger = getattr(md, "merger", None)
+    if merger is None:
+        return
+    _sync(feed_first_total, merger.first)
+    _sync(feed_dupes_total, merger.dupes)
+    _sync(feed_lead_seconds, merger.lead_ns, 1e-9)
+
+
 def _update_loop() -> None:
     md = get_market()
     last_hb = 0.0
@@ -130,6 +301,21 @@ def _update_loop() -> None:
         ws_latency_g.set(md.feed_latency() * 1000)
         rest_latency_g.set(poll_latency() * 1000)
         reconnects_g.set(md.reconnects)
+        if getattr(md, "mode", "") == "rest":
+            for sym, age in md.rest_ages().items():
+                g = rest_price_age_g
+                if hasattr(g, "labels"):
+                    g = g.labels(sym)
+                g.set(age)
+        for conn, lag in getattr(md, "loop_lag", dict)().items():
+            g = loop_lag_ms
+            if hasattr(g, "labels"):
+                g = g.labels(conn)
+            g.set(lag * 1000)
+        publish_feature_cache(md)
+        publish_signals()
+        publish_http()
+        publish_feeds(md)
         pnl_realised_g.set(daily_pnl())
         pnl_mtm_g.set(total_mtm())
         gross_pos_g.set(sum(gross(sym) for sym in md._symbols))
@@ -139,6 +325,7 @@ def _update_loop() -> None:
         trade_count_day_g.set(risk.trade_count_day())
         macro_hit_rate_g.set(risk.macro_hit_rate())
         warmup_complete_g.set(1 if getattr(md, "warmup_complete", False) else 0)
+        warmup_seconds_g.set(getattr(md, "warmup_seconds", 0.0))
         if time.time() - last_hb >= 60:
             heartbeat_g.set(1)
             global _hb_last
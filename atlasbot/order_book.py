@@ -0,0 +1,112 @@
+"""
+Local level-2 order book
+————————————————————————
+• built from the WS ``snapshot`` + ``l2update`` messages, no REST round trip
+• price levels kept sorted (bisect) so best/top-N reads are O(levels)
+• serves imbalance, spread in bps and top-N depth for signals and execution
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DEPTH = 50  # levels summed for imbalance, as REST /book?level=2 returned
+
+
+class _Side:
+    """One side of the book; keys are ``sign * price`` kept ascending."""
+
+    __slots__ = ("sign", "keys", "sizes")
+
+    def __init__(self, descending: bool):
+        self.sign = -1.0 if descending else 1.0
+        self.keys: List[float] = []
+        self.sizes: Dict[float, float] = {}
+
+    def load(self, levels: Iterable[Sequence]) -> None:
+        self.sizes = {}
+        for lvl in levels:
+            size = float(lvl[1])
+            if size:
+                self.sizes[self.sign * float(lvl[0])] = size
+        self.keys = sorted(self.sizes)
+
+    def set(self, price: float, size: float) -> None:
+        k = self.sign * price
+        if not size:
+            if self.sizes.pop(k, None) is not None:
+                del self.keys[bisect_left(self.keys, k)]
+            return
+        if k not in self.sizes:
+            insort(self.keys, k)
+        self.sizes[k] = size
+
+    def best(self) -> float | None:
+        return self.sign * self.keys[0] if self.keys else None
+
+    def top(self, n: int) -> List[Tuple[float, float]]:
+        return [(self.sign * k, self.sizes[k]) for k in self.keys[:n]]
+
+    def volume(self, n: int) -> float:
+        return sum(self.sizes[k] for k in self.keys[:n])
+
+
+class OrderBook:
+    """Incrementally maintained L2 book for one product."""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bids = _Side(descending=True)
+        self.asks = _Side(descending=False)
+        self.synced = False
+        self.updated = 0.0  # monotonic time of the last applied message
+
+    # ————— feed —————
+    def apply_snapshot(self, bids: Iterable[Sequence], asks: Iterable[Sequence]):
+        self.bids.load(bids)
+        self.asks.load(asks)
+        self.synced = True
+        self.updated = time.monotonic()
+
+    def apply_changes(self, changes: Iterable[Sequence]) -> None:
+        """Apply ``[side, price, size]`` changes; size 0 removes the level."""
+        if not self.synced:
+            return
+        for side, price, size in changes:
+            book = self.bids if side == "buy" else self.asks
+            book.set(float(price), float(size))
+        self.updated = time.monotonic()
+
+    def reset(self) -> None:
+        """Forget the book until the next snapshot (e.g. after a disconnect)."""
+        self.bids.load(())
+        self.asks.load(())
+        self.synced = False
+
+    # ————— reads —————
+    def age(self) -> float:
+        return time.monotonic() - self.updated
+
+    def best_bid(self) -> float | None:
+        return self.bids.best()
+
+    def best_ask(self) -> float | None:
+        return self.asks.best()
+
+    def spread_bps(self) -> float | None:
+        bid, ask = self.bids.best(), self.asks.best()
+        if bid is None or ask is None:
+            return None
+        return (ask - bid) * 1e4 / ((ask + bid) / 2)
+
+    def imbalance(self, depth: int = DEPTH) -> float:
+        """``(bid vol − ask vol) / total`` over the top *depth* levels."""
+        bids, asks = self.bids.volume(depth), self.asks.volume(depth)
+        total = bids + asks
+        return (bids - asks) / total if total else 0.0
+
+    def depth(self, levels: int = 5) -> List[Tuple[float, float]]:
+        """Top *levels* bids then asks as ``[(price, qty)]``."""
+        return self.bids.top(levels) + self.asks.top(levels)
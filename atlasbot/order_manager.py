@@ -0,0 +1,235 @@
+"""
+Order lifecycle and maker→taker escalation
+——————————————————————————————————————————
+• every entry is an ``Order`` moving through an explicit state machine:
+  new → working → partial → filled | cancelled | expired
+• escalation is cycle-driven: maker retries and the taker fallback are
+  clock deadlines in a heap, and nothing runs them in the background –
+  ``poll`` (called once per ``run_cycle``) runs the ones due, so an attempt
+  fires at the first poll after its deadline; ``submit`` calls the backend
+  for the first attempt inline but never sleeps, and ``run`` blocks on one
+  order for callers that want to wait
+• many orders across symbols work at once; each keeps the backend it was
+  sent to and calls its ``on_done`` hook once it reaches a final state
+• time-to-fill and per-state dwell time go to ``atlasbot_order_fill_seconds``
+  and ``atlasbot_order_state_seconds``, both in clock time
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from atlasbot import clock, metrics
+
+logger = logging.getLogger(__name__)
+
+NEW = "new"
+WORKING = "working"
+PARTIAL = "partial"
+FILLED = "filled"
+CANCELLED = "cancelled"
+EXPIRED = "expired"
+
+FINAL = frozenset({FILLED, CANCELLED, EXPIRED})
+_NEXT = {
+    NEW: {WORKING, PARTIAL} | FINAL,
+    WORKING: {PARTIAL} | FINAL,
+    PARTIAL: FINAL,
+}
+# unfilled share of the notional still counted as filled: backends size the
+# quantity at the price they saw, so a complete fill rarely matches to the cent
+_DUST = 0.01
+
+
+@dataclass(eq=False)
+class Order:
+    id: int
+    symbol: str
+    side: str
+    size_usd: float
+    backend: Any = field(repr=False)
+    maker_tries: int  # maker attempts left
+    retry_sec: float  # wait after each unfilled maker attempt
+    taker: bool  # escalate to a market order once maker attempts run out
+    on_done: Optional[Callable[["Order"], None]] = field(default=None, repr=False)
+    state: str = NEW
+    created: float = 0.0
+    since: float = 0.0  # clock time the current state was entered
+    filled_usd: float = 0.0
+    qty: float = 0.0
+    fill_ids: List[str] = field(default_factory=list)
+
+    @property
+    def remaining_usd(self) -> float:
+        return max(self.size_usd - self.filled_usd, 0.0)
+
+    @property
+    def avg_price(self) -> float:
+        return self.filled_usd / self.qty if self.qty else 0.0
+
+    @property
+    def done(self) -> bool:
+        return self.state in FINAL
+
+
+class OrderManager:
+    """Working orders for every symbol, escalated at each poll, never waited on."""
+
+    def __init__(self, maker_tries: int = 3, retry_sec: float = 1.0) -> None:
+        self.maker_tries = maker_tries
+        self.retry_sec = retry_sec
+        self._orders: Dict[int, Order] = {}
+        self._timers: List[Tuple[float, int, int]] = []  # (due, seq, order id)
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        symbol: str,
+        side: str,
+        size_usd: float,
+        backend,
+        maker: bool = True,
+        on_done: Optional[Callable[[Order], None]] = None,
+        maker_tries: int | None = None,
+        retry_sec: float | None = None,
+        taker: bool = True,
+    ) -> Order:
+        """Start an order and make its first attempt; returns without waiting.
+
+        With *maker* the order is posted up to *maker_tries* times,
+        *retry_sec* apart, then sent as a market order (or expired when
+        *taker* is false). Backends without ``submit_maker_order`` go
+        straight to that last step.
+        """
+        if maker_tries is None:
+            maker_tries = self.maker_tries
+        now = clock.now()
+        order = Order(
+            next(self._ids),
+            symbol,
+            side,
+            size_usd,
+            backend,
+            maker_tries=maker_tries if maker else 0,
+            retry_sec=self.retry_sec if retry_sec is None else retry_sec,
+            taker=taker,
+            on_done=on_done,
+            created=now,
+            since=now,
+        )
+        with self._lock:
+            self._orders[order.id] = order
+        self._step(order)
+        return order
+
+    def poll(self) -> List[Order]:
+        """Run every timer due by now; returns the orders that finished."""
+        now = clock.now()
+        due = []
+        with self._lock:
+            while self._timers and self._timers[0][0] <= now:
+                _, _, oid = heapq.heappop(self._timers)
+                order = self._orders.get(oid)
+                if order is not None:
+                    due.append(order)
+        for order in due:
+            self._step(order)
+        return [o for o in due if o.done]
+
+    def next_due(self) -> float | None:
+        """Clock time of the earliest pending timer, if any."""
+        with self._lock:
+            return self._timers[0][0] if self._timers else None
+
+    def run(self, order: Order) -> Order:
+        """Block until *order* is final, sleeping from timer to timer."""
+        while not order.done:
+            due = self.next_due()
+            if due is None:
+                break
+            clock.sleep(max(due - clock.now(), 0.0))
+            self.poll()
+        return order
+
+    def cancel(self, order_id: int) -> bool:
+        """Cancel a working order; ``False`` if it is unknown or already final."""
+        order = self._orders.get(order_id)
+        if order is None or order.done:
+            return False
+        self._finish(order, CANCELLED)
+        return True
+
+    def working(self, symbol: str | None = None) -> List[Order]:
+        """Orders not yet final, for *symbol* or every symbol."""
+        return [o for o in list(self._orders.values()) if symbol in (None, o.symbol)]
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    # ------------------------------------------------------------- internals
+    def _step(self, order: Order) -> None:
+        """One attempt for *order*: a maker post, or the final escalation."""
+        api, args = order.backend, (order.side, order.remaining_usd, order.symbol)
+        try:
+            if order.maker_tries > 0 and hasattr(api, "submit_maker_order"):
+                order.maker_tries -= 1
+                self._fill(order, api.submit_maker_order(*args))
+                if not order.done:
+                    if order.state == NEW:
+                        self._move(order, WORKING)
+                    self._schedule(order, clock.now() + order.retry_sec)
+                return
+            if not order.taker:
+                self._finish(order, EXPIRED)
+                return
+            self._fill(order, api.submit_order(*args))
+        except Exception as exc:  # noqa: BLE001
+            logger.error("order %s %s failed: %s", order.id, order.symbol, exc)
+            if not order.done:
+                self._finish(order, CANCELLED)
+            return
+        if not order.done:  # market order left a remainder: nothing escalates it
+            self._finish(order, CANCELLED)
+
+    def _fill(self, order: Order, fill) -> None:
+        if not fill or fill.qty <= 0:
+            return
+        order.qty += fill.qty
+        order.filled_usd += fill.qty * fill.price
+        order.fill_ids.append(fill.order_id)
+        if order.remaining_usd <= order.size_usd * _DUST:
+            metrics.order_fill_seconds.observe(clock.now() - order.created)
+            self._finish(order, FILLED)
+        elif order.state != PARTIAL:
+            self._move(order, PARTIAL)
+
+    def _schedule(self, order: Order, due: float) -> None:
+        with self._lock:
+            heapq.heappush(self._timers, (due, next(self._seq), order.id))
+
+    def _move(self, order: Order, state: str) -> None:
+        if state not in _NEXT.get(order.state, ()):
+            raise ValueError(f"order {order.id}: {order.state} → {state}")
+        now = clock.now()
+        h = metrics.order_state_seconds
+        if hasattr(h, "labels"):
+            h = h.labels(order.state)
+        h.observe(now - order.since)
+        order.state, order.since = state, now
+
+    def _finish(self, order: Order, state: str) -> None:
+        self._move(order, state)
+        with self._lock:
+            self._orders.pop(order.id, None)  # its timers go stale
+        if order.on_done is not None:
+            try:
+                order.on_done(order)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("order %s on_done failed: %s", order.id, exc)
@@ -0,0 +1,140 @@
+"""
+Open-position tracking and exits
+————————————————————————————————
+• every filled entry becomes a ``Position`` with ATR-based take-profit and
+  stop-loss levels and a ``MAX_HOLD_MIN`` expiry
+• ``check`` evaluates all open positions against one set of prices (the
+  trading cycle's snapshot); ``on_price`` evaluates a single symbol and suits
+  tick-driven callers – neither waits, so holding positions no longer stalls
+  decisions for other symbols
+• triggered exits are taken out under the lock and submitted outside it, one
+  market order each, counted in ``exit_tp_total`` / ``exit_sl_total`` /
+  ``exit_timeout_total``; a failed exit order stays open and is retried
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Tuple
+
+import atlasbot.config as cfg
+from atlasbot import clock, metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Position:
+    symbol: str
+    side: str  # entry side: "buy" | "sell"
+    qty: float
+    entry: float
+    tp: float
+    sl: float
+    expires: float  # clock.now() deadline
+
+    def trigger(self, price: float | None, now: float) -> str | None:
+        """Exit reason at *price* and *now*: "tp", "sl", "timeout" or ``None``."""
+        if price is not None:
+            long = self.side == "buy"
+            if (long and price >= self.tp) or (not long and price <= self.tp):
+                return "tp"
+            if (long and price <= self.sl) or (not long and price >= self.sl):
+                return "sl"
+        if now >= self.expires:
+            return "timeout"
+        return None
+
+
+class PositionManager:
+    """Open positions, at most one per symbol, exited without blocking."""
+
+    def __init__(self) -> None:
+        self._open: Dict[str, Position] = {}
+        self._last_px: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def open(
+        self, symbol: str, side: str, qty: float, entry: float, atr: float
+    ) -> Position:
+        """Track a filled entry with ATR-based TP/SL (``K_TP`` / ``K_SL``)."""
+        sign = 1 if side == "buy" else -1
+        pos = Position(
+            symbol,
+            side,
+            qty,
+            entry,
+            tp=entry + sign * cfg.K_TP * atr,
+            sl=entry - sign * cfg.K_SL * atr,
+            expires=clock.now() + cfg.MAX_HOLD_MIN * 60,
+        )
+        with self._lock:
+            self._open[symbol] = pos
+            self._last_px[symbol] = entry
+        return pos
+
+    def holds(self, symbol: str) -> bool:
+        return symbol in self._open
+
+    def positions(self) -> List[Position]:
+        return list(self._open.values())
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def on_price(self, symbol: str, price: float, backend) -> str | None:
+        """Check *symbol*'s position at *price*; exit through *backend* if hit."""
+        if symbol not in self._open:
+            return None
+        done = self._submit(self._take({symbol: price}, [symbol]), backend)
+        return done[0][1] if done else None
+
+    def check(self, prices: Mapping[str, float], backend) -> List[Tuple[str, str]]:
+        """Check every open position at *prices*; returns ``(symbol, reason)``.
+
+        A symbol missing from *prices* can still time out, at its last seen
+        price.
+        """
+        if not self._open:
+            return []
+        return self._submit(self._take(prices, list(self._open)), backend)
+
+    # ------------------------------------------------------------- internals
+    def _take(
+        self, prices: Mapping[str, float], symbols: List[str]
+    ) -> List[Tuple[Position, str, float]]:
+        now = clock.now()
+        exits = []
+        with self._lock:
+            for sym in symbols:
+                pos = self._open.get(sym)
+                if pos is None:
+                    continue
+                px = prices.get(sym)
+                if px is not None:
+                    self._last_px[sym] = px
+                reason = pos.trigger(px, now)
+                if reason is not None:
+                    del self._open[sym]
+                    exits.append((pos, reason, self._last_px.pop(sym)))
+        return exits
+
+    def _submit(
+        self, exits: List[Tuple[Position, str, float]], backend
+    ) -> List[Tuple[str, str]]:
+        done = []
+        for pos, reason, px in exits:
+            exit_side = "sell" if pos.side == "buy" else "buy"
+            try:
+                backend.submit_order(exit_side, pos.qty * px, pos.symbol)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("exit %s (%s) failed: %s", pos.symbol, reason, exc)
+                with self._lock:  # keep it open; the next check retries
+                    self._open.setdefault(pos.symbol, pos)
+                    self._last_px.setdefault(pos.symbol, px)
+                continue
+            getattr(metrics, f"exit_{reason}_total").inc()
+            done.append((pos.symbol, reason))
+        return done
@@ -0,0 +1,202 @@
+"""
+Deterministic market replay
+———————————————————————————
+• feeds recorded ticks (``TickRecorder`` segments) or cached 1m candles
+  (``CandleCache`` files) into ``MarketData`` in place of the WebSocket feed
+• drives a ``VirtualClock``: bar closes, ``feed_latency``, TP/SL polling and
+  the trading loop all advance on simulated time
+• ``speed`` is 1 (real time), N (N× faster) or ``None`` (as fast as possible)
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+import atlasbot.market_data as market_data
+import atlasbot.utils as utils
+from atlasbot import clock
+from atlasbot.bar_store import Bar
+from atlasbot.candle_cache import CandleCache
+from atlasbot.tick_recorder import read_segment, segment_symbols, segments
+from atlasbot.ws_decode import Tick
+
+Event = Tuple[float, object]  # (simulated time, Tick | (symbol, Bar))
+
+
+class TickSource:
+    """Recorded ticks, timed by their exchange timestamp."""
+
+    def __init__(self, path: Path | str):
+        self.files = segments(path)
+        if not self.files:
+            raise FileNotFoundError(f"no tick segments under {path}")
+
+    def symbols(self) -> List[str]:
+        return list(dict.fromkeys(s for f in self.files for s in segment_symbols(f)))
+
+    def __iter__(self) -> Iterator[Event]:
+        for f in self.files:
+            for _, tick in read_segment(f):
+                yield tick.ts, tick
+
+
+class CandleSource:
+    """Cached 1m candles (one ``<SYM>.bin`` each), released as bars close."""
+
+    def __init__(self, path: Path | str):
+        path = Path(path)
+        files = [path] if path.is_file() else sorted(path.glob("*.bin"))
+        if not files:
+            raise FileNotFoundError(f"no candle files under {path}")
+        self._root = files[0].parent
+        self._symbols = [f.stem for f in files]
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def __iter__(self) -> Iterator[Event]:
+        cache = CandleCache(self._root)
+        streams = [self._bars(cache, sym) for sym in self._symbols]
+        return heapq.merge(*streams, key=lambda ev: ev[0])
+
+    @staticmethod
+    def _bars(cache: CandleCache, sym: str) -> Iterator[Event]:
+        for ts, low, high, open_, close, volume in cache.load(sym):
+            bar = Bar(ts, open_, high, low, close, volume, 0)
+            yield ts + market_data.BAR_SEC, (sym, bar)
+
+
+class ReplayStats(NamedTuple):
+    ticks: int
+    cycles: int
+    wall_sec: float
+    sim_sec: float
+
+    def summary(self) -> str:
+        wall = max(self.wall_sec, 1e-9)
+        return (
+            f"{self.ticks} ticks ({self.ticks / wall:,.0f}/s), "
+            f"{self.cycles} cycles ({self.cycles / wall:,.1f}/s), "
+            f"{self.sim_sec:,.0f}s simulated in {self.wall_sec:,.2f}s"
+        )
+
+
+class Replay:
+    """Market data source replaying *source* on a virtual clock."""
+
+    def __init__(self, source, speed: float | None = None):
+        if speed is not None and speed <= 0:
+            raise ValueError("replay speed must be positive")
+        self.source = source
+        self.speed = speed
+        self.ticks = 0
+        self.cycles = 0
+        self._events = iter(source)
+        self._next: Event | None = next(self._events, None)
+        self._sim0 = self._next[0] if self._next is not None else 0.0
+        self._wall0 = time.perf_counter()
+        self._next_close = math.inf
+        self._md: market_data.MarketData | None = None
+        self.clock = clock.VirtualClock(self._sim0)
+
+    @classmethod
+    def open(cls, path: Path | str, speed: float | None = None) -> "Replay":
+        """Replay tick segments at *path*, else the candle files there."""
+        source = TickSource(path) if segments(path) else CandleSource(path)
+        return cls(source, speed)
+
+    @property
+    def done(self) -> bool:
+        return self._next is None
+
+    def symbols(self) -> List[str]:
+        return self.source.symbols()
+
+    def attach(self, market: market_data.MarketData) -> None:
+        """Called by ``MarketData`` when it is built with this source."""
+        self._md = market
+
+    def start(self, symbols: List[str] | None = None) -> market_data.MarketData:
+        """Install the virtual clock and a replay-fed shared ``MarketData``."""
+        clock.set_clock(self.clock)
+        self.clock.set_pump(self.pump)
+        market = market_data.get_market(symbols or self.symbols(), source=self)
+        utils._md = market  # the helpers may have cached a live market
+        bar = market_data.BAR_SEC
+        self._next_close = self._sim0 - self._sim0 % bar + bar
+        self._next_close += market_data.BAR_CLOSE_GRACE
+        self._wall0 = time.perf_counter()
+        return market
+
+    def run(
+        self,
+        step: Callable[[], None],
+        cycle_sec: float,
+        stop: Callable[[], bool] = lambda: False,
+    ) -> ReplayStats:
+        """Call *step* every *cycle_sec* simulated seconds until exhausted."""
+        while not self.done and not stop():
+            step()
+            self.cycles += 1
+            self.clock.sleep(cycle_sec)
+        self.clock.set_pump(None)
+        return self.stats()
+
+    def stats(self) -> ReplayStats:
+        return ReplayStats(
+            self.ticks,
+            self.cycles,
+            time.perf_counter() - self._wall0,
+            self.clock.now() - self._sim0,
+        )
+
+    # ————— clock pump —————
+    def pump(self, until: float) -> None:
+        """Feed every event due by *until*, then move the clock there."""
+        while self._next is not None and self._next[0] <= until:
+            ts, item = self._next
+            self._advance(ts)
+            self._feed(item)
+            self._next = next(self._events, None)
+        self._advance(until)
+
+    def _advance(self, t: float) -> None:
+        if t <= self.clock.now():
+            return
+        if self.speed is not None:
+            delay = self._wall0 + (t - self._sim0) / self.speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        while self._next_close <= t:
+            self.clock.advance_to(self._next_close)
+            self._md._close_bars(self._next_close - market_data.BAR_CLOSE_GRACE)
+            self._next_close += market_data.BAR_SEC
+        self.clock.advance_to(t)
+
+    def _feed(self, item) -> None:
+        md = self._md
+        self.ticks += 1
+        if isinstance(item, Tick):
+            md._prices[item.symbol] = item.price
+            if item.bid and item.ask:
+                mid = (item.ask + item.bid) / 2
+                spread = market_data._clamp_spread((item.ask - item.bid) * 1e4 / mid)
+                market_data._SPREAD[item.symbol] = spread
+            md._on_ticker(item)
+            return
+        sym, bar = item
+        md._prices[sym] = bar.close
+        md._last_update = md._price_ts[sym] = self.clock.monotonic()
+        md._emit_bar(sym, bar)
+
+
+def parse_speed(raw: str) -> float | None:
+    """``"max"`` → ``None`` (unthrottled); ``"1"``, ``"10"``, ``"10x"`` → float."""
+    raw = raw.strip().lower()
+    if raw in ("max", "inf", "0"):
+        return None
+    return float(raw.rstrip("x"))
@@ -6,10 +6,13 @@ import logging
 import os
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterator, Mapping
 
 import atlasbot.config as cfg
+from atlasbot import clock
 from atlasbot.config import (
     FEE_MIN_USD,
     MAX_DAILY_LOSS,
@@ -18,6 +21,7 @@ from atlasbot.config import (
     START_CASH,
     TAKER_FEE,
 )
+from atlasbot.snapshot import MarketSnapshot
 from atlasbot.utils import fetch_price
 
 
@@ -44,7 +48,7 @@ class RiskManager:
         self.free_margin = starting_cash
         self.day_start_equity = starting_cash
         self.day_high_equity = starting_cash
-        self._last_snapshot = datetime.now(timezone.utc)
+        self._last_snapshot = clock.utcnow()
         self.trades: list[dict] = []
         self.stats: dict[str, dict] = {}
         self.open_fees: dict[str, float] = {}
@@ -94,19 +98,39 @@ class RiskManager:
             return sum(abs(q) * p for q, p in self.lots.get(symbol, []))
 
     def check_risk(self, symbol: str, side: str, size_usd: float) -> bool:
+        order = {"symbol": symbol, "side": side, "size_usd": size_usd}
+        return self.check_risk_batch([order])[0]
+
+    def check_risk_batch(self, orders: list[dict]) -> list[bool]:
+        """Accept or reject each of *orders* under a single lock acquisition.
+
+        Accepted orders count against the gross and free-margin limits of the
+        orders after them, as if they had already filled.
+        """
+        out: list[bool] = []
         with self._lock:
-            if size_usd > MAX_NOTIONAL:
-                return False
-            pos = sum(abs(q) * p for q, p in self.lots.get(symbol, []))
-            new_pos = pos + size_usd if side == "buy" else pos - size_usd
-            if abs(new_pos) > MAX_GROSS_USD:
-                return False
-            if self.daily_pnl <= -MAX_DAILY_LOSS:
-                return False
-            est_fee = max(size_usd * TAKER_FEE, FEE_MIN_USD)
-            if side == "buy" and size_usd + est_fee > self.free_margin:
-                return False
-            return True
+            pos: dict[str, float] = {}
+            margin = self.free_margin
+            halted = self.daily_pnl <= -MAX_DAILY_LOSS
+            for order in orders:
+                symbol, side = order["symbol"], order["side"]
+                size_usd = order["size_usd"]
+                if symbol not in pos:
+                    pos[symbol] = sum(abs(q) * p for q, p in self.lots.get(symbol, []))
+                new_pos = pos[symbol] + (size_usd if side == "buy" else -size_usd)
+                cost = size_usd + max(size_usd * TAKER_FEE, FEE_MIN_USD)
+                ok = not (
+                    halted
+                    or size_usd > MAX_NOTIONAL
+                    or abs(new_pos) > MAX_GROSS_USD
+                    or (side == "buy" and cost > margin)
+                )
+                if ok:
+                    pos[symbol] = new_pos
+                    if side == "buy":
+                        margin -= cost
+                out.append(ok)
+        return out
 
     def record_fill(
         self,
@@ -117,6 +141,7 @@ class RiskManager:
         fee: float,
         slip: float,
         maker: bool = False,
+        order_id: str = "",
     ) -> tuple[float, float]:
         with self._lock:
             qty = notional / price
@@ -135,11 +160,15 @@ class RiskManager:
                 self.cash += notional - fee
             mtm = sum(q * (price - p) for q, p in self.lots.get(symbol, []))
             unrealised_total = 0.0
+            marks = _marks()
             for sym, lots in self.lots.items():
-                try:
-                    cur_px = fetch_price(sym)
-                except RuntimeError:
-                    cur_px = price
+                if sym in marks:
+                    cur_px = marks[sym]
+                else:
+                    try:
+                        cur_px = fetch_price(sym)
+                    except RuntimeError:
+                        cur_px = price
                 unrealised_total += sum(q * (cur_px - p) for q, p in lots)
             self.equity = self.cash + unrealised_total
             self.free_margin = self.cash
@@ -148,7 +177,7 @@ class RiskManager:
                 trigger_kill_switch("drawdown")
             self._maybe_snapshot()
             trade = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": clock.utcnow().isoformat(),
                 "symbol": symbol,
                 "side": side,
                 "notional": notional,
@@ -158,6 +187,7 @@ class RiskManager:
                 "realised": pnl,
                 "mtm": mtm,
                 "maker": maker,
+                "order_id": order_id,
             }
             self.trades.append(trade)
 
@@ -165,7 +195,7 @@ class RiskManager:
                 self.maker_fills += 1
             else:
                 self.taker_fills += 1
-            if self._last_snapshot.date() != datetime.now(timezone.utc).date():
+            if self._last_snapshot.date() != clock.utcnow().date():
                 self.day_trades = 0
             self.day_trades += 1
 
@@ -181,7 +211,7 @@ class RiskManager:
             return pnl, mtm
 
     def _maybe_snapshot(self) -> None:
-        now = datetime.now(timezone.utc)
+        now = clock.utcnow()
         if now.date() != self._last_snapshot.date():
             self.day_start_equity = self.equity
         if now - self._last_snapshot >= timedelta(minutes=5):
@@ -254,10 +284,30 @@ class RiskManager:
 
 
 _risk = RiskManager()
+_local = threading.local()
+
+
+def _marks() -> Mapping[str, float]:
+    return getattr(_local, "marks", None) or {}
+
+
+@contextmanager
+def marked_to(snap: MarketSnapshot) -> Iterator[None]:
+    """Mark positions at *snap*'s prices for fills recorded in this block.
+
+    Applies to the calling thread only, i.e. to fills the caller's own
+    backend calls report synchronously.
+    """
+    prev = getattr(_local, "marks", None)
+    _local.marks = snap.prices
+    try:
+        yield
+    finally:
+        _local.marks = prev
 
 
 def portfolio_snapshot() -> dict:
-    ts = datetime.now(timezone.utc).isoformat()
+    ts = clock.utcnow().isoformat()
     unreal_total = 0.0
     per_symbol: dict[str, dict] = {}
     for sym, lots in _risk.lots.items():
@@ -291,6 +341,10 @@ def check_risk(order: dict) -> bool:
     return _risk.check_risk(order["symbol"], order["side"], order["size_usd"])
 
 
+def check_risk_batch(orders: list[dict]) -> list[bool]:
+    return _risk.check_risk_batch(orders)
+
+
 def record_fill(
     symbol: str,
     side: str,
@@ -299,14 +353,24 @@ def record_fill(
     fee: float,
     slip: float,
     maker: bool = False,
+    order_id: str = "",
 ) -> tuple[float, float]:
-    return _risk.record_fill(symbol, side, notional, price, fee, slip, maker)
+    return _risk.record_fill(symbol, side, notional, price, fee, slip, maker, order_id)
 
 
 def gross(symbol: str) -> float:
     return _risk.gross(symbol)
 
 
+def open_symbols() -> set[str]:
+    """Symbols with open lots, read without the ledger lock.
+
+    ``dict.copy`` is atomic, so this is safe to call from the market-data
+    event loop, which must not block on a fill being booked.
+    """
+    return {sym for sym, lots in _risk.lots.copy().items() if lots}
+
+
 def daily_pnl() -> float:
     return _risk.daily_pnl
 
@@ -336,7 +400,7 @@ def trade_count_day() -> int:
 
 
 def last_trades(seconds: int) -> list[dict]:
-    cutoff = datetime.now(timezone.utc).timestamp() - seconds
+    cutoff = clock.now() - seconds
     return [
         t
         for t in _risk.trades
@@ -353,6 +417,15 @@ def annotate_last_trade(**extra) -> None:
         _risk.trades[-1].update(extra)
 
 
+def annotate_trade(order_id: str, **extra) -> bool:
+    """Tag the latest trade filled under *order_id*; ``False`` if none was."""
+    for t in reversed(_risk.trades):
+        if t.get("order_id") == order_id:
+            t.update(extra)
+            return True
+    return False
+
+
 def total_mtm() -> float:
     tot = 0.0
     for sym, lots in _risk.lots.items():
@@ -374,7 +447,7 @@ def snapshot() -> None:
 
 
 def summary_row() -> dict:
-    return _risk._summary_row(datetime.now(timezone.utc))
+    return _risk._summary_row(clock.utcnow())
 
 
 _circuit_until = 0.0
@@ -385,7 +458,7 @@ _kill_reason = ""
 def check_circuit_breaker() -> bool:
     """Return True if daily loss exceeds 2% and circuit is engaged."""
     global _circuit_until
-    now = time.time()
+    now = clock.now()
     if now < _circuit_until:
         return True
     start_eq = _risk.day_start_equity
@@ -397,7 +470,7 @@ def check_circuit_breaker() -> bool:
 
 def circuit_breaker_active() -> bool:
     """True if the circuit breaker is currently active."""
-    return time.time() < _circuit_until
+    return clock.now() < _circuit_until
 
 
 def kill_switch_triggered() -> bool:
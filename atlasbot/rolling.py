@@ -0,0 +1,135 @@
+"""
+Streaming window statistics
+———————————————————————————
+• ``RollingStats``: windowed Welford mean / variance, O(1) per sample, with
+  eviction by sample count and/or age; samples are shifted by a reference
+  value so prices in the tens of thousands keep their small-spread precision
+• ``RollingMean``: running-sum mean of the last *n* samples
+• both re-sum their window every ``RESYNC_EVERY`` samples so floating-point
+  drift from add/remove pairs cannot accumulate
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Deque, List, Tuple
+
+RESYNC_EVERY = 4_096
+# a std this small relative to the mean is add/remove round-off, not spread
+_REL_EPS = 1e-9
+
+
+class RollingStats:
+    """Population mean / variance of a sliding window of ``(t, x)`` samples.
+
+    Samples older than *horizon* seconds (relative to the newest push) and
+    beyond *maxlen* samples are evicted as new ones arrive.
+    """
+
+    __slots__ = ("maxlen", "horizon", "_buf", "n", "_k", "_mean", "_m2", "_pushes")
+
+    def __init__(self, maxlen: int | None = None, horizon: float | None = None):
+        self.maxlen = maxlen
+        self.horizon = horizon
+        self._buf: Deque[Tuple[float, float]] = deque()
+        self.n = 0
+        self._k = 0.0  # shift: Welford runs on x - _k
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+
+    def push(self, x: float, t: float = 0.0) -> None:
+        buf = self._buf
+        buf.append((t, x))
+        self._add(x)
+        if self.horizon is not None:
+            while buf and t - buf[0][0] > self.horizon:
+                self._remove(buf.popleft()[1])
+        if self.maxlen is not None:
+            while len(buf) > self.maxlen:
+                self._remove(buf.popleft()[1])
+        self._pushes += 1
+        if self._pushes % RESYNC_EVERY == 0:
+            self._resync()
+
+    def _add(self, x: float) -> None:
+        if self.n == 0:
+            self._k = x
+        x -= self._k
+        self.n += 1
+        d = x - self._mean
+        self._mean += d / self.n
+        self._m2 += d * (x - self._mean)
+
+    def _remove(self, x: float) -> None:
+        if self.n <= 1:
+            self.n, self._mean, self._m2 = 0, 0.0, 0.0
+            return
+        x -= self._k
+        self.n -= 1
+        d = x - self._mean
+        self._mean -= d / self.n
+        self._m2 -= d * (x - self._mean)
+
+    def _resync(self) -> None:
+        xs = [x for _, x in self._buf]
+        self.n = len(xs)
+        self._k = xs[-1] if xs else 0.0
+        ds = [x - self._k for x in xs]
+        self._mean = math.fsum(ds) / self.n if ds else 0.0
+        self._m2 = math.fsum((d - self._mean) ** 2 for d in ds)
+
+    @property
+    def mean(self) -> float:
+        return self._k + self._mean
+
+    def __len__(self) -> int:
+        return self.n
+
+    def values(self) -> List[float]:
+        return [x for _, x in self._buf]
+
+    def last(self) -> float:
+        return self._buf[-1][1]
+
+    def variance(self) -> float:
+        return max(self._m2, 0.0) / self.n if self.n else 0.0
+
+    def std(self) -> float:
+        std = math.sqrt(self.variance())
+        return 0.0 if std <= _REL_EPS * abs(self.mean) else std
+
+    def zscore(self) -> float:
+        """Z-score of the newest sample within the window (0 if degenerate)."""
+        if self.n < 2:
+            return 0.0
+        std = self.std()
+        return 0.0 if std == 0 else (self.last() - self._k - self._mean) / std
+
+
+class RollingMean:
+    """Mean of the last *maxlen* samples from a running sum."""
+
+    __slots__ = ("maxlen", "_buf", "_sum", "_pushes")
+
+    def __init__(self, maxlen: int):
+        self.maxlen = maxlen
+        self._buf: Deque[float] = deque()
+        self._sum = 0.0
+        self._pushes = 0
+
+    def push(self, x: float) -> None:
+        self._buf.append(x)
+        self._sum += x
+        if len(self._buf) > self.maxlen:
+            self._sum -= self._buf.popleft()
+        self._pushes += 1
+        if self._pushes % RESYNC_EVERY == 0:
+            self._sum = math.fsum(self._buf)
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def mean(self) -> float:
+        return self._sum / len(self._buf) if self._buf else 0.0
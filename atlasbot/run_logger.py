@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Sequence
@@ -17,6 +18,7 @@ RUN_DIR.mkdir(parents=True, exist_ok=True)
 
 RUN_CSV = RUN_DIR / f"ledger_{datetime.now(timezone.utc):%Y-%m-%d_%H-%M-%S}.csv"
 DECISIONS_CSV = REPO_ROOT / "logs" / f"decisions_{datetime.now(timezone.utc):%Y-%m-%d}.csv"
+_decisions_lock = threading.Lock()  # decisions may be logged from worker threads
 
 
 # ────────────────────────── helpers ──────────────────────────────
@@ -54,8 +56,11 @@ def append(row: dict) -> None:
 
 
 def log_decision(row: dict) -> None:
-    """Append a decision *row* to the daily decision CSV."""
-    header = not DECISIONS_CSV.exists()
-    DECISIONS_CSV.parent.mkdir(parents=True, exist_ok=True)
-    pd.DataFrame([row]).to_csv(DECISIONS_CSV, mode="a", header=header, index=False)
+    """Append a decision *row* to the daily decision CSV (thread-safe)."""
+    with _decisions_lock:
+        header = not DECISIONS_CSV.exists()
+        DECISIONS_CSV.parent.mkdir(parents=True, exist_ok=True)
+        pd.DataFrame([row]).to_csv(
+            DECISIONS_CSV, mode="a", header=header, index=False
+        )
     _safe_sync([RUN_CSV, DECISIONS_CSV])
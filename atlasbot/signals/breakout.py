@@ -1,20 +1,24 @@
-from typing import Deque
-
+from atlasbot.feature_cache import cached
+from atlasbot.indicators import BREAKOUT_WINDOW
 from atlasbot.market_data import get_market
 
-WINDOW = 20
+WINDOW = BREAKOUT_WINDOW
 
 
 def breakout(symbol: str) -> float:
     """Return 1 for long breakout, -1 for short breakout, else 0."""
-    bars: Deque[tuple[float, float, float, float]] = get_market().minute_bars(symbol)
-    if len(bars) <= WINDOW:
-        return 0.0
-    recent = list(bars)[-WINDOW - 1 :]
-    prev = [b[3] for b in recent[:-1]]
-    last = recent[-1][3]
-    if not prev:
+    md = get_market()
+    return cached(md, symbol, "breakout", WINDOW, lambda: _breakout(md, symbol))
+
+
+def _breakout(md, symbol: str) -> float:
+    if hasattr(md, "indicators"):
+        return md.indicators(symbol).breakout()
+    closes = md.bar_window(symbol, WINDOW + 1).close.tolist()
+    if len(closes) <= WINDOW:
         return 0.0
+    prev = closes[:-1]
+    last = closes[-1]
     if last > max(prev):
         return 1.0
     if last < min(prev):
@@ -1,5 +1,6 @@
 import json
 import logging
+import threading
 from datetime import datetime, timedelta, timezone
 
 from openai import OpenAI
@@ -23,6 +24,7 @@ class MacroBias:
         self.enabled = enabled
         self._cache = (0.0, "llm_offline", datetime.now(timezone.utc) - self.ttl)
         self._last_warn = datetime.now(timezone.utc) - timedelta(hours=1)
+        self._lock = threading.Lock()  # one refresh when callers race on expiry
 
     def _warn(self, reason: str) -> None:
         now = datetime.now(timezone.utc)
@@ -59,8 +61,11 @@ class MacroBias:
         if not self.enabled:
             return score
         if now - ts >= self.ttl:
-            score, headline = self._call_llm()
-            self._cache = (score, headline, now)
+            with self._lock:
+                score, headline, ts = self._cache
+                if now - ts >= self.ttl:
+                    score, headline = self._call_llm()
+                    self._cache = (score, headline, now)
         return score
 
 
@@ -1,8 +1,8 @@
-from typing import Deque
-
+from atlasbot.feature_cache import cached
+from atlasbot.indicators import MOMENTUM_WINDOW
 from atlasbot.market_data import get_market
 
-WINDOW = 15  # bars
+WINDOW = MOMENTUM_WINDOW  # bars
 
 
 def _typical_price(bar: tuple[float, float, float, float]) -> float:
@@ -12,10 +12,17 @@ def _typical_price(bar: tuple[float, float, float, float]) -> float:
 
 def momentum(symbol: str) -> float:
     """Return normalised slope of approximate VWAP over last 15 bars."""
-    bars: Deque[tuple[float, float, float, float]] = get_market().minute_bars(symbol)
-    if len(bars) < WINDOW:
+    md = get_market()
+    return cached(md, symbol, "momentum", WINDOW, lambda: _momentum(md, symbol))
+
+
+def _momentum(md, symbol: str) -> float:
+    if hasattr(md, "indicators"):
+        return md.indicators(symbol).momentum()
+    w = md.bar_window(symbol, WINDOW)
+    if len(w.close) < WINDOW:
         return 0.0
-    recent = list(bars)[-WINDOW:]
+    recent = zip(w.open.tolist(), w.high.tolist(), w.low.tolist(), w.close.tolist())
     prices = [_typical_price(b) for b in recent]
     slope = prices[-1] - prices[0]
     denom = max(prices) - min(prices)
@@ -3,9 +3,9 @@ import threading
 import time
 from typing import Dict
 
-import requests
-
+from atlasbot import http_client as http
 from atlasbot.config import SYMBOLS
+from atlasbot.market_data import get_market
 
 RUN_THREAD = os.getenv("ATLAS_TEST") != "1"
 
@@ -13,7 +13,7 @@ BOOK_URL = "https://api.exchange.coinbase.com/products/{}/book?level=2"
 
 
 class OrderFlow:
-    """Simple order book imbalance tracker using REST polling."""
+    """Order book imbalance from the local L2 book, REST polling as fallback."""
 
     def __init__(self, symbols=SYMBOLS, poll_interval: int = 2):
         self.symbols = symbols
@@ -29,15 +29,24 @@ class OrderFlow:
         return time.monotonic() - self._last_poll
 
     def imbalance(self, symbol: str) -> float:
+        md = get_market()
+        book = md.book(symbol)
+        if book is not None:
+            return book.imbalance()
+        if getattr(md, "mode", "") == "replay":
+            return 0.0  # a live REST snapshot would leak into the replay
         return self._imbalance.get(symbol, 0.0)
 
     # -------------------------------------------------------------------- worker
     def _worker(self) -> None:
         while True:
             t0 = time.monotonic()
+            md = get_market()
             for sym in self.symbols:
+                if getattr(md, "mode", "") == "replay" or md.book(sym) is not None:
+                    continue
                 try:
-                    r = requests.get(BOOK_URL.format(sym), timeout=2)
+                    r = http.get(BOOK_URL.format(sym), timeout=2)
                     j = r.json()
                     bids = sum(float(b[1]) for b in j.get("bids", []))
                     asks = sum(float(a[1]) for a in j.get("asks", []))
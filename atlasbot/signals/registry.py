@@ -0,0 +1,99 @@
+"""
+Signal registry
+———————————————
+• every ensemble signal is registered once with its default weight, a
+  relative evaluation cost, the inputs it reads and an optional refresh
+  cadence – ``DecisionEngine`` iterates the registry instead of naming signals
+• signals are evaluated cheapest first; the engine skips those whose weight
+  is too small to move the score
+• evaluation counts, time and skips are kept as plain counters and published
+  by the metrics loop
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Tuple
+
+from atlasbot import clock
+
+
+@dataclass(frozen=True)
+class Signal:
+    """One ensemble input, valued in ``[-bound, bound]``."""
+
+    name: str
+    fn: Callable[[str], float]
+    weight: float = 0.0  # default ensemble weight
+    cost: float = 1.0  # relative cost; cheaper signals are evaluated first
+    inputs: Tuple[str, ...] = ()  # e.g. "bars", "book", "llm"
+    refresh_sec: float = 0.0  # reuse a value this long (0 = every call)
+    bound: float = 1.0
+    feature: str | None = None  # ``batch.bar_features`` column, if vectorised
+
+
+_signals: Dict[str, Signal] = {}
+_ordered: List[Signal] = []
+version = 0  # bumped on every (un)registration
+_lock = threading.Lock()
+_cached: Dict[Tuple[str, str], Tuple[float, float]] = {}
+
+evals: Counter[str] = Counter()
+eval_ns: Counter[str] = Counter()
+skips: Counter[Tuple[str, str]] = Counter()
+
+
+def register(name: str, fn: Callable[[str], float], **spec) -> Signal:
+    """Add (or replace) signal *name*; see ``Signal`` for the *spec* fields."""
+    sig = Signal(name, fn, **spec)
+    global _ordered, version
+    with _lock:
+        _signals[name] = sig
+        _ordered = sorted(_signals.values(), key=lambda s: s.cost)
+        version += 1
+        for key in [k for k in _cached if k[0] == name]:
+            del _cached[key]
+    return sig
+
+
+def unregister(name: str) -> None:
+    global _ordered, version
+    with _lock:
+        _signals.pop(name, None)
+        _ordered = sorted(_signals.values(), key=lambda s: s.cost)
+        version += 1
+
+
+def signals() -> List[Signal]:
+    """Registered signals, cheapest first."""
+    return _ordered
+
+
+def names() -> List[str]:
+    return list(_signals)
+
+
+def get(name: str) -> Signal:
+    return _signals[name]
+
+
+def value(sig: Signal, symbol: str) -> float:
+    """Evaluate *sig* for *symbol*, honouring its refresh cadence."""
+    if sig.refresh_sec > 0:
+        hit = _cached.get((sig.name, symbol))
+        if hit is not None and clock.now() < hit[0]:
+            return hit[1]
+    t0 = time.perf_counter_ns()
+    v = sig.fn(symbol)
+    eval_ns[sig.name] += time.perf_counter_ns() - t0
+    evals[sig.name] += 1
+    if sig.refresh_sec > 0:
+        _cached[(sig.name, symbol)] = (clock.now() + sig.refresh_sec, v)
+    return v
+
+
+def skip(sig: Signal, reason: str, n: int = 1) -> None:
+    skips[(sig.name, reason)] += n
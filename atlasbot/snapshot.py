@@ -0,0 +1,69 @@
+"""
+Per-cycle market snapshot
+—————————————————————————
+• one immutable view of prices, spreads, last closed bars and feed age for
+  every traded symbol, taken once at the start of a trading cycle
+• the decision engine, sizing and risk all read the same numbers, even while
+  the feed thread keeps updating ``MarketData`` underneath
+• built from a few dict copies, so taking one costs far less than the
+  per-symbol ``fetch_price`` calls it replaces
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Iterable, Mapping
+
+from atlasbot import clock
+from atlasbot.bar_store import Bar
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """Market state of *symbols* at clock time ``ts``."""
+
+    ts: float
+    symbols: tuple[str, ...]
+    prices: Mapping[str, float]
+    spreads: Mapping[str, float]
+    bars: Mapping[str, Bar | None]  # last closed 1m bar
+    feed_age: float = 0.0  # seconds since the last price update
+    ages: Mapping[str, float] = field(default_factory=dict)  # per symbol
+
+    @classmethod
+    def of(
+        cls,
+        prices: Mapping[str, float],
+        spreads: Mapping[str, float] | None = None,
+        bars: Mapping[str, Bar | None] | None = None,
+        feed_age: float = 0.0,
+        ages: Mapping[str, float] | None = None,
+        ts: float | None = None,
+        symbols: Iterable[str] | None = None,
+    ) -> "MarketSnapshot":
+        """Freeze copies of the given mappings into a snapshot."""
+        return cls(
+            ts=clock.now() if ts is None else ts,
+            symbols=tuple(prices if symbols is None else symbols),
+            prices=MappingProxyType(dict(prices)),
+            spreads=MappingProxyType(dict(spreads or {})),
+            bars=MappingProxyType(dict(bars or {})),
+            feed_age=feed_age,
+            ages=MappingProxyType(dict(ages or {})),
+        )
+
+    def fresh(self, max_age: float) -> list[str]:
+        """Symbols with a price no older than *max_age* seconds (0 = any)."""
+        return [
+            s
+            for s in self.symbols
+            if s in self.prices and not (max_age and self.ages.get(s, 0.0) > max_age)
+        ]
+
+    def price(self, symbol: str) -> float:
+        """Snapshot price of *symbol*; ``RuntimeError`` if it had none yet."""
+        try:
+            return self.prices[symbol]
+        except KeyError as exc:
+            raise RuntimeError(f"No live price yet for {symbol}") from exc
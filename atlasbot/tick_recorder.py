@@ -0,0 +1,245 @@
+"""
+Binary tick recorder
+————————————————————
+• opt-in via ``TICK_RECORD_DIR``: every normalised ``Tick`` from the feed is
+  appended to ``<dir>/ticks-YYYY-MM-DD.atk`` (UTC day of the exchange time)
+• fields are fixed-point (1e-8) and delta / zig-zag varint encoded, so a
+  tick costs ~15–20 bytes instead of a ~300 byte JSON message
+• the feed only enqueues; a daemon thread encodes and writes whole blocks
+• every block is self-contained, so a torn tail after a crash is skipped
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import struct
+import threading
+import time
+from itertools import groupby
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Sequence, Tuple
+
+from atlasbot.ws_decode import Tick
+
+RECORD_DIR = os.getenv("TICK_RECORD_DIR", "")
+MAGIC = b"ATK1"
+SCALE = 100_000_000  # prices and sizes are stored in 1e-8 units
+US = 1_000_000
+DAY = 86_400
+BLOCK_TICKS = 4_096  # ticks per block before a forced write
+FLUSH_SEC = 1.0  # longest a tick waits in memory
+
+# magic, body bytes, tick count, base receive µs, base exchange µs
+_HEAD = struct.Struct("<4sIIqq")
+
+
+# ————— varint helpers —————
+def _put(out: bytearray, n: int) -> None:
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _put_signed(out: bytearray, n: int) -> None:
+    _put(out, n << 1 if n >= 0 else (~n << 1) | 1)
+
+
+def _get(buf: bytes, i: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        b = buf[i]
+        i += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, i
+        shift += 7
+
+
+def _get_signed(buf: bytes, i: int) -> Tuple[int, int]:
+    n, i = _get(buf, i)
+    return (n >> 1) ^ -(n & 1), i
+
+
+# ————— block codec —————
+def encode_block(ticks: Sequence[Tuple[float, Tick]]) -> bytes:
+    """Encode ``(monotonic receive time, Tick)`` pairs as one block."""
+    recv0 = round(ticks[0][0] * US)
+    exch0 = round(ticks[0][1].ts * US)
+    ids: Dict[str, int] = {}
+    last_px: List[int] = []
+    recs = bytearray()
+    prev_recv, prev_exch = recv0, exch0
+    for recv, t in ticks:
+        sid = ids.get(t.symbol)
+        if sid is None:
+            sid = ids[t.symbol] = len(ids)
+            last_px.append(0)
+        r = round(recv * US)
+        e = round(t.ts * US)
+        px = round(t.price * SCALE)
+        _put(recs, max(r - prev_recv, 0))
+        _put_signed(recs, e - prev_exch)
+        _put(recs, sid)
+        _put_signed(recs, px - last_px[sid])
+        _put(recs, max(round(t.size * SCALE), 0))
+        _put_signed(recs, round(t.bid * SCALE) - px)
+        _put_signed(recs, round(t.ask * SCALE) - px)
+        prev_recv, prev_exch = max(r, prev_recv), e
+        last_px[sid] = px
+    body = bytearray()
+    _put(body, len(ids))
+    for sym in ids:
+        raw = sym.encode()
+        _put(body, len(raw))
+        body += raw
+    body += recs
+    return _HEAD.pack(MAGIC, len(body), len(ticks), recv0, exch0) + bytes(body)
+
+
+def decode_blocks(buf: bytes) -> Iterator[Tuple[float, Tick]]:
+    """Yield ``(monotonic receive time, Tick)`` from concatenated blocks."""
+    pos, end = 0, len(buf)
+    while pos + _HEAD.size <= end:
+        magic, size, count, recv, exch = _HEAD.unpack_from(buf, pos)
+        i = pos + _HEAD.size
+        if magic != MAGIC or i + size > end:
+            if magic != MAGIC:
+                logging.warning("tick segment corrupt at byte %d", pos)
+            return  # torn trailing write
+        pos = i + size
+        nsym, i = _get(buf, i)
+        syms: List[str] = []
+        for _ in range(nsym):
+            n, i = _get(buf, i)
+            syms.append(buf[i : i + n].decode())
+            i += n
+        last_px = [0] * nsym
+        for _ in range(count):
+            d, i = _get(buf, i)
+            recv += d
+            d, i = _get_signed(buf, i)
+            exch += d
+            sid, i = _get(buf, i)
+            d, i = _get_signed(buf, i)
+            px = last_px[sid] = last_px[sid] + d
+            size_u, i = _get(buf, i)
+            bid, i = _get_signed(buf, i)
+            ask, i = _get_signed(buf, i)
+            yield recv / US, Tick(
+                syms[sid],
+                px / SCALE,
+                size_u / SCALE,
+                exch / US,
+                (px + bid) / SCALE,
+                (px + ask) / SCALE,
+                0,
+            )
+
+
+def read_segment(path: Path | str) -> Iterator[Tuple[float, Tick]]:
+    return decode_blocks(Path(path).read_bytes())
+
+
+def segment_symbols(path: Path | str) -> List[str]:
+    """Symbols recorded in *path*, read from block headers only."""
+    buf = Path(path).read_bytes()
+    seen: Dict[str, None] = {}
+    pos = 0
+    while pos + _HEAD.size <= len(buf):
+        magic, size, *_ = _HEAD.unpack_from(buf, pos)
+        i = pos + _HEAD.size
+        if magic != MAGIC or i + size > len(buf):
+            break
+        pos = i + size
+        nsym, i = _get(buf, i)
+        for _ in range(nsym):
+            n, i = _get(buf, i)
+            seen.setdefault(buf[i : i + n].decode())
+            i += n
+    return list(seen)
+
+
+def segments(root: Path | str) -> List[Path]:
+    """Day segment files under *root*, oldest first (or *root* itself)."""
+    root = Path(root)
+    if root.is_file():
+        return [root]
+    return sorted(root.glob("ticks-*.atk"))
+
+
+# ————— writer —————
+class TickRecorder:
+    """Append ticks to per-day segment files from a background thread."""
+
+    def __init__(
+        self,
+        root: Path | str = RECORD_DIR,
+        block_ticks: int = BLOCK_TICKS,
+        flush_sec: float = FLUSH_SEC,
+    ):
+        self.root = Path(root)
+        self.block_ticks = block_ticks
+        self.flush_sec = flush_sec
+        self.written = 0  # ticks on disk
+        self.nbytes = 0
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+        self._fh: BinaryIO | None = None
+        self._day = -1
+        self._thread = threading.Thread(
+            target=self._run, name="TickRecorder", daemon=True
+        )
+        self._thread.start()
+
+    def record(self, tick: Tick, recv: float | None = None) -> None:
+        """Queue *tick*; never blocks on disk."""
+        self._q.put((time.monotonic() if recv is None else recv, tick))
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write everything queued so far and stop the writer."""
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    def path_for(self, day: int) -> Path:
+        name = time.strftime("ticks-%Y-%m-%d.atk", time.gmtime(day * DAY))
+        return self.root / name
+
+    def _run(self) -> None:
+        pending: List[Tuple[float, Tick]] = []
+        deadline = time.monotonic() + self.flush_sec
+        while True:
+            try:
+                item = self._q.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = ()
+            if item:
+                pending.append(item)
+                if len(pending) < self.block_ticks and time.monotonic() < deadline:
+                    continue
+            try:
+                self._write(pending)
+            except OSError as exc:
+                logging.error("tick recorder write failed: %s", exc)
+            pending = []
+            deadline = time.monotonic() + self.flush_sec
+            if item is None:
+                if self._fh is not None:
+                    self._fh.close()
+                return
+
+    def _write(self, ticks: List[Tuple[float, Tick]]) -> None:
+        for day, group in groupby(ticks, key=lambda rt: int(rt[1].ts // DAY)):
+            chunk = list(group)
+            if day != self._day or self._fh is None:
+                if self._fh is not None:
+                    self._fh.close()
+                self.root.mkdir(parents=True, exist_ok=True)
+                self._fh = open(self.path_for(day), "ab")
+                self._day = day
+            blob = encode_block(chunk)
+            self._fh.write(blob)
+            self._fh.flush()
+            self.written += len(chunk)
+            self.nbytes += len(blob)
@@ -3,13 +3,12 @@ import logging
 import math
 import threading
 import time
-from datetime import datetime, timezone
 from typing import Optional
 
 import pandas as pd
 
 import atlasbot.config as cfg
-from atlasbot import metrics, risk
+from atlasbot import clock, metrics, risk
 from atlasbot.ai_desk import LOG_PATH as DESK_LOG_PATH
 from atlasbot.ai_desk import AIDesk
 from atlasbot.config import LOG_PATH as TRADE_LOG_PATH
@@ -17,9 +16,17 @@ from atlasbot.config import profit_target
 from atlasbot.decision_engine import DecisionEngine
 from atlasbot.execution import get_backend
 from atlasbot.gpt_report import GPTTrendAnalyzer
-from atlasbot.market_data import get_market, get_spread_bps
+from atlasbot.market_data import get_market
+from atlasbot.order_manager import Order, OrderManager
+from atlasbot.position_manager import PositionManager
 from atlasbot.secrets_loader import get_openai_api_key
-from atlasbot.utils import calculate_atr, fetch_price, fetch_volatility
+from atlasbot.snapshot import MarketSnapshot
+from atlasbot.utils import (
+    calculate_atr,
+    fetch_price,
+    fetch_volatility,
+    market_snapshot,
+)
 
 SYMBOLS = cfg.SYMBOLS
 
@@ -48,7 +55,7 @@ class TradingBot:
     # ----------------------------------------------------------------- public API
     def run_cycle(self) -> None:
         """Iterate once over every configured symbol."""
-        utc_now = datetime.now(timezone.utc)
+        utc_now = clock.utcnow()
 
         for symbol in self.symbols:
             price = fetch_price(symbol)
@@ -134,7 +141,7 @@ class TradingBot:
         sl_atr = entry_price - 2 * atr if side == "buy" else entry_price + 2 * atr
         sl = min(sl_pt, sl_atr) if side == "buy" else max(sl_pt, sl_atr)
 
-        start = time.time()
+        start = clock.now()
         while True:
             cur_price = fetch_price(symbol)
 
@@ -144,12 +151,12 @@ class TradingBot:
             hit_sl = (
                 side == "buy" and cur_price <= sl or side == "sell" and cur_price >= sl
             )
-            timed_out = time.time() - start >= timeout_s
+            timed_out = clock.now() - start >= timeout_s
 
             if hit_tp or hit_sl or timed_out:
-                return cur_price, int(time.time() - start)
+                return cur_price, int(clock.now() - start)
 
-            time.sleep(1)
+            clock.sleep(1)
 
     # -------------------------------------- persistence / console
     def _log_trade(self, trade: dict) -> None:
@@ -170,6 +177,19 @@ class TradingBot:
             return False
 
 
+class _Stopwatch:
+    """Wall time of consecutive pipeline stages; ``lap`` closes the current one."""
+
+    def __init__(self) -> None:
+        self.laps: dict[str, float] = {}
+        self._t = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        t = time.perf_counter()
+        self.laps[stage] = t - self._t
+        self._t = t
+
+
 class IntradayTrader:
     """Alpha-driven trader with risk and PnL tracking."""
 
@@ -185,6 +205,10 @@ class IntradayTrader:
         self.pnl_file = pnl_file
         self._skip_logged: set[str] = set()
         self._conflict_counts: dict[str, int] = {}
+        self._stale_logged: set[str] = set()
+        self.positions = PositionManager()
+        self.orders = OrderManager()
+        self.stage_seconds: dict[str, float] = {}
         try:
             asyncio.get_running_loop().create_task(desk_runner())
         except RuntimeError:
@@ -195,101 +219,163 @@ class IntradayTrader:
 
     # --------------------------------------------------------------- main loop
     def run_cycle(self) -> None:
-        md = get_market()
+        """One pass of the pre-trade pipeline over every configured symbol.
+
+        snapshot → exits → orders → advice → filter → size → risk → execute;
+        each stage works on the whole batch. Every stage reads prices and
+        spreads from the one ``MarketSnapshot`` taken up front, and the risk
+        lock is taken once. Open positions and working orders are checked,
+        never waited on, so neither holds up decisions for other symbols.
+        """
         if risk.check_circuit_breaker():
             if self.backend_name != "sim":
                 logging.warning("Circuit breaker engaged – using sim backend")
             self.exec = get_backend("sim")
         else:
             self.exec = get_backend(self.backend_name)
-        for symbol in cfg.SYMBOLS:
-            advice = self.engine.next_advice(symbol)
-            if advice["bias"] == "flat":
-                continue
-            im = advice.get("rationale", {}).get("orderflow", 0.0)
-            mo = advice.get("rationale", {}).get("momentum", 0.0)
-            if im * mo < 0 and abs(im) > cfg.CONFLICT_THRESH:
-                cnt = self._conflict_counts.get(symbol, 0) + 1
-                self._conflict_counts[symbol] = cnt
-                if not cfg.ALLOW_CONFLICT:
-                    continue
-                risk.annotate_last_trade(conflict=True)
-            else:
-                self._conflict_counts[symbol] = 0
-            edge_bps = abs(advice.get("edge", 0.0) * 10_000)
-            metrics.edge_g.set(edge_bps)
-            metrics.edge_hist.observe(edge_bps)
-            min_edge = max(cfg.MIN_EDGE_BPS, get_spread_bps(symbol))
-            if edge_bps <= cfg.FEE_BPS_TAKER + cfg.SLIPPAGE_BPS + min_edge:
-                continue
-            side = "buy" if advice["bias"] == "long" else "sell"
-            price = fetch_price(symbol)
-            atr = calculate_atr(symbol)
-            if math.isnan(atr):
-                if symbol not in self._skip_logged:
-                    logging.debug(
-                        "[SKIP] %s waiting for bars (have=%d)",
-                        symbol,
-                        len(md.minute_bars(symbol)),
-                    )
-                    self._skip_logged.add(symbol)
-                continue
-            self._skip_logged.discard(symbol)
-            equity = risk.equity()
-            conf = max(advice.get("confidence", 0.0), 0.0)
-            size_usd = equity * cfg.RISK_PER_TRADE * conf / (atr / price if atr else 1)
-            if risk.trade_count_day() > 100:
-                size_usd *= 0.75
-            order = {
-                "symbol": symbol,
-                "side": side,
-                "size_usd": size_usd,
-                "take_profit": price * (1 + advice.get("edge", 0.0)),
-            }
-            if not risk.check_risk(order):
-                continue
-            filled = None
-            if cfg.EXECUTION_MODE == "maker":
-                for _ in range(3):
-                    if hasattr(self.exec, "submit_maker_order"):
-                        filled = self.exec.submit_maker_order(side, size_usd, symbol)
-                    if filled:
-                        break
-                    time.sleep(1)
-                if not filled:
-                    filled = self.exec.submit_order(side, size_usd, symbol)
-            else:
-                filled = self.exec.submit_order(side, size_usd, symbol)
-            if filled:
-                self._exit_position(symbol, side, filled.qty, filled.price, atr)
-            risk.annotate_last_trade(signals=advice["rationale"], ret=0.0)
+        watch = _Stopwatch()
+
+        snap = market_snapshot(cfg.SYMBOLS)
+        symbols = snap.fresh(cfg.STALE_PRICE_SEC)
+        if len(symbols) < len(cfg.SYMBOLS) or self._stale_logged:
+            fresh = set(symbols)
+            for sym in cfg.SYMBOLS:
+                if sym in fresh:
+                    self._stale_logged.discard(sym)
+                elif sym not in self._stale_logged:
+                    logging.warning("[SKIP] %s has no fresh price", sym)
+                    self._stale_logged.add(sym)
+        equity, day_trades = risk.equity(), risk.trade_count_day()
+        watch.lap("snapshot")
+
+        if self.positions:  # held symbols exit at their last price, stale or not
+            self.positions.check(snap.prices, self.exec)
+        watch.lap("exits")
+
+        if self.orders:
+            with risk.marked_to(snap):
+                self.orders.poll()
+        watch.lap("orders")
+
+        if len(symbols) >= cfg.BATCH_MIN_SYMBOLS and hasattr(
+            self.engine, "next_advice_batch"
+        ):
+            advice = self.engine.next_advice_batch(symbols, snap)
+        else:
+            advice = {sym: self.engine.next_advice(sym, snap) for sym in symbols}
+        watch.lap("advice")
+
+        picked = [sym for sym in symbols if self._wants(sym, advice[sym], snap)]
+        watch.lap("filter")
+
+        plans = []
+        for sym in picked:
+            plan = self._size(sym, advice[sym], snap.price(sym), equity, day_trades)
+            if plan is not None:
+                plans.append(plan)
+        watch.lap("size")
+
+        accepted = risk.check_risk_batch([order for order, _, _ in plans])
+        watch.lap("risk")
+
+        for (order, adv, atr), ok in zip(plans, accepted):
+            if ok:
+                self._execute(order, adv, atr, snap)
+        watch.lap("execute")
+
+        self.stage_seconds = watch.laps
+        for stage, sec in watch.laps.items():
+            h = metrics.cycle_stage_seconds
+            if hasattr(h, "labels"):
+                h = h.labels(stage)
+            h.observe(sec)
+
+    def _wants(self, symbol: str, advice: dict, snap: MarketSnapshot) -> bool:
+        """Filter stage: directional, non-conflicting and clear of costs."""
+        if advice["bias"] == "flat" or self.positions.holds(symbol):
+            return False
+        if self.orders and self.orders.working(symbol):
+            return False
+        im = advice.get("rationale", {}).get("orderflow", 0.0)
+        mo = advice.get("rationale", {}).get("momentum", 0.0)
+        if im * mo < 0 and abs(im) > cfg.CONFLICT_THRESH:
+            cnt = self._conflict_counts.get(symbol, 0) + 1
+            self._conflict_counts[symbol] = cnt
+            if not cfg.ALLOW_CONFLICT:
+                return False
+            risk.annotate_last_trade(conflict=True)
+        else:
+            self._conflict_counts[symbol] = 0
+        edge_bps = abs(advice.get("edge", 0.0) * 10_000)
+        metrics.edge_g.set(edge_bps)
+        metrics.edge_hist.observe(edge_bps)
+        min_edge = max(cfg.MIN_EDGE_BPS, snap.spreads[symbol])
+        return edge_bps > cfg.FEE_BPS_TAKER + cfg.SLIPPAGE_BPS + min_edge
+
+    def _size(
+        self,
+        symbol: str,
+        advice: dict,
+        price: float,
+        equity: float,
+        day_trades: int,
+    ) -> tuple[dict, dict, float] | None:
+        """Size stage: ATR-scaled order for *symbol*, or ``None`` without bars."""
+        atr = calculate_atr(symbol)
+        if math.isnan(atr):
+            if symbol not in self._skip_logged:
+                logging.debug(
+                    "[SKIP] %s waiting for bars (have=%d)",
+                    symbol,
+                    len(get_market().minute_bars(symbol)),
+                )
+                self._skip_logged.add(symbol)
+            return None
+        self._skip_logged.discard(symbol)
+        conf = max(advice.get("confidence", 0.0), 0.0)
+        size_usd = equity * cfg.RISK_PER_TRADE * conf / (atr / price if atr else 1)
+        if day_trades > 100:
+            size_usd *= 0.75
+        order = {
+            "symbol": symbol,
+            "side": "buy" if advice["bias"] == "long" else "sell",
+            "size_usd": size_usd,
+            "take_profit": price * (1 + advice.get("edge", 0.0)),
+        }
+        return order, advice, atr
+
+    def _execute(
+        self, order: dict, advice: dict, atr: float, snap: MarketSnapshot
+    ) -> None:
+        """Execution stage for one risk-accepted *order*.
+
+        The order goes to ``self.orders``, whose maker → taker escalation
+        advances at each cycle's orders stage; the position opens once it
+        fills and is then left to ``self.positions`` to exit. Fills from the
+        first attempt are marked to market at the cycle's snapshot.
+        """
+        symbol, side = order["symbol"], order["side"]
+
+        def on_done(o: Order) -> None:
+            if not o.qty:
+                return
+            self.positions.open(symbol, side, o.qty, o.avg_price, atr)
+            for fill_id in o.fill_ids:  # the last trade may be another exit
+                risk.annotate_trade(fill_id, signals=advice["rationale"], ret=0.0)
             mbias = advice.get("rationale", {}).get("macro", 0.0)
             hit = (side == "buy" and mbias > 0) or (side == "sell" and mbias < 0)
             risk.record_macro_hit(hit)
             metrics.trade_count_day_g.set(risk.trade_count_day())
 
-    # ---------------------------------------------------------------- exit logic
-    def _exit_position(
-        self, symbol: str, side: str, qty: float, entry: float, atr: float
-    ) -> None:
-        """Close position via ATR-based TP/SL or timeout."""
-        tp = entry + cfg.K_TP * atr if side == "buy" else entry - cfg.K_TP * atr
-        sl = entry - cfg.K_SL * atr if side == "buy" else entry + cfg.K_SL * atr
-        end = time.time() + cfg.MAX_HOLD_MIN * 60
-        exit_side = "sell" if side == "buy" else "buy"
-        while True:
-            px = fetch_price(symbol)
-            if (side == "buy" and px >= tp) or (side == "sell" and px <= tp):
-                metrics.exit_tp_total.inc()
-                break
-            if (side == "buy" and px <= sl) or (side == "sell" and px >= sl):
-                metrics.exit_sl_total.inc()
-                break
-            if time.time() >= end:
-                metrics.exit_timeout_total.inc()
-                break
-            time.sleep(1)
-        self.exec.submit_order(exit_side, qty * px, symbol)
+        with risk.marked_to(snap):
+            self.orders.submit(
+                symbol,
+                side,
+                order["size_usd"],
+                self.exec,
+                maker=cfg.EXECUTION_MODE == "maker",
+                on_done=on_done,
+            )
 
 
 async def desk_runner():
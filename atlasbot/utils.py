@@ -14,9 +14,13 @@ import os
 from typing import List
 
 from atlasbot.config import SYMBOLS
-from atlasbot.market_data import get_market
+from atlasbot.feature_cache import cached
+from atlasbot.indicators import ATR_PERIOD, VOL_PERIOD
+from atlasbot.market_data import StalePrice, get_market
+from atlasbot.snapshot import MarketSnapshot
 
 _md = None
+_ready_md = None  # the market whose feed has been seen ready – a one-way latch
 
 
 def _get_md():
@@ -31,18 +35,25 @@ def _ensure_ready(timeout: int = 60) -> None:
     """Wait for market data feed readiness or raise ``RuntimeError``.
 
     If ``CI=true`` or ``MARKET_DATA_MOCK=true`` is set in the environment, the
-    readiness check is skipped.
+    readiness check is skipped. Once a market has been seen ready the check
+    latches, and later calls return without waiting; per-symbol freshness is
+    the caller's business from then on (see ``fetch_price``'s *max_age*).
     """
+    global _ready_md
     md = _get_md()
+    if md is _ready_md:
+        return
     if (
         os.getenv("CI", "").lower() == "true"
         or os.getenv("MARKET_DATA_MOCK", "").lower() == "true"
     ):
         logging.warning("CI mode – skipping market-data readiness check")
+        _ready_md = md
         return
 
     for attempt in range(3):
         if md.wait_ready(timeout):
+            _ready_md = md
             return
         logging.warning("Market feed not ready – retry %d/3", attempt + 1)
 
@@ -51,35 +62,70 @@ def _ensure_ready(timeout: int = 60) -> None:
 
 
 # --------------------------------------------------------------------------- façade
-def fetch_price(symbol: str) -> float:
-    """Return the latest trade price for *symbol* (blocks until ready)."""
+def fetch_price(symbol: str, max_age: float | None = None) -> float:
+    """Return the latest trade price for *symbol*.
+
+    Blocks only until the feed is first ready; after that it is a dict read.
+    With *max_age*, raises ``StalePrice`` if the price is older than that many
+    seconds instead of returning it.
+    """
+    md = _get_md()
+    if md is not _ready_md:
+        _ensure_ready()
+    price = md.latest_trade(symbol)
+    if max_age is not None:
+        age = md.price_age(symbol)
+        if age > max_age:
+            raise StalePrice(symbol, age)
+    return price
+
+
+def market_snapshot(symbols: List[str] | None = None) -> MarketSnapshot:
+    """One consistent view of *symbols*' market state (blocks until ready)."""
     _ensure_ready()
-    return _get_md().latest_trade(symbol)
+    return _get_md().snapshot(SYMBOLS if symbols is None else symbols)
 
 
-def calculate_atr(symbol: str, period: int = 10) -> float:
+def calculate_atr(symbol: str, period: int = ATR_PERIOD) -> float:
     """
     Average True Range over *period* 1-minute bars.
-    Raises if insufficient history is available.
+    ``nan`` if insufficient history is available.
     """
     _ensure_ready()
-    bars = list(_get_md().minute_bars(symbol))[-period - 1 :]
-    if len(bars) < period + 1:
+    md = _get_md()
+    return cached(md, symbol, "atr", period, lambda: _atr(md, symbol, period))
+
+
+def _atr(md, symbol: str, period: int) -> float:
+    if period == ATR_PERIOD and hasattr(md, "indicators"):
+        return md.indicators(symbol).atr()
+    w = md.bar_window(symbol, period + 1)
+    if len(w.close) < period + 1:
         return float("nan")
+    closes, highs, lows = w.close.tolist(), w.high.tolist(), w.low.tolist()
     trs = [
         max(h, prev_close) - min(low, prev_close)
-        for prev_close, (_, h, low, _) in zip((b[3] for b in bars[:-1]), bars[1:])
+        for prev_close, h, low in zip(closes[:-1], highs[1:], lows[1:])
     ]
     return sum(trs) / period
 
 
-def fetch_volatility(symbol: str, period: int = 30) -> float:
+def fetch_volatility(symbol: str, period: int = VOL_PERIOD) -> float:
     """
     Mean absolute deviation of the closing price over *period* 1-minute bars.
     A quick-and-dirty proxy for intraday volatility.
     """
     _ensure_ready()
-    closes: List[float] = [b[3] for b in list(_get_md().minute_bars(symbol))[-period:]]
+    md = _get_md()
+    return cached(
+        md, symbol, "volatility", period, lambda: _volatility(md, symbol, period)
+    )
+
+
+def _volatility(md, symbol: str, period: int) -> float:
+    if period == VOL_PERIOD and hasattr(md, "indicators"):
+        return md.indicators(symbol).volatility()
+    closes: List[float] = md.bar_window(symbol, period).close.tolist()
     if len(closes) < period:
         return float("nan")
 
@@ -0,0 +1,168 @@
+"""
+WebSocket message decoding
+——————————————————————————
+• ``sniff_type`` reads the ``"type"`` field without parsing the message, so
+  heartbeats and subscription acks are never fully decoded
+• ticker messages go straight into a compact ``Tick`` record
+• Advanced Trade frames (``{"channel":..,"events":[..]}``) are told apart by
+  ``sniff_channel``; a ``market_trades`` frame yields one ``Tick`` per
+  ``events[].trades[]`` entry, stamped with the trade's own time and id so
+  it keys the same way as the legacy ticker
+• orjson is used when installed, stdlib ``json`` otherwise (``WS_DECODER``)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, NamedTuple
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional speed-up
+    _orjson = None
+
+BOOK_TYPES = ("snapshot", "l2update")
+_TYPE_KEY = '"type":'
+_TYPE_FIRST = '{"type":"'
+_CHANNEL_KEY = '"channel":'
+_CHANNEL_FIRST = '{"channel":"'
+
+
+class Tick(NamedTuple):
+    """Normalised trade tick."""
+
+    symbol: str
+    price: float
+    size: float
+    ts: float  # exchange time, epoch seconds
+    bid: float
+    ask: float
+    seq: int
+    trade_id: int = 0  # exchange trade id, shared by both feeds (0 = unknown)
+
+
+_sec = ("", 0.0)  # memoised (whole-second prefix, epoch)
+
+
+def parse_ts(raw: str | None, default: float = 0.0) -> float:
+    """Exchange ISO-8601 timestamp → epoch seconds (*default* if missing).
+
+    Ticks arrive in time order, so the whole-second prefix is memoised and
+    only the fraction is parsed for ticks within the same second.
+    """
+    global _sec
+    if not raw:
+        return default
+    if raw.endswith("Z") and len(raw) > 20 and raw[19] == ".":
+        prefix, epoch = _sec
+        if raw[:19] != prefix:
+            prefix = raw[:19]
+            epoch = datetime.fromisoformat(prefix + "+00:00").timestamp()
+            _sec = (prefix, epoch)
+        return epoch + float(raw[19:-1])
+    return datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp()
+
+
+def sniff_type(msg: str | bytes) -> str:
+    """Return the message ``type`` by scanning for the key, not parsing."""
+    if msg.__class__ is str and msg.startswith(_TYPE_FIRST):
+        return msg[9 : msg.find('"', 9)]  # Coinbase always leads with "type"
+    return _scan(msg, _TYPE_KEY)
+
+
+def sniff_channel(msg: str | bytes) -> str:
+    """Return an Advanced Trade frame's ``channel`` the same way."""
+    if msg.__class__ is str and msg.startswith(_CHANNEL_FIRST):
+        return msg[12 : msg.find('"', 12)]
+    return _scan(msg, _CHANNEL_KEY)
+
+
+def _scan(msg: str | bytes, key: str) -> str:
+    if isinstance(msg, (bytes, bytearray, memoryview)):
+        msg = bytes(msg[:256]).decode("utf-8", "replace")
+    i = msg.find(key)
+    if i < 0:
+        return ""
+    i = msg.find('"', i + len(key))
+    if i < 0:
+        return ""
+    j = msg.find('"', i + 1)
+    return msg[i + 1 : j] if j > i else ""
+
+
+class Decoder:
+    """Full JSON decoding plus ticker → ``Tick`` conversion."""
+
+    name = "json"
+
+    def __init__(self, loads: Callable[[Any], Any] = json.loads):
+        self.loads = loads
+
+    def tick(self, msg: str | bytes, now: float = 0.0) -> Tick:
+        j = self.loads(msg)
+        return Tick(
+            j["product_id"],
+            float(j["price"]),
+            float(j.get("last_size") or 0.0),
+            parse_ts(j.get("time"), now),
+            float(j.get("best_bid") or 0.0),
+            float(j.get("best_ask") or 0.0),
+            int(j.get("sequence") or 0),
+            _trade_id(j.get("trade_id")),
+        )
+
+    def ticks(self, msg: str | bytes, now: float = 0.0) -> list[Tick]:
+        """Every trade in an Advanced Trade ``market_trades`` frame.
+
+        Trades carry no book, so ``bid``/``ask`` are 0; ``seq`` is the
+        frame's connection-wide ``sequence_num``. The ``snapshot`` event
+        sent on subscribing replays past trades and is skipped.
+        """
+        j = self.loads(msg)
+        seq = int(j.get("sequence_num") or 0)
+        return [
+            Tick(
+                t["product_id"],
+                float(t["price"]),
+                float(t.get("size") or 0.0),
+                parse_ts(t.get("time"), now),
+                0.0,
+                0.0,
+                seq,
+                _trade_id(t.get("trade_id")),
+            )
+            for ev in j.get("events", ())
+            if ev.get("type") != "snapshot"
+            for t in ev.get("trades", ())
+        ]
+
+
+def _trade_id(raw: Any) -> int:
+    """Trade id as an int; the legacy feed sends a number, Advanced a string."""
+    try:
+        return int(raw or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class OrjsonDecoder(Decoder):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        super().__init__(_orjson.loads)
+
+
+def available() -> list[str]:
+    return ["json"] + (["orjson"] if _orjson is not None else [])
+
+
+def get_decoder(name: str | None = None) -> Decoder:
+    """Decoder by *name*; defaults to ``WS_DECODER`` then the fastest one."""
+    name = (name or os.getenv("WS_DECODER", "")).lower()
+    if name == "json":
+        return Decoder()
+    if name == "orjson" and _orjson is None:
+        raise ValueError("orjson decoder requested but orjson is not installed")
+    return OrjsonDecoder() if _orjson is not None else Decoder()
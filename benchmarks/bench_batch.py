@@ -0,0 +1,112 @@
+"""
+Decision cycle cost vs symbol count: per-symbol vs vectorised batch
+———————————————————————————————————————————————————————————————————
+``DecisionEngine.next_advice`` per symbol (engine-backed signals through the
+feature cache) against ``next_advice_batch``, which evaluates momentum,
+breakout and the weighted score for all symbols in NumPy passes over the
+market's ``BarMatrix``. The "on close" column forces the bar features to be
+recomputed every cycle, as on the first cycle after a bar close. Order-flow,
+macro, price and spread lookups are stubbed to constants so only signal
+evaluation is timed.
+
+    python -m benchmarks.bench_batch [--symbols 11,50,100,300] [--cycles 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import time
+
+import atlasbot.decision_engine as de
+from atlasbot.bar_store import Bar
+from atlasbot.batch import BarMatrix
+from atlasbot.feature_cache import FeatureCache
+from atlasbot.indicators import Indicators
+
+mom = importlib.import_module("atlasbot.signals.momentum")
+bo = importlib.import_module("atlasbot.signals.breakout")
+
+
+class _Market:
+    def __init__(self, symbols, rng):
+        self._ind = {}
+        self._matrix = BarMatrix(symbols)
+        self._features = FeatureCache()
+        for sym in symbols:
+            px, ind = 100.0, Indicators()
+            for i in range(self._matrix.window):
+                c = px + rng.gauss(0, 0.3)
+                bar = Bar(60.0 * i, px, max(px, c) + 0.05, min(px, c) - 0.05, c, 1, 1)
+                ind.update(bar)
+                self._matrix.update(sym, bar)
+                px = c
+            self._ind[sym] = ind
+            self._features.bump(sym, 1)
+            for t in range(30):  # 30 s of quotes so edges are not trivially flat
+                de.symbol_state(sym).update(100.0 + rng.gauss(0, 0.1), t)
+
+    def indicators(self, sym):
+        return self._ind[sym]
+
+    def feature(self, sym, name, params, compute):
+        return self._features.get(sym, name, params, compute)
+
+    def bar_matrix(self):
+        return self._matrix
+
+
+def _install(market) -> None:
+    de.get_market = mom.get_market = bo.get_market = lambda *a: market
+    de.imbalance = lambda sym: 0.1
+    de.macro_bias = lambda sym: 0.0
+    de.fetch_price = lambda sym: 100.0
+    de.get_spread_bps = lambda sym: 1.0
+    de.log_decision = lambda rec: None
+
+
+def _rate(fn, cycles: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(cycles):
+        fn()
+    return (time.perf_counter() - t0) / cycles * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", default="11,50,100,300")
+    parser.add_argument("--cycles", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    engine = de.DecisionEngine()
+    engine._last_adapt = float("inf")
+    print(
+        f"{'symbols':>8} {'per-symbol':>12} {'batch':>12} {'on close':>12}"
+        f" {'speed-up':>9}"
+    )
+    for n in map(int, args.symbols.split(",")):
+        symbols = [f"SYM{i}-USD" for i in range(n)]
+        market = _Market(symbols, rng)
+        _install(market)
+
+        def loop():
+            for sym in symbols:
+                engine.next_advice(sym)
+
+        per = _rate(loop, args.cycles)
+        batch = _rate(lambda: engine.next_advice_batch(symbols), args.cycles)
+
+        def on_close():
+            market._matrix.version += 1
+            engine.next_advice_batch(symbols)
+
+        close = _rate(on_close, args.cycles)
+        print(
+            f"{n:>8} {per:>9.1f} µs {batch:>9.1f} µs {close:>9.1f} µs"
+            f" {per / batch:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
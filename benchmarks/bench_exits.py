@@ -0,0 +1,109 @@
+"""
+Decisions per minute while positions are open: blocking exit loop vs manager
+————————————————————————————————————————————————————————————————————————————
+An always-long engine trades every symbol it may. With the old exit loop
+each fill blocked ``run_cycle`` until that position hit TP, SL or
+``MAX_HOLD_MIN``; with ``PositionManager`` the cycle keeps advising every
+symbol while positions are open. Runs on a ``VirtualClock``, so the
+numbers are per simulated minute.
+
+    python -m benchmarks.bench_exits [--symbols 11] [--minutes 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+
+import atlasbot.config as cfg
+import atlasbot.trader as tr
+from atlasbot import clock
+from atlasbot.execution.base import Fill
+from atlasbot.position_manager import PositionManager
+from atlasbot.snapshot import MarketSnapshot
+
+CYCLE_SEC = 1.0  # cli.run_bot default
+
+
+def _price(i: int) -> float:
+    t = clock.now()
+    return 100.0 + math.sin(t / 47.0 + i) + 0.5 * math.sin(t / 11.0 + 2 * i)
+
+
+def _fetch_price(symbol: str) -> float:
+    return _price(int(symbol[3:].split("-")[0]))
+
+
+class _Engine:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def next_advice(self, symbol: str, snap=None) -> dict:
+        self.calls += 1
+        rationale = {"orderflow": 0.5, "momentum": 0.5, "macro": 0.0}
+        return {"bias": "long", "edge": 0.05, "confidence": 1.0, "rationale": rationale}
+
+
+class _Exec:
+    @staticmethod
+    def submit_order(side: str, size_usd: float, symbol: str) -> Fill:
+        px = _fetch_price(symbol)
+        return Fill("bench", size_usd / px, px)
+
+
+class _Blocking(PositionManager):
+    """The old behaviour: hold each fill until TP, SL or timeout closes it.
+
+    ``open`` polls the price every second and returns only once the
+    position has exited, so ``run_cycle`` waits on it.
+    """
+
+    def __init__(self, bot: tr.IntradayTrader) -> None:
+        super().__init__()
+        self._bot = bot
+
+    def open(self, symbol, side, qty, entry, atr):
+        pm = PositionManager()
+        pm.open(symbol, side, qty, entry, atr)
+        while not pm.on_price(symbol, _fetch_price(symbol), self._bot.exec):
+            clock.sleep(1)
+
+
+def _decisions_per_min(symbols, minutes: int, blocking: bool) -> float:
+    clock._clock = clock.VirtualClock(0.0)
+    engine = _Engine()
+    bot = tr.IntradayTrader(decision_engine=engine, backend="sim")
+    if blocking:
+        bot.positions = _Blocking(bot)
+    end = clock.now() + minutes * 60
+    while clock.now() < end:
+        bot.run_cycle()
+        clock.sleep(CYCLE_SEC)
+    return engine.calls / minutes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=11)
+    parser.add_argument("--minutes", type=int, default=60)
+    args = parser.parse_args()
+    symbols = [f"SYM{i}-USD" for i in range(args.symbols)]
+    index = {sym: i for i, sym in enumerate(symbols)}
+
+    cfg.SYMBOLS = symbols
+    cfg.EXECUTION_MODE = "taker"
+    tr.get_backend = lambda name=None: _Exec
+    tr.market_snapshot = lambda syms: MarketSnapshot.of(
+        {s: _price(index[s]) for s in syms}, dict.fromkeys(syms, 1)
+    )
+    tr.calculate_atr = lambda s: 0.25
+    tr.risk.check_risk_batch = lambda orders: [True] * len(orders)
+
+    before = _decisions_per_min(symbols, args.minutes, blocking=True)
+    after = _decisions_per_min(symbols, args.minutes, blocking=False)
+    print(f"blocking exits  {before:>8.1f} decisions/min ({args.symbols} symbols)")
+    print(f"position mgr    {after:>8.1f} decisions/min  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
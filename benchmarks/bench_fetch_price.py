@@ -0,0 +1,76 @@
+"""
+fetch_price throughput: per-call readiness wait vs readiness latch
+——————————————————————————————————————————————————————————————————
+Before the latch every ``fetch_price`` read two environment variables and
+ran ``MarketData.wait_ready`` (a scan over every symbol) before the dict
+lookup. Now readiness latches once and each call is the dict read, plus
+a second one when a staleness bound is given.
+
+    python -m benchmarks.bench_fetch_price [--symbols 11] [--calls 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import atlasbot.utils as utils
+from atlasbot import clock
+from atlasbot.market_data import MarketData
+
+
+class _Market:
+    """The real ``MarketData`` accessors over a filled price table."""
+
+    mode = "websocket"
+    wait_ready = MarketData.wait_ready
+    latest_trade = MarketData.latest_trade
+    price_age = MarketData.price_age
+
+    def __init__(self, symbols):
+        self._symbols = symbols
+        self._prices = {s: 100.0 for s in symbols}
+        self._price_ts = {s: clock.monotonic() for s in symbols}
+
+
+def _legacy_fetch_price(md, symbol: str) -> float:
+    """``fetch_price`` as it was: readiness checked on every call."""
+    if not (
+        os.getenv("CI", "").lower() == "true"
+        or os.getenv("MARKET_DATA_MOCK", "").lower() == "true"
+    ):
+        for _ in range(3):
+            if md.wait_ready(60):
+                break
+    return md.latest_trade(symbol)
+
+
+def _rate(fn, symbols, calls: int) -> float:
+    n = len(symbols)
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(symbols[i % n])
+    return calls / (time.perf_counter() - t0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=11)
+    parser.add_argument("--calls", type=int, default=200_000)
+    args = parser.parse_args()
+    symbols = [f"SYM{i}-USD" for i in range(args.symbols)]
+    md = _Market(symbols)
+    utils._md = md
+    utils._get_md = lambda: md
+
+    before = _rate(lambda s: _legacy_fetch_price(md, s), symbols, args.calls)
+    after = _rate(utils.fetch_price, symbols, args.calls)
+    stale = _rate(lambda s: utils.fetch_price(s, max_age=120), symbols, args.calls)
+    print(f"per-call wait  {before / 1e6:>6.2f} M calls/s ({args.symbols} symbols)")
+    print(f"latched        {after / 1e6:>6.2f} M calls/s  ({after / before:.1f}x)")
+    print(f"latched+age    {stale / 1e6:>6.2f} M calls/s  ({stale / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
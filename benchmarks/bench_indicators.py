@@ -0,0 +1,102 @@
+"""
+Per-cycle indicator cost: recompute-from-bars vs incremental engine
+———————————————————————————————————————————————————————————————————
+One ``IntradayTrader`` cycle reads ATR (twice), volatility, momentum and
+breakout for every symbol. The legacy path rebuilds each from the bar
+window on every read; the engine folds each bar in once on close and
+serves O(1) reads. The feature cache on top serves repeat reads within a
+bar from a dict.
+
+    python -m benchmarks.bench_indicators [--symbols 11] [--cycles 2000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import random
+import time
+
+import atlasbot.utils as utils
+from atlasbot.bar_store import Bar, BarStore
+from atlasbot.feature_cache import FeatureCache
+from atlasbot.indicators import Indicators
+
+mom = importlib.import_module("atlasbot.signals.momentum")
+bo = importlib.import_module("atlasbot.signals.breakout")
+
+
+class _Market:
+    def __init__(self, stores, engines=None, cache=None):
+        self._stores = stores
+        if engines is not None:
+            self.indicators = engines.__getitem__
+        if cache is not None:
+            self.feature = cache.get
+
+    def bar_window(self, sym, n=None):
+        return self._stores[sym].window(n)
+
+    def wait_ready(self, _timeout=0):
+        return True
+
+
+def _history(n: int, rng: random.Random) -> list[Bar]:
+    px, bars = 100.0, []
+    for i in range(n):
+        c = px + rng.gauss(0, 0.3)
+        h, low = max(px, c) + 0.05, min(px, c) - 0.05
+        bars.append(Bar(60.0 * i, px, h, low, c, 1.0, 1))
+        px = c
+    return bars
+
+
+def _cycle(symbols) -> None:
+    for sym in symbols:
+        utils.calculate_atr(sym)
+        utils.fetch_volatility(sym)
+        mom.momentum(sym)
+        bo.breakout(sym)
+        utils.calculate_atr(sym)  # run_cycle asks for ATR a second time
+
+
+def _rate(market, symbols, cycles: int) -> float:
+    utils._get_md = lambda: market
+    mom.get_market = bo.get_market = lambda *a: market
+    t0 = time.perf_counter()
+    for _ in range(cycles):
+        _cycle(symbols)
+    return (time.perf_counter() - t0) / cycles * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=11)
+    parser.add_argument("--cycles", type=int, default=2_000)
+    args = parser.parse_args()
+    rng = random.Random(1)
+    symbols = [f"SYM{i}-USD" for i in range(args.symbols)]
+    stores, engines = {}, {}
+    for sym in symbols:
+        bars = _history(5_000, rng)
+        stores[sym] = BarStore(5_000)
+        engines[sym] = Indicators()
+        for bar in bars:
+            stores[sym].append(bar)
+        engines[sym].seed(bars[-engines[sym].keep :])
+
+    legacy = _rate(_Market(stores), symbols, args.cycles)
+    engine = _rate(_Market(stores, engines), symbols, args.cycles)
+    cached = _rate(_Market(stores, engines, FeatureCache()), symbols, args.cycles)
+    t0 = time.perf_counter()
+    for sym in symbols:
+        engines[sym].update(Bar(3e5, 100, 100.1, 99.9, 100, 1.0, 1))
+    close_us = (time.perf_counter() - t0) * 1e6
+    print(f"recompute  {legacy:>9.1f} µs/cycle ({args.symbols} symbols)")
+    print(f"engine     {engine:>9.1f} µs/cycle  ({legacy / engine:.1f}x)")
+    print(f"cached     {cached:>9.1f} µs/cycle  ({legacy / cached:.1f}x)")
+    print(f"bar close  {close_us:>9.1f} µs to update every engine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+REST fallback refresh round: sequential vs windowed poller
+——————————————————————————————————————————————————————————
+Every ``/ticker`` call is simulated as a sleep of 50–150 ms, one symbol
+hanging for the full timeout-like 1 s. The old poller fetched the symbols
+one after another; ``MarketData._rest_poller`` runs them
+``REST_CONCURRENCY`` at a time, so a round is bounded by its slowest call.
+
+    python -m benchmarks.bench_rest_poll [--symbols 11] [--slow 1.0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+
+import atlasbot.config  # noqa: F401  before market_data: config imports it back
+import atlasbot.market_data as md
+from atlasbot import http_client as http
+
+
+class _Resp:
+    ok = True
+
+    @staticmethod
+    def json() -> dict:
+        return {"price": "100"}
+
+
+class _Hub:
+    def __init__(self, market) -> None:
+        self.market = market
+
+    async def sleep(self, delay: float, conn: str = "hub") -> None:
+        self.market.mode = "websocket"  # one round only
+
+
+def _market(symbols):
+    m = object.__new__(md.MarketData)
+    m._symbols = symbols
+    m._prices, m._price_ts, m._rest_ts = {}, {}, {}
+    m._last_update = 0.0
+    m.mode = "rest"
+    m._on_trade = lambda sym, ts, price: None
+    m._hub = _Hub(m)
+    return m
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=11)
+    parser.add_argument("--slow", type=float, default=1.0)
+    args = parser.parse_args()
+    symbols = [f"SYM{i}-USD" for i in range(args.symbols)]
+    rng = random.Random(0)
+    latency = {s: rng.uniform(0.05, 0.15) for s in symbols}
+    latency[symbols[0]] = args.slow
+
+    def get(url: str, timeout: float = 5) -> _Resp:
+        time.sleep(latency[url.split("/")[-2]])
+        return _Resp()
+
+    http.get = get
+    md._held = lambda syms: set()
+
+    t0 = time.perf_counter()
+    for sym in symbols:  # the old loop body, minus parsing
+        get(md.REST_TICKER_FMT.format(sym))
+    before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    asyncio.run(_market(symbols)._rest_poller())
+    after = time.perf_counter() - t0
+    print(f"sequential round  {before:>6.2f} s ({args.symbols} symbols)")
+    print(f"windowed round    {after:>6.2f} s  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
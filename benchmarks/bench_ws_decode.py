@@ -0,0 +1,106 @@
+"""
+Messages/second per WebSocket decoder
+—————————————————————————————————————
+Replays captured Coinbase feed payloads (ticker-heavy mix with heartbeats,
+subscription acks and L2 updates) through ``_WSClient._on_msg`` for every
+available decoder, against the previous path: ``json.loads`` on every
+message, then price/size/time pulled from the dict by the tick callback.
+
+    python -m benchmarks.bench_ws_decode [--n 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from datetime import datetime
+
+import atlasbot.config  # noqa: F401  before market_data: config imports it back
+from atlasbot.market_data import _WSClient
+from atlasbot.ws_decode import available, get_decoder
+
+# captured from wss://ws-feed.exchange.coinbase.com
+SAMPLES = [
+    '{"type":"ticker","sequence":37475248783,"product_id":"BTC-USD",'
+    '"price":"67420.01","open_24h":"66210.5","volume_24h":"9876.54321",'
+    '"low_24h":"65880","high_24h":"67650","volume_30d":"312345.6789",'
+    '"best_bid":"67420.00","best_bid_size":"0.41250000","best_ask":"67420.01",'
+    '"best_ask_size":"0.01500000","side":"buy","time":"2025-05-30T14:03:21.512337Z",'
+    '"trade_id":640137221,"last_size":"0.00184"}',
+    '{"type":"ticker","sequence":18342901122,"product_id":"ETH-USD",'
+    '"price":"3811.42","open_24h":"3760.1","volume_24h":"120456.112",'
+    '"low_24h":"3730.55","high_24h":"3840","volume_30d":"3456789.01",'
+    '"best_bid":"3811.41","best_bid_size":"2.10000000","best_ask":"3811.42",'
+    '"best_ask_size":"0.33000000","side":"sell","time":"2025-05-30T14:03:21.514112Z",'
+    '"trade_id":512339876,"last_size":"0.25"}',
+    '{"type":"heartbeat","last_trade_id":640137221,"product_id":"BTC-USD",'
+    '"sequence":37475248790,"time":"2025-05-30T14:03:21.600001Z"}',
+    '{"type":"l2update","product_id":"BTC-USD","changes":[["buy","67419.50",'
+    '"0.12000000"]],"time":"2025-05-30T14:03:21.601200Z"}',
+    '{"type":"subscriptions","channels":[{"name":"ticker","product_ids":'
+    '["BTC-USD","ETH-USD"]}]}',
+]
+MIX = [0, 1, 0, 1, 2, 3, 0, 1, 3, 0]  # ≈ 60 % ticker, 20 % L2, 10 % heartbeat
+
+
+def _client(decoder) -> _WSClient:
+    return _WSClient(
+        "bench",
+        [],
+        {},
+        on_tick_cb=lambda tick: None,
+        on_book_cb=lambda msg: None,
+        decoder=decoder,
+    )
+
+
+def _rate(on_msg, msgs) -> float:
+    t0 = time.perf_counter()
+    for m in msgs:
+        on_msg(None, m)
+    return len(msgs) / (time.perf_counter() - t0)
+
+
+class _LegacyClient(_WSClient):
+    """The pre-decoder path: parse everything, hand the dict downstream."""
+
+    def _on_msg(self, _, msg):
+        try:
+            j = json.loads(msg)
+            kind = j.get("type")
+            if kind == "ticker":
+                self._store[j["product_id"]] = float(j["price"])
+                self._last_update = time.monotonic()
+                if self._on_tick_cb:
+                    self._on_tick_cb(j)
+            elif kind in ("l2update", "snapshot") and self._on_book_cb:
+                self._on_book_cb(j)
+        except Exception:  # noqa: BLE001
+            pass
+
+
+def _legacy_tick(j: dict) -> None:
+    raw = j.get("time")
+    datetime.fromisoformat(raw.replace("Z", "+00:00")).timestamp()
+    float(j["price"]), float(j.get("last_size") or 0.0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=200_000)
+    args = parser.parse_args()
+    msgs = [SAMPLES[MIX[i % len(MIX)]] for i in range(args.n)]
+
+    legacy = _LegacyClient(
+        "bench", [], {}, on_tick_cb=_legacy_tick, on_book_cb=lambda msg: None
+    )
+    base = _rate(legacy._on_msg, msgs)
+    print(f"{'legacy json':<12} {base:>12,.0f} msg/s")
+    for name in available():
+        rate = _rate(_client(get_decoder(name))._on_msg, msgs)
+        print(f"{name:<12} {rate:>12,.0f} msg/s  ({rate / base:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,18 @@ import atexit
 import json
 import logging
 import os
+import random
 import signal
 import threading
-import time
 
 import openai
 
+import atlasbot.config as cfg
 import atlasbot.metrics as metrics
-from atlasbot import risk
+from atlasbot import clock, http_client, risk
 from atlasbot.config import start_fee_updater
 from atlasbot.metrics import start_metrics_server
+from atlasbot.replay import Replay, parse_speed
 from atlasbot.risk import SUMMARY_PATH
 from atlasbot.secrets_loader import get_openai_api_key
 from atlasbot.trader import IntradayTrader
@@ -60,22 +62,41 @@ def main(simulate: bool = False, max_loops: int = 0) -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--backend", default="sim", choices=["sim", "paper"])
     parser.add_argument("-t", "--time", type=int, default=0, help="run time seconds")
+    parser.add_argument(
+        "--replay",
+        metavar="PATH",
+        help="replay recorded tick segments or cached 1m candles instead of live",
+    )
+    parser.add_argument(
+        "--speed", default="max", help="replay speed: 1, N (x real time) or max"
+    )
     args = parser.parse_args([] if simulate else None)
 
+    if args.replay:
+        _replay(args, max_loops)
+        return
+
+    if isinstance(clock.get_clock(), clock.VirtualClock) and args.backend != "sim":
+        raise SystemExit("CLOCK_MODE=virtual only runs with --backend sim")
+
+    if args.backend == "paper":
+        from atlasbot.execution import paper
+
+        http_client.prewarm([paper.ORDERS_URL, paper.BOOK_URL.format(cfg.SYMBOLS[0])])
     start_fee_updater()
     threading.Thread(target=risk.latency_breaker, daemon=True).start()
     start_metrics_server()
     bot = IntradayTrader(backend=args.backend)
-    end_time = time.time() + args.time if args.time else None
+    end_time = clock.now() + args.time if args.time else None
 
     atexit.register(_finalize)
     loops = 0
-    while not stop_event and (end_time is None or time.time() < end_time):
+    while not stop_event and (end_time is None or clock.now() < end_time):
         if max_loops and loops >= max_loops:
             break
         _run_once(bot)
         loops += 1
-        time.sleep(CYCLE_SEC)
+        clock.sleep(CYCLE_SEC)
 
     logger.info("Shutdown complete")
     from pathlib import Path
@@ -92,5 +113,25 @@ def main(simulate: bool = False, max_loops: int = 0) -> None:
     _finalize()
 
 
+def _replay(args, max_loops: int = 0) -> None:
+    """Run the trading loop against a recording on simulated time."""
+    random.seed(0)  # sim fills draw slippage – keep replays reproducible
+    replay = Replay.open(args.replay, parse_speed(args.speed))
+    symbols = [s for s in cfg.SYMBOLS if s in replay.symbols()]
+    if not symbols:
+        raise SystemExit(f"{args.replay} has none of {cfg.SYMBOLS}")
+    cfg.SYMBOLS[:] = symbols
+    replay.start(symbols)
+    bot = IntradayTrader(backend="sim")
+    atexit.register(_finalize)
+    stats = replay.run(
+        lambda: _run_once(bot),
+        CYCLE_SEC,
+        stop=lambda: stop_event or bool(max_loops and replay.cycles >= max_loops),
+    )
+    logger.info("Replay done: %s", stats.summary())
+    _finalize()
+
+
 if __name__ == "__main__":
     main()
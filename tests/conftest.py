@@ -8,6 +8,11 @@ from pathlib import Path
 import pkg_resources
 import pytest
 
+try:  # the vectorised paths need the real numpy; stub it only when missing
+    import numpy  # noqa: F401
+except ImportError:
+    pass
+
 for _name in ("numpy", "pandas", "prometheus_client"):
     if _name not in sys.modules:
         sys.modules[_name] = types.ModuleType(_name)
@@ -130,7 +135,7 @@ if not hasattr(prom_stub, "CollectorRegistry"):
     prom_stub.start_http_server = start_http_server
 
 
-for name in ("dotenv", "boto3", "openai", "requests", "websocket"):
+for name in ("dotenv", "boto3", "openai", "requests", "websocket", "websockets"):
     if name not in sys.modules:
         sys.modules[name] = types.ModuleType(name)
 if not hasattr(sys.modules["dotenv"], "load_dotenv"):
@@ -192,13 +197,39 @@ ws_stub.WebSocketApp = lambda *a, **k: types.SimpleNamespace(
 ws_stub._exceptions = types.SimpleNamespace(WebSocketBadStatusException=Exception)
 
 
+class _OfflineConnect:
+    """Stand-in for ``websockets.connect`` that always fails to connect."""
+
+    def __init__(self, *a, **k) -> None:
+        pass
+
+    async def __aenter__(self):
+        raise ConnectionRefusedError("offline")
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+
+wss_stub = sys.modules["websockets"]
+if not hasattr(wss_stub, "connect"):
+    wss_stub.connect = _OfflineConnect
+
+
 class DummyMarket:
     def minute_bars(self, _sym):
         return [(1, 1, 1, 1)] * 60
 
+    def bar_window(self, _sym, n=None):
+        from atlasbot.bar_store import BarStore
+
+        return BarStore.from_bars([(1, 1, 1, 1)] * 60).window(n)
+
     def latest_trade(self, _sym):
         return 100.0
 
+    def book(self, _sym):
+        return None
+
     def wait_ready(self, _timeout=0):
         return True
 
@@ -215,6 +246,7 @@ def patch_market(monkeypatch):
     monkeypatch.setattr("atlasbot.utils._get_md", lambda: dummy, raising=False)
     sig.momentum.__globals__["get_market"] = lambda symbols=None: dummy
     sig.breakout.__globals__["get_market"] = lambda symbols=None: dummy
+    sig.imbalance.__globals__["get_market"] = lambda symbols=None: dummy
     yield
 
 
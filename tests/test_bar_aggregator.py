@@ -0,0 +1,19 @@
+from atlasbot.market_data import Bar, BarAggregator
+
+
+def test_ticks_build_ohlcv_on_minute_boundaries():
+    agg = BarAggregator(bar_sec=60)
+    assert agg.ingest("BTC-USD", 120.5, 10.0, 0.5) is None
+    assert agg.ingest("BTC-USD", 130.0, 12.0, 1.0) is None
+    assert agg.ingest("BTC-USD", 150.0, 9.0, 0.0) is None
+    assert agg.ingest("BTC-USD", 100.0, 50.0, 1.0) is None  # late tick dropped
+    closed = agg.ingest("BTC-USD", 180.0, 11.0, 2.0)
+    assert closed == Bar(120.0, 10.0, 12.0, 9.0, 9.0, 1.5, 2)
+
+
+def test_close_due_flushes_quiet_symbols():
+    agg = BarAggregator(bar_sec=60)
+    agg.ingest("ETH-USD", 65.0, 3.0, 1.0)
+    assert agg.close_due(119.0) == []
+    assert agg.close_due(120.0) == [("ETH-USD", Bar(60.0, 3.0, 3.0, 3.0, 3.0, 1.0, 1))]
+    assert agg.close_due(200.0) == []
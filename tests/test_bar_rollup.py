@@ -0,0 +1,30 @@
+from atlasbot.bar_store import Bar, BarRollup
+
+
+def _m(i: int, px: float, vol: float = 1.0) -> Bar:
+    return Bar(i * 60.0, px, px + 1, px - 1, px, vol, 1)
+
+
+def test_five_minute_rollup_matches_reaggregation():
+    roll = BarRollup(300, capacity=10)
+    closed = [roll.update(_m(i, 100.0 + i)) for i in range(12)]
+    assert [b.ts for b in closed if b] == [0.0, 300.0]
+    w = roll.store.window()
+    assert w.open.tolist() == [100.0, 105.0]
+    assert w.high.tolist() == [105.0, 110.0]
+    assert w.low.tolist() == [99.0, 104.0]
+    assert w.close.tolist() == [104.0, 109.0]
+    assert w.volume.tolist() == [5.0, 5.0]
+    assert roll.partial() == Bar(600.0, 110.0, 112.0, 109.0, 111.0, 2.0, 2)
+
+
+def test_gap_and_revision():
+    roll = BarRollup(300, capacity=10)
+    roll.update(_m(3, 10.0))
+    assert roll.update(_m(4, 11.0)).close == 11.0
+    # the newest minute is re-sent with more trades → closed bar revised
+    roll.update(Bar(240.0, 11.0, 15.0, 10.0, 14.0, 3.0, 2))
+    assert roll.store.last() == Bar(0.0, 10.0, 15.0, 9.0, 14.0, 4.0, 3)
+    closed = roll.update(_m(11, 20.0))  # skips a whole bucket
+    assert closed is None
+    assert roll.partial().ts == 600.0
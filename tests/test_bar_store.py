@@ -0,0 +1,39 @@
+import pytest
+
+from atlasbot.bar_store import Bar, BarStore
+
+
+def _bar(i: float) -> Bar:
+    return Bar(i * 60, i, i + 1, i - 1, i + 0.5, 2.0, 3)
+
+
+def test_window_is_latest_bars_and_survives_compaction():
+    store = BarStore(capacity=5, slack=2)
+    for i in range(23):
+        store.append(_bar(i))
+    assert len(store) == 5
+    assert store.seq == 23
+    w = store.window(3)
+    assert list(w.close) == [20.5, 21.5, 22.5]
+    assert list(w.ts) == [1200.0, 1260.0, 1320.0]
+    assert store.window(99).open.tolist() == [18, 19, 20, 21, 22]
+    assert store.last() == _bar(22)
+
+
+def test_minute_bars_shim_yields_ohlc_tuples():
+    store = BarStore(capacity=4)
+    for i in range(6):
+        store.append(_bar(i))
+    assert list(store) == [(i, i + 1, i - 1, i + 0.5) for i in range(2, 6)]
+    assert store[-1] == (5, 6, 4, 5.5)
+    assert store[-2:] == [(4, 5, 3, 4.5), (5, 6, 4, 5.5)]
+    with pytest.raises(IndexError):
+        store[4]
+
+
+def test_window_views_share_memory():
+    store = BarStore(capacity=3)
+    store.append(_bar(1))
+    w = store.window(1)
+    store.replace_last(_bar(7))
+    assert w.close[0] == 7.5
@@ -0,0 +1,93 @@
+import importlib
+import math
+import random
+import types
+
+import numpy
+import pytest
+
+from atlasbot.bar_store import Bar
+from atlasbot.indicators import Indicators
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(numpy, "ndarray"), reason="needs the real numpy"
+)
+
+
+def _walk(n, seed):
+    rng = random.Random(seed)
+    px = 100.0
+    for i in range(n):
+        c = round(px + rng.gauss(0, 0.3), 2)
+        h = round(max(px, c) + abs(rng.gauss(0, 0.1)), 2)
+        low = round(min(px, c) - abs(rng.gauss(0, 0.1)), 2)
+        yield Bar(60.0 * i, px, h, low, c, 1.0, 1)
+        px = c
+
+
+def _same(a, b):
+    return (math.isnan(a) and math.isnan(b)) or abs(a - b) < 1e-9
+
+
+def test_batch_matches_per_symbol_engine():
+    from atlasbot.batch import BarMatrix, bar_features
+
+    lengths = [0, 5, 12, 18, 25, 40, 200]
+    symbols = [f"S{i}" for i in range(len(lengths))]
+    m = BarMatrix(symbols)
+    engines = {}
+    for i, (sym, n) in enumerate(zip(symbols, lengths)):
+        engines[sym] = Indicators()
+        for bar in _walk(n, seed=i):
+            m.update(sym, bar)
+            engines[sym].update(bar)
+        if n:  # revising the newest bar replaces it in place
+            bar = bar._replace(high=bar.high + 1, close=bar.close + 0.5)
+            m.update(sym, bar)
+            engines[sym].update(bar)
+
+    feats = bar_features(m)
+    for sym, i in m.rows.items():
+        ind = engines[sym]
+        assert _same(feats["atr"][i], ind.atr())
+        assert _same(feats["volatility"][i], ind.volatility())
+        assert _same(feats["momentum"][i], ind.momentum())
+        assert feats["breakout"][i] == ind.breakout()
+
+
+def test_next_advice_batch_matches_sequential(monkeypatch):
+    import atlasbot.decision_engine as de
+    from atlasbot.batch import BarMatrix
+
+    mom = importlib.import_module("atlasbot.signals.momentum")
+    bo = importlib.import_module("atlasbot.signals.breakout")
+
+    symbols = [f"S{i}" for i in range(6)]
+    engines = {s: Indicators() for s in symbols}
+    matrix = BarMatrix(symbols)
+    for i, sym in enumerate(symbols):
+        for bar in _walk(30 + 5 * i, seed=10 + i):
+            engines[sym].update(bar)
+            matrix.update(sym, bar)
+    md = types.SimpleNamespace(
+        indicators=engines.__getitem__, bar_matrix=lambda: matrix
+    )
+    for mod in (de, mom, bo):
+        monkeypatch.setattr(mod, "get_market", lambda *a: md)
+    rows = {s: i for i, s in enumerate(symbols)}
+    monkeypatch.setattr(de, "imbalance", lambda s: 0.1 * rows[s] - 0.2)
+    monkeypatch.setattr(de, "macro_bias", lambda s: 0.0)
+    monkeypatch.setattr(de, "fetch_price", lambda s: 100.0 + rows[s])
+    monkeypatch.setattr(de, "get_spread_bps", lambda s: 1.0)
+    monkeypatch.setattr(de, "log_decision", lambda rec: None)
+    monkeypatch.setattr(de, "_states", {})
+    for i, sym in enumerate(symbols):
+        for t in range(10):
+            de.symbol_state(sym).update(100.0 + i + 0.3 * (t % 3), t)
+
+    engine = de.DecisionEngine()
+    engine._last_adapt = float("inf")
+    batch = engine.next_advice_batch(symbols)
+    assert list(batch) == symbols
+    for sym in symbols:
+        assert batch[sym] == engine.next_advice(sym)
@@ -1,6 +1,8 @@
 import importlib
 from collections import deque
 
+from atlasbot.bar_store import BarStore
+
 bo = importlib.import_module("atlasbot.signals.breakout")
 
 
@@ -11,6 +13,9 @@ class FakeMarket:
     def minute_bars(self, sym):
         return self._bars[sym]
 
+    def bar_window(self, sym, n=None):
+        return BarStore.from_bars(self._bars[sym], capacity=25).window(n)
+
 
 def test_breakout_signal(monkeypatch):
     bars = [(i, i, i, i) for i in range(1, 22)]
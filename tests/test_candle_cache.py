@@ -0,0 +1,42 @@
+import time
+
+import atlasbot.market_data as md
+from atlasbot.candle_cache import CandleCache
+
+
+def test_cache_roundtrip_and_trim(tmp_path):
+    cache = CandleCache(tmp_path, keep=2)
+    cache.append("BTC-USD", [(60.0 * i, 1, 3, 2, 2.5, 7) for i in range(4)])
+    assert cache.last_ts("BTC-USD") == 180.0
+    cache.append("BTC-USD", [(240.0, 1, 3, 2, 2.5, 7), (300.0, 1, 3, 2, 2.5, 7)])
+    rows = cache.load("BTC-USD")
+    assert [r[0] for r in rows] == [240.0, 300.0]
+    assert rows[-1] == (300.0, 1.0, 3.0, 2.0, 2.5, 7.0)
+    assert cache.load("ETH-USD") == []
+
+
+def test_restart_fetches_only_missing_tail(tmp_path, monkeypatch):
+    now = time.time()
+    base = now - now % 60 - 600
+    cache = CandleCache(tmp_path)
+    cache.append("BTC-USD", [(base + 60 * i, 1, 3, 2, 2.5, 1) for i in range(5)])
+    urls = []
+
+    def get(url, params=None, timeout=5):
+        urls.append(params)
+        rows = [[base + 60 * i, 1, 3, 2, 2.5, 1] for i in range(4, 11)]
+
+        class Resp:
+            def json(self):
+                return rows[::-1]
+
+        return Resp()
+
+    monkeypatch.setattr(md.http, "get", get)
+    rows = md.MarketData._fetch_candles(cache, "BTC-USD")
+    assert "limit" not in urls[0]
+    # encoded by the client: a raw "+00:00" would reach the server as a space
+    assert urls[0]["start"].endswith("Z") and "+" not in urls[0]["end"]
+    assert [r[0] for r in rows] == [base + 60 * i for i in range(11)]
+    # the still-forming minute is served but not persisted
+    assert cache.last_ts("BTC-USD") == base + 540
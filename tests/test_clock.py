@@ -0,0 +1,53 @@
+import threading
+
+import atlasbot.trader as tr
+from atlasbot import clock
+
+
+def test_virtual_clock_steps_and_pumps():
+    vc = clock.VirtualClock(100.0)
+    vc.sleep(5)
+    assert vc.now() == 105.0
+    wakes = []
+    vc.set_pump(lambda t: (wakes.append(t), vc.advance_to(t - 1)))
+    vc.sleep(10)
+    assert wakes == [115.0] and vc.now() == 115.0
+
+    done = threading.Event()
+
+    def other():  # non-driver threads wait for the driver to catch up
+        vc.sleep(3)
+        done.set()
+
+    threading.Thread(target=other, daemon=True).start()
+    assert not done.wait(0.05)
+    vc.advance_to(120.0)
+    assert done.wait(2)
+
+
+def test_hold_loops_run_on_virtual_time(monkeypatch):
+    vc = clock.VirtualClock(1_000.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    monkeypatch.setattr(tr, "fetch_price", lambda s: 100.0)
+    px, held = tr.TradingBot._simulate_trade(
+        symbol="BTC-USD",
+        side="buy",
+        qty=1.0,
+        entry_price=100.0,
+        profit_target_pct=0.01,
+        atr=1.0,
+        timeout_s=3_600,
+    )
+    assert (px, held) == (100.0, 3_600)
+    assert clock.now() == 4_600.0
+    assert clock.utcnow().timestamp() == 4_600.0
+
+    calls = []
+    backend = type("E", (), {"submit_order": lambda *a: calls.append(a)})()
+    monkeypatch.setattr(tr.cfg, "MAX_HOLD_MIN", 30)
+    pm = tr.PositionManager()
+    pm.open("BTC-USD", "buy", 1.0, 100.0, 1.0)
+    while not pm.on_price("BTC-USD", 100.0, backend):
+        clock.sleep(1)
+    assert clock.now() == 4_600.0 + 30 * 60
+    assert calls
@@ -0,0 +1,144 @@
+import threading
+from types import SimpleNamespace
+
+import atlasbot.config as cfg
+import atlasbot.trader as tr
+from atlasbot import risk
+from atlasbot.execution.base import Fill
+from atlasbot.snapshot import MarketSnapshot
+
+
+class DummyExec:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def submit_order(self, side: str, size_usd: float, symbol: str):
+        self.calls.append((side, size_usd, symbol))
+        return Fill("id", size_usd / 100.0, 100.0)
+
+
+class DummyEngine:
+    def __init__(self, advice):
+        self._advice = advice
+        self.snaps = []
+
+    def next_advice(self, symbol: str, snap=None):
+        self.snaps.append(snap)
+        return self._advice[symbol]
+
+
+def _advice(bias):
+    return {
+        "bias": bias,
+        "edge": 0.05,
+        "confidence": 1.0,
+        "rationale": {"orderflow": 0.5, "momentum": 0.5, "macro": 0.0},
+    }
+
+
+def test_cycle_runs_as_batched_stages(monkeypatch):
+    symbols = ["BTC-USD", "ETH-USD", "SOL-USD"]
+    monkeypatch.setattr(cfg, "SYMBOLS", symbols)
+    prices = {"BTC-USD": 100.0, "ETH-USD": 10.0, "SOL-USD": 50.0}
+    snaps = []
+
+    def market_snapshot(syms):
+        snaps.append(MarketSnapshot.of(prices, dict.fromkeys(syms, 1)))
+        prices["SOL-USD"] = 60.0  # the feed moves on after the snapshot
+        return snaps[-1]
+
+    monkeypatch.setattr(tr, "market_snapshot", market_snapshot)
+    monkeypatch.setattr(tr, "calculate_atr", lambda s: 1.0)
+    md = SimpleNamespace(minute_bars=lambda s: [(1, 1, 1, 1)] * 60)
+    monkeypatch.setattr(tr, "get_market", lambda: md)
+    dummy = DummyExec()
+    monkeypatch.setattr(tr, "get_backend", lambda name=None: dummy)
+    batches = []
+
+    def check_risk_batch(orders):
+        batches.append(orders)
+        return [o["symbol"] != "SOL-USD" for o in orders]
+
+    monkeypatch.setattr(tr.risk, "check_risk_batch", check_risk_batch)
+    engine = DummyEngine(
+        {
+            "BTC-USD": _advice("long"),
+            "ETH-USD": _advice("flat"),
+            "SOL-USD": _advice("short"),
+        }
+    )
+    bot = tr.IntradayTrader(decision_engine=engine, backend="sim")
+    bot.run_cycle()
+
+    assert len(snaps) == 1 and engine.snaps == snaps * 3
+    assert [[o["symbol"] for o in b] for b in batches] == [["BTC-USD", "SOL-USD"]]
+    assert batches[0][1]["take_profit"] == 50.0 * 1.05  # sized at snapshot price
+    assert [c[2] for c in dummy.calls] == ["BTC-USD"]
+    stages = ["snapshot", "exits", "orders", "advice", "filter", "size", "risk"]
+    stages.append("execute")
+    assert list(bot.stage_seconds) == stages
+
+    bot.run_cycle()  # BTC is held, not re-entered; the others are still advised
+    assert bot.positions.holds("BTC-USD") and len(engine.snaps) == 6
+    assert [o["symbol"] for o in batches[-1]] == ["SOL-USD"]
+
+
+def test_entry_fill_is_marked_at_the_snapshot(monkeypatch):
+    rm = risk.RiskManager(starting_cash=1_000.0)
+    rm.lots = {"ETH-USD": [(1.0, 10.0)]}
+    monkeypatch.setattr(risk, "fetch_price", lambda s: 99.0)
+    snap = MarketSnapshot.of({"BTC-USD": 100.0, "ETH-USD": 12.0})
+    with risk.marked_to(snap):
+        rm.record_fill("BTC-USD", "buy", 100.0, 100.0, 0.0, 0.0)
+    assert rm.equity == 900.0 + 2.0
+    rm.record_fill("BTC-USD", "buy", 100.0, 100.0, 0.0, 0.0)
+    assert rm.equity == 800.0 + 89.0 - 2.0  # live prices outside the block
+
+
+def test_risk_batch_counts_earlier_acceptances(monkeypatch):
+    monkeypatch.setattr(risk, "MAX_NOTIONAL", 1_000)
+    monkeypatch.setattr(risk, "MAX_GROSS_USD", 1_000)
+    rm = risk.RiskManager(starting_cash=1_000.0)
+    acquired = []
+
+    class _Lock:
+        def __init__(self):
+            self._lock = threading.Lock()
+
+        def __enter__(self):
+            acquired.append(1)
+            return self._lock.__enter__()
+
+        def __exit__(self, *exc):
+            return self._lock.__exit__(*exc)
+
+    rm._lock = _Lock()
+    orders = [
+        {"symbol": "BTC-USD", "side": "buy", "size_usd": 600.0},
+        {"symbol": "ETH-USD", "side": "buy", "size_usd": 600.0},  # out of margin
+        {"symbol": "BTC-USD", "side": "sell", "size_usd": 300.0},
+        {"symbol": "ETH-USD", "side": "buy", "size_usd": 300.0},
+    ]
+    assert rm.check_risk_batch(orders) == [True, False, True, True]
+    assert len(acquired) == 1
+
+
+def test_stale_symbols_are_not_advised(monkeypatch):
+    monkeypatch.setattr(cfg, "SYMBOLS", ["BTC-USD", "ETH-USD"])
+    monkeypatch.setattr(cfg, "STALE_PRICE_SEC", 60.0)
+    snap = MarketSnapshot.of(
+        {"BTC-USD": 100.0, "ETH-USD": 10.0},
+        {"BTC-USD": 1, "ETH-USD": 1},
+        ages={"BTC-USD": 1.0, "ETH-USD": 90.0},
+    )
+    monkeypatch.setattr(tr, "market_snapshot", lambda syms: snap)
+    dummy = DummyExec()
+    monkeypatch.setattr(tr, "get_backend", lambda name=None: dummy)
+    engine = DummyEngine({"BTC-USD": _advice("flat")})
+    bot = tr.IntradayTrader(decision_engine=engine, backend="sim")
+    bot.positions.open("ETH-USD", "buy", 1.0, 12.0, 1.0)
+    bot.run_cycle()
+    assert engine.snaps == [snap] and bot._stale_logged == {"ETH-USD"}
+    # a held stale symbol still exits at its last price: the stop fires
+    assert not bot.positions.holds("ETH-USD")
+    assert dummy.calls == [("sell", 10.0, "ETH-USD")]
@@ -2,7 +2,9 @@ import importlib
 
 import atlasbot.config as cfg_mod
 import atlasbot.trader as tr_mod
+from atlasbot.bar_store import BarStore
 from atlasbot.execution.base import Fill
+from atlasbot.snapshot import MarketSnapshot
 
 
 class DummyExec:
@@ -23,6 +25,9 @@ class DummyMarket:
     def minute_bars(self, symbol):
         return [(1, 1, 1, 1)] * 60
 
+    def bar_window(self, symbol, n=None):
+        return BarStore.from_bars(self.minute_bars(symbol)).window(n)
+
 
 def _run_bot(monkeypatch, mode: str) -> DummyExec:
     monkeypatch.setenv("EXECUTION_MODE", mode)
@@ -39,12 +44,19 @@ def _run_bot(monkeypatch, mode: str) -> DummyExec:
     de = _importlib.reload(de)
     monkeypatch.setattr(tr, "SYMBOLS", ["BTC-USD"])
     monkeypatch.setattr(cfg, "SYMBOLS", ["BTC-USD"])
-    monkeypatch.setattr(tr, "fetch_price", lambda s: 100.0)
+    monkeypatch.setattr(
+        tr,
+        "market_snapshot",
+        lambda syms: MarketSnapshot.of(
+            dict.fromkeys(syms, 100.0), dict.fromkeys(syms, 8)
+        ),
+    )
     monkeypatch.setattr(tr, "calculate_atr", lambda s: 1.0)
-    monkeypatch.setattr(tr.risk, "check_risk", lambda order: True)
+    monkeypatch.setattr(
+        tr.risk, "check_risk_batch", lambda orders: [True] * len(orders)
+    )
     dummy = DummyExec()
     monkeypatch.setattr(tr, "get_backend", lambda name=None: dummy)
-    monkeypatch.setattr(tr.IntradayTrader, "_exit_position", lambda *a, **k: None)
     dummy_market = DummyMarket()
     monkeypatch.setattr(tr, "get_market", lambda: dummy_market)
     import atlasbot.market_data as md
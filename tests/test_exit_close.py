@@ -13,15 +13,14 @@ class DummyExec:
         return Fill("id", size_usd / 100.0, 100.0)
 
 
-def test_exit_close_tp(monkeypatch):
+def test_exit_close_tp():
     tr = importlib.reload(tr_mod)
     bot = tr.IntradayTrader(backend="sim")
     bot.exec = DummyExec()
-    prices = [100.0, 103.0]
-    monkeypatch.setattr(tr, "fetch_price", lambda s: prices.pop(0))
-    monkeypatch.setattr(tr.time, "sleep", lambda s: None)
     before = tr.metrics.exit_tp_total._value.get()
-    bot._exit_position("BTC-USD", "buy", 1.0, 100.0, 1.0)
+    bot.positions.open("BTC-USD", "buy", 1.0, 100.0, 1.0)
+    assert bot.positions.on_price("BTC-USD", 100.0, bot.exec) is None
+    assert bot.positions.on_price("BTC-USD", 103.0, bot.exec) == "tp"
     after = tr.metrics.exit_tp_total._value.get()
     assert after == before + 1
     assert bot.exec.calls
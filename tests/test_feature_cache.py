@@ -0,0 +1,57 @@
+import atlasbot.utils as utils
+from atlasbot.bar_store import Bar, BarStore
+from atlasbot.feature_cache import FeatureCache
+
+
+class CachedMarket:
+    def __init__(self):
+        self.store = BarStore(100)
+        self.cache = FeatureCache()
+        self.reads = 0
+
+    def close_bar(self, bar):
+        self.store.append(bar)
+        self.cache.bump("X", self.store.seq)
+
+    def bar_window(self, _sym, n=None):
+        self.reads += 1
+        return self.store.window(n)
+
+    def feature(self, sym, name, params, compute):
+        return self.cache.get(sym, name, params, compute)
+
+    def wait_ready(self, _timeout=0):
+        return True
+
+
+def test_computed_once_per_bar(monkeypatch):
+    md = CachedMarket()
+    monkeypatch.setattr(utils, "_get_md", lambda: md)
+    for i in range(12):
+        md.close_bar(Bar(60.0 * i, 10, 11, 9, 10, 1, 1))
+    assert utils.calculate_atr("X") == 2.0
+    assert utils.calculate_atr("X") == 2.0
+    assert md.reads == 1 and md.cache.hits["atr"] == 1
+
+    md.close_bar(Bar(720.0, 10, 14, 9, 10, 1, 1))
+    assert utils.calculate_atr("X") == 2.3
+    assert utils.calculate_atr("X", period=5) == 2.6
+    assert md.reads == 3 and md.cache.misses["atr"] == 3
+
+
+def test_params_and_symbols_are_separate_keys():
+    cache = FeatureCache()
+    calls = []
+
+    def compute(v):
+        calls.append(v)
+        return v
+
+    assert cache.get("A", "f", 1, lambda: compute(1)) == 1
+    assert cache.get("A", "f", 2, lambda: compute(2)) == 2
+    assert cache.get("B", "f", 1, lambda: compute(3)) == 3
+    assert cache.get("A", "f", 1, lambda: compute(4)) == 1
+    cache.bump("A", 1)
+    assert cache.get("A", "f", 1, lambda: compute(5)) == 5
+    assert cache.get("B", "f", 1, lambda: compute(6)) == 3
+    assert calls == [1, 2, 3, 5]
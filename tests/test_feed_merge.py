@@ -0,0 +1,193 @@
+import json
+import time
+
+import atlasbot.market_data as md
+
+
+def _ticker(seq, time, price, trade_id=None, size=0.1):
+    msg = {
+        "type": "ticker",
+        "sequence": seq,
+        "product_id": "BTC-USD",
+        "price": str(price),
+        "time": time,
+        "last_size": str(size),
+    }
+    if trade_id is not None:
+        msg["trade_id"] = trade_id
+    return json.dumps(msg)
+
+
+def _trades(seq, stamp, *trades, kind="update"):
+    """An Advanced Trade ``market_trades`` frame, as the exchange sends it.
+
+    *stamp* is the frame's envelope time, later than the trades it carries;
+    each of *trades* is ``(trade_id, price, trade time)``.
+    """
+    return json.dumps(
+        {
+            "channel": "market_trades",
+            "client_id": "",
+            "timestamp": stamp,
+            "sequence_num": seq,
+            "events": [
+                {
+                    "type": kind,
+                    "trades": [
+                        {
+                            "trade_id": str(tid),
+                            "product_id": "BTC-USD",
+                            "price": str(price),
+                            "size": "0.1",
+                            "side": "BUY",
+                            "time": when,
+                        }
+                        for tid, price, when in trades
+                    ],
+                }
+            ],
+        }
+    )
+
+
+def _clients(merger, store, applied):
+    return (
+        md._WSClient(
+            "wss://x",
+            ["BTC-USD"],
+            store,
+            on_tick_cb=applied.append,
+            name=name,
+            merger=merger,
+            advanced=name == "ws_advanced",
+        )
+        for name in ("ws_pro", "ws_advanced")
+    )
+
+
+def test_first_tick_wins_across_feeds():
+    merger, store, applied = md.FeedMerger(), {}, []
+    pro, adv = _clients(merger, store, applied)
+    t1, t2, t3 = (
+        "2025-05-30T14:03:21.512337Z",
+        "2025-05-30T14:03:21.530120Z",
+        "2025-05-30T14:03:21.561004Z",
+    )
+    late = "2025-05-30T14:03:21.600000123Z"  # envelope of a frame sent later
+    adv._on_msg(None, _trades(0, late, (990, 99, t1), kind="snapshot"))  # backlog
+    pro._on_msg(None, _ticker(7, t1, 100, trade_id=1001))
+    adv._on_msg(None, _trades(1, late, (1001, 100, t1)))  # same trade, later
+    adv._on_msg(None, _trades(2, late, (1002, 101, t2)))  # advanced wins this one
+    pro._on_msg(None, _ticker(8, t2, 101, trade_id=1002))
+    # a newer legacy trade is kept although the last advanced frame is later
+    pro._on_msg(None, _ticker(9, t3, 100.5, trade_id=1003))
+    adv._on_msg(None, '{"channel":"heartbeats","events":[{"type":"update"}]}')
+
+    assert [(t.price, t.trade_id) for t in applied] == [
+        (100.0, 1001),
+        (101.0, 1002),
+        (100.5, 1003),
+    ]
+    assert applied[1].ts < md.parse_ts(late)  # stamped with the trade's time
+    assert round(sum(t.size for t in applied), 9) == 0.3  # volume not doubled
+    assert store == {"BTC-USD": 100.5}
+    assert merger.first == {"ws_pro": 2, "ws_advanced": 1}
+    assert merger.dupes == {"ws_advanced": 1, "ws_pro": 1}
+    assert merger.lead_ns["ws_pro"] > 0 and merger.lead_ns["ws_advanced"] > 0
+    assert merger.source == {"BTC-USD": "ws_pro"}
+
+
+def test_duplicate_without_trade_id_is_dropped_in_window():
+    merger, store, applied = md.FeedMerger(), {}, []
+    pro, adv = _clients(merger, store, applied)
+    t = "2025-05-30T14:03:21.512337Z"
+    pro._on_msg(None, _ticker(7, t, 100))
+    late = "2025-05-30T14:03:23.100Z"
+    adv._on_msg(None, _trades(70, late, ("", 100, "2025-05-30T14:03:21.512Z")))
+    adv._on_msg(None, _trades(71, late, ("", 100, "2025-05-30T14:03:23.000Z")))
+    assert len(applied) == 2 and merger.dupes == {"ws_advanced": 1}
+
+
+def test_advanced_frame_yields_one_tick_per_trade():
+    stamp = "2025-05-30T00:00:02Z"
+    frame = _trades(
+        5,
+        stamp,
+        (11, 100, "2025-05-30T00:00:01.5Z"),
+        (12, 100.5, "2025-05-30T00:00:01.75Z"),
+    )
+    ticks = []
+    ws = md._WSClient("x", [], {}, on_tick_cb=ticks.append, advanced=True)
+    ws._on_msg(None, frame)
+    assert [(t.price, t.seq, t.trade_id, t.size) for t in ticks] == [
+        (100.0, 5, 11, 0.1),
+        (100.5, 5, 12, 0.1),
+    ]
+    assert ticks[0].ts == 1748563201.5
+
+
+class _Socket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, msg):
+        self.sent.append(json.loads(msg))
+
+
+def test_advanced_subscribe_takes_one_channel_per_message():
+    import asyncio
+
+    channels = ["market_trades", "heartbeats"]
+    ws = md._WSClient("x", ["BTC-USD"], {}, channels=channels, advanced=True)
+    ws._ws = _Socket()
+    asyncio.run(ws._on_open())
+    assert ws._ws.sent == [
+        {"type": "subscribe", "product_ids": ["BTC-USD"], "channel": ch}
+        for ch in channels
+    ]
+
+
+class _Book:
+    def __init__(self):
+        self.resets = 0
+
+    def reset(self):
+        self.resets += 1
+
+
+def _market(*feeds):
+    m = object.__new__(md.MarketData)
+    m._feeds, m._books, m.reconnects = list(feeds), {"BTC": _Book()}, 0
+    switched = []
+    m._switch_to_rest = lambda: switched.append(1)
+    return m, switched
+
+
+def _feed(name, channels, connected=True, silent=0.0):
+    ws = md._WSClient("x", [], {}, channels=channels, name=name)
+    ws._ws = object() if connected else None
+    ws.last_tick = time.monotonic() - silent
+    return ws
+
+
+def test_one_dead_feed_is_not_a_failover():
+    book_feed = _feed("ws_pro", ["ticker", md.L2_CHANNEL])
+    tick_feed = _feed("ws_advanced", ["market_trades"], connected=False)
+    m, switched = _market(book_feed, tick_feed)
+
+    m._on_ws_fail(tick_feed)
+    assert m.reconnects == 1 and not switched and m._books["BTC"].resets == 0
+
+    book_feed._ws = None
+    m._on_ws_fail(book_feed)  # nothing left live: books reset, REST takes over
+    assert switched == [1] and m._books["BTC"].resets == 1
+
+
+def test_connected_but_silent_feed_is_not_live():
+    silent = _feed("ws_pro", ["ticker", md.L2_CHANNEL], silent=md.FEED_SILENT_SEC + 1)
+    dead = _feed("ws_advanced", ["market_trades"], connected=False)
+    m, switched = _market(silent, dead)
+    assert silent.connected and not silent.live
+
+    m._on_ws_fail(dead)
+    assert switched == [1]
@@ -0,0 +1,109 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from atlasbot import http_client, metrics
+
+
+class FakeSession:
+    def __init__(self, fail=(), gate=None):
+        self.calls = []
+        self.fail = set(fail)
+        self.gate = gate
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        if self.gate is not None:
+            self.gate.wait(5)
+        if url in self.fail:
+            raise ConnectionError("refused")
+        return SimpleNamespace(ok=True, status_code=200)
+
+
+class _Hist:
+    def __init__(self):
+        self.seen = []
+
+    def labels(self, endpoint):
+        return SimpleNamespace(observe=lambda v: self.seen.append(endpoint))
+
+
+def test_endpoint_folds_the_product_id():
+    url = "https://api.exchange.coinbase.com/products/BTC-USD/book?level=2"
+    assert http_client.endpoint(url) == "api.exchange.coinbase.com/products/{}/book"
+    assert http_client.endpoint("https://api.exchange.coinbase.com/fees") == (
+        "api.exchange.coinbase.com/fees"
+    )
+
+
+def test_calls_share_one_session_and_are_timed(monkeypatch):
+    session = FakeSession(fail={"https://b.example/x"})
+    hist = _Hist()
+    monkeypatch.setattr(http_client, "_session", session)
+    monkeypatch.setattr(http_client, "_cache", {})
+    monkeypatch.setattr(metrics, "http_latency_seconds", hist)
+
+    http_client.get("https://a.example/products/ETH-USD/ticker", timeout=2)
+    http_client.post("https://a.example/orders", json={"side": "buy"})
+    assert [c[:2] for c in session.calls] == [
+        ("GET", "https://a.example/products/ETH-USD/ticker"),
+        ("POST", "https://a.example/orders"),
+    ]
+    assert session.calls[0][2] == {"timeout": 2}
+
+    assert http_client.prewarm(["https://a.example/orders", "https://b.example/x"]) == 1
+    assert hist.seen[:2] == ["a.example/products/{}/ticker", "a.example/orders"]
+    assert sorted(hist.seen[2:]) == ["a.example/orders", "b.example/x"]  # HEADs
+
+
+def test_identical_gets_coalesce_and_cache(monkeypatch):
+    gate = threading.Event()
+    session = FakeSession(gate=gate)
+    monkeypatch.setattr(http_client, "_session", session)
+    monkeypatch.setattr(http_client, "_cache", {})
+    monkeypatch.setattr(http_client, "coalesced", http_client.Counter())
+    monkeypatch.setattr(http_client, "cached", http_client.Counter())
+    url = "https://api.exchange.coinbase.com/products/BTC-USD/book?level=2"
+    ep = http_client.endpoint(url)
+    got = []
+    threads = [
+        threading.Thread(target=lambda: got.append(http_client.get(url)))
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + 5
+    while http_client.coalesced[ep] < 3 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(session.calls) == 1 and len(got) == 4
+    assert all(r is got[0] for r in got) and http_client.coalesced[ep] == 3
+
+    assert http_client.get(url) is got[0] and http_client.cached[ep] == 1
+    http_client.get(url, max_age=0)  # asks for a fresh book
+    http_client.get(url, params={"level": 1})  # a different request
+    assert len(session.calls) == 3
+
+
+def test_only_public_hosts_are_cached_and_expired_entries_go(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(http_client, "_session", session)
+    monkeypatch.setattr(http_client, "_cache", {})
+    private = "https://api.coinbase.com/api/v3/brokerage/orders"
+    for key in ("a", "b"):  # same URL and params, different credentials
+        http_client.get(private, headers={"Authorization": key})
+    assert len(session.calls) == 2 and not http_client._cache
+
+    url = "https://api.exchange.coinbase.com/products/BTC-USD/ticker"
+    http_client._cache["stale"] = (time.monotonic() - 60, None)
+    http_client.get(url)
+    assert list(http_client._cache) == [(url, None)]
+
+
+def test_token_bucket_paces_bursts():
+    bucket = http_client.TokenBucket(rate=10.0, burst=2)
+    waits = [bucket.take() for _ in range(4)]
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.05 < waits[2] <= 0.1 and 0.15 < waits[3] <= 0.2  # queued in order
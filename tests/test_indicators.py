@@ -0,0 +1,74 @@
+import importlib
+import math
+import random
+
+import atlasbot.utils as utils
+from atlasbot.bar_store import Bar, BarStore
+from atlasbot.indicators import Indicators
+
+mom = importlib.import_module("atlasbot.signals.momentum")
+bo = importlib.import_module("atlasbot.signals.breakout")
+
+
+class BarsOnly:
+    """Market without an indicator engine – the recompute-from-bars path."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def bar_window(self, _sym, n=None):
+        return self.store.window(n)
+
+    def wait_ready(self, _timeout=0):
+        return True
+
+
+def _walk(n, seed=3):
+    rng = random.Random(seed)
+    px = 100.0
+    for i in range(n):
+        o = px
+        c = round(o + rng.gauss(0, 0.3), 2)
+        h = round(max(o, c) + abs(rng.gauss(0, 0.1)), 2)
+        low = round(min(o, c) - abs(rng.gauss(0, 0.1)), 2)
+        yield Bar(60.0 * i, o, h, low, c, 1.0, 1)
+        if i % 50 == 7:  # warm-start merge: the newest bar is re-sent revised
+            yield Bar(60.0 * i, o, h + 0.5, low, round(c + 0.2, 2), 2.0, 2)
+            c = round(c + 0.2, 2)
+        px = c
+
+
+def _same(a, b):
+    return (math.isnan(a) and math.isnan(b)) or abs(a - b) < 1e-9
+
+
+def test_engine_matches_recompute(monkeypatch):
+    store = BarStore(500)
+    ref = BarsOnly(store)
+    monkeypatch.setattr(utils, "_get_md", lambda: ref)
+    monkeypatch.setattr(mom, "get_market", lambda *a: ref)
+    monkeypatch.setattr(bo, "get_market", lambda *a: ref)
+    ind = Indicators()
+    seen = {"breakout": set(), "momentum": 0}
+    for bar in _walk(400):
+        last = store.last()
+        if last is not None and last.ts == bar.ts:
+            store.replace_last(bar)
+        else:
+            store.append(bar)
+        ind.update(bar)
+        assert _same(ind.atr(), utils.calculate_atr("X"))
+        assert _same(ind.volatility(), utils.fetch_volatility("X"))
+        assert _same(ind.momentum(), mom.momentum("X"))
+        assert ind.breakout() == bo.breakout("X")
+        seen["breakout"].add(ind.breakout())
+        seen["momentum"] += ind.momentum() != 0.0
+    assert seen["breakout"] == {-1.0, 0.0, 1.0} and seen["momentum"]
+
+
+def test_wilder_and_seed():
+    bars = [Bar(60.0 * i, 10, 11, 9, 10, 1, 1) for i in range(40)]
+    ind = Indicators()
+    ind.seed(bars)
+    assert ind.atr() == 2.0 and ind.atr(wilder=True) == 2.0
+    assert ind.count == 40
@@ -1,20 +1,36 @@
 import os
 
+import pytest
+
 import atlasbot.market_data as md
+from atlasbot import http_client as http
 from atlasbot.config import SYMBOLS
 
 os.environ["USE_REAL_MD"] = "1"
 
 
-class FakeWS:
-    def run_forever(self, *a, **k):
-        raise md.websocket._exceptions.WebSocketBadStatusException("err", 403)
+@pytest.fixture(autouse=True)
+def _close_market():
+    """Stop each test's hub so its pollers cannot leak into later tests."""
+    yield
+    if md._market is not None:
+        md._market.close()
+    md._market = None
+    md.MarketData._instance = None
 
-    def close(self):
+
+class FakeWS:
+    def __init__(self, *a, **k):
         pass
 
+    async def __aenter__(self):
+        raise ConnectionError("403")
 
-def fake_get(url, timeout=5):
+    async def __aexit__(self, *exc):
+        return False
+
+
+def fake_get(url, timeout=5, **kw):
     class Resp:
         ok = True
 
@@ -29,10 +45,8 @@ def fake_get(url, timeout=5):
 def test_rest_fallback(monkeypatch):
     monkeypatch.setattr(md, "REST_POLL_INTERVAL", 0.01)
     monkeypatch.setattr(md, "SEED_TIMEOUT", 0.0)
-    monkeypatch.setattr(md.websocket, "WebSocketApp", lambda *a, **k: FakeWS())
-    import requests
-
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(md.websockets, "connect", FakeWS)
+    monkeypatch.setattr(http, "get", fake_get)
 
     md._market = None
 
@@ -40,3 +54,9 @@ def test_rest_fallback(monkeypatch):
     assert market.wait_ready(2)
     for sym in SYMBOLS:
         assert market.latest_trade(sym) == 100.0
+
+    snap = market.snapshot()
+    assert snap.symbols == tuple(SYMBOLS) and snap.price(SYMBOLS[0]) == 100.0
+    market._prices[SYMBOLS[0]] = 101.0
+    assert snap.price(SYMBOLS[0]) == 100.0  # frozen at capture
+    assert market.price_age(SYMBOLS[0]) < 60 and snap.ages[SYMBOLS[0]] < 60
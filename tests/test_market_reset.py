@@ -1,16 +1,32 @@
+import pytest
+
 import atlasbot.market_data as md
+from atlasbot import http_client as http
 from atlasbot.config import SYMBOLS
 
 
-class FakeWS:
-    def run_forever(self, *a, **k):
-        raise md.websocket._exceptions.WebSocketBadStatusException("err", 403)
+@pytest.fixture(autouse=True)
+def _close_market():
+    """Stop each test's hub so its pollers cannot leak into later tests."""
+    yield
+    if md._market is not None:
+        md._market.close()
+    md._market = None
+    md.MarketData._instance = None
+
 
-    def close(self):
+class FakeWS:
+    def __init__(self, *a, **k):
         pass
 
+    async def __aenter__(self):
+        raise ConnectionError("403")
+
+    async def __aexit__(self, *exc):
+        return False
 
-def fake_get(url, timeout=5):
+
+def fake_get(url, timeout=5, **kw):
     class Resp:
         ok = True
 
@@ -24,10 +40,8 @@ def fake_get(url, timeout=5):
 
 def test_market_instance_resets(monkeypatch):
     monkeypatch.setattr(md, "SEED_TIMEOUT", 0)
-    monkeypatch.setattr(md.websocket, "WebSocketApp", lambda *a, **k: FakeWS())
-    import requests
-
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(md.websockets, "connect", FakeWS)
+    monkeypatch.setattr(http, "get", fake_get)
     md._market = None
     m1 = md.get_market(SYMBOLS)
     assert m1.wait_ready(1)
@@ -0,0 +1,18 @@
+import asyncio
+
+import atlasbot.market_data as md
+
+
+def test_hub_records_lag_and_stops():
+    hub = md.MarketDataHub()
+
+    async def ticker():
+        while True:
+            await hub.sleep(0.01, "probe")
+
+    task = hub.spawn(ticker(), "probe")
+    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), hub.loop).result(2)
+    assert "probe" in hub.loop_lag()
+    assert hub.loop_lag()["probe"] >= 0.0
+    hub.stop()
+    assert task.cancelled() or task.done()
@@ -0,0 +1,30 @@
+from atlasbot.order_book import OrderBook
+
+
+def _book() -> OrderBook:
+    book = OrderBook("BTC-USD")
+    book.apply_snapshot(
+        bids=[["99.0", "1.0"], ["100.0", "2.0"], ["98.0", "1.0"]],
+        asks=[["101.0", "1.0"], ["102.0", "3.0"]],
+    )
+    return book
+
+
+def test_snapshot_sorted_levels():
+    book = _book()
+    assert book.best_bid() == 100.0
+    assert book.best_ask() == 101.0
+    assert book.depth(2) == [(100.0, 2.0), (99.0, 1.0), (101.0, 1.0), (102.0, 3.0)]
+    assert abs(book.spread_bps() - 1e4 / 100.5) < 1e-9
+    assert book.imbalance() == 0.0
+
+
+def test_l2update_changes_and_removals():
+    book = _book()
+    book.apply_changes([["buy", "100.5", "4.0"], ["sell", "101.0", "0"]])
+    assert book.best_bid() == 100.5
+    assert book.best_ask() == 102.0
+    assert book.imbalance(depth=1) == (4.0 - 3.0) / 7.0
+    book.reset()
+    book.apply_changes([["buy", "100.7", "1.0"]])  # ignored until resynced
+    assert book.best_bid() is None and not book.synced
@@ -0,0 +1,128 @@
+import atlasbot.config as cfg
+import atlasbot.trader as tr
+from atlasbot import clock, metrics
+from atlasbot import order_manager as om
+from atlasbot.execution.base import Fill
+from atlasbot.snapshot import MarketSnapshot
+
+
+class MakerExec:
+    """Maker posts fill *maker_share* of what is asked; market orders fill all."""
+
+    def __init__(self, maker_share=0.0):
+        self.maker_share = maker_share
+        self.calls = []
+
+    def submit_maker_order(self, side: str, size_usd: float, symbol: str):
+        self.calls.append(("maker", clock.now(), size_usd, symbol))
+        if self.maker_share:
+            return Fill("m", size_usd * self.maker_share / 100.0, 100.0)
+        return None
+
+    def submit_order(self, side: str, size_usd: float, symbol: str):
+        self.calls.append(("taker", clock.now(), size_usd, symbol))
+        return Fill("t", size_usd / 100.0, 100.0)
+
+
+class _Hist:
+    def __init__(self):
+        self.seen = []
+
+    def labels(self, *labels):
+        return _Labelled(self.seen, labels)
+
+    def observe(self, v):
+        self.seen.append(((), v))
+
+
+class _Labelled:
+    def __init__(self, seen, labels):
+        self.seen, self.labels = seen, labels
+
+    def observe(self, v):
+        self.seen.append((self.labels, v))
+
+
+def test_maker_escalates_to_taker_on_timers(monkeypatch):
+    vc = clock.VirtualClock(0.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    fill_h, state_h = _Hist(), _Hist()
+    monkeypatch.setattr(metrics, "order_fill_seconds", fill_h)
+    monkeypatch.setattr(metrics, "order_state_seconds", state_h)
+    ex = MakerExec()
+    mgr = om.OrderManager(maker_tries=3, retry_sec=1.0)
+    done = []
+    orders = [mgr.submit(s, "buy", 100.0, ex, on_done=done.append) for s in ("A", "B")]
+    assert [o.state for o in orders] == [om.WORKING, om.WORKING] and vc.now() == 0.0
+    assert len(mgr.working()) == 2 and mgr.working("A") == orders[:1]
+
+    for t in (0.5, 1.0, 2.0, 3.0):
+        vc.advance_to(t)
+        mgr.poll()
+    assert [(c[0], c[1]) for c in ex.calls if c[3] == "A"] == [
+        ("maker", 0.0),
+        ("maker", 1.0),
+        ("maker", 2.0),
+        ("taker", 3.0),
+    ]
+    assert done == orders and all(o.state == om.FILLED for o in orders)
+    assert not mgr and mgr.next_due() is None
+    assert fill_h.seen == [((), 3.0), ((), 3.0)]
+    assert (("new",), 0.0) in state_h.seen and (("working",), 3.0) in state_h.seen
+
+
+def test_partial_fill_and_expiry(monkeypatch):
+    monkeypatch.setattr(clock, "_clock", clock.VirtualClock(0.0))
+    mgr = om.OrderManager(maker_tries=2, retry_sec=1.0)
+    ex = MakerExec(maker_share=0.5)
+    order = mgr.submit("A", "sell", 100.0, ex)
+    assert order.state == om.PARTIAL and order.remaining_usd == 50.0
+    mgr.run(order)
+    assert order.state == om.FILLED and order.qty == 1.0
+    assert [c[2] for c in ex.calls] == [100.0, 50.0, 25.0]  # maker, maker, taker
+
+    order = mgr.submit("A", "sell", 100.0, MakerExec(), taker=False)
+    mgr.run(order)
+    assert order.state == om.EXPIRED and not order.qty and clock.now() == 4.0
+
+    order = mgr.submit("B", "buy", 100.0, MakerExec())
+    assert mgr.cancel(order.id) and order.state == om.CANCELLED
+    assert not mgr.cancel(order.id) and mgr.poll() == []
+
+
+def test_run_cycle_does_not_wait_for_maker_fills(monkeypatch):
+    vc = clock.VirtualClock(0.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    monkeypatch.setattr(cfg, "SYMBOLS", ["BTC-USD"])
+    monkeypatch.setattr(cfg, "EXECUTION_MODE", "maker")
+    snap = MarketSnapshot.of({"BTC-USD": 100.0}, {"BTC-USD": 1})
+    monkeypatch.setattr(tr, "market_snapshot", lambda syms: snap)
+    monkeypatch.setattr(tr, "calculate_atr", lambda s: 1.0)
+    monkeypatch.setattr(tr.risk, "check_risk_batch", lambda o: [True] * len(o))
+    ex = MakerExec()
+    monkeypatch.setattr(tr, "get_backend", lambda name=None: ex)
+
+    class Engine:
+        def next_advice(self, symbol, snap=None):
+            rationale = {"orderflow": 0.5, "momentum": 0.5, "macro": 0.0}
+            return {
+                "bias": "long",
+                "edge": 0.05,
+                "confidence": 1.0,
+                "rationale": rationale,
+            }
+
+    bot = tr.IntradayTrader(decision_engine=Engine(), backend="sim")
+    bot.run_cycle()
+    assert vc.now() == 0.0 and len(bot.orders) == 1
+    bot.run_cycle()  # still working: not entered twice
+    assert [c[0] for c in ex.calls] == ["maker"]
+
+    vc.advance_to(3.0)
+    bot.run_cycle()  # the overdue 1s retry fires now, the next one is 1s on
+    vc.advance_to(5.0)
+    bot.run_cycle()
+    vc.advance_to(6.0)
+    bot.run_cycle()
+    assert [c[0] for c in ex.calls] == ["maker", "maker", "maker", "taker"]
+    assert bot.positions.holds("BTC-USD") and not bot.orders
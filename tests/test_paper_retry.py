@@ -23,7 +23,7 @@ def test_paper_order_ok(monkeypatch):
     monkeypatch.setenv("COINBASE_PAPER_KEY", "x")
     monkeypatch.setattr(paper, "fetch_price", lambda s: 100.0)
     monkeypatch.setattr(
-        paper.requests,
+        paper.http,
         "post",
         lambda *a, **k: FakeResp(
             200, {"order_id": "ok", "average_filled_price": "100", "filled_size": "1"}
@@ -43,7 +43,7 @@ def test_paper_order_fail(monkeypatch):
         calls.append(1)
         return FakeResp(500)
 
-    monkeypatch.setattr(paper.requests, "post", bad_post)
+    monkeypatch.setattr(paper.http, "post", bad_post)
     monkeypatch.setattr(paper.time, "sleep", lambda s: None)
     fill = paper.submit_order("buy", 100, "BTC-USD")
     assert fill.order_id == "paper-error"
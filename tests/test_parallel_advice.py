@@ -0,0 +1,52 @@
+import importlib
+import random
+import time
+import types
+
+import atlasbot.decision_engine as de
+from atlasbot.bar_store import Bar
+from atlasbot.indicators import Indicators
+
+mom = importlib.import_module("atlasbot.signals.momentum")
+bo = importlib.import_module("atlasbot.signals.breakout")
+
+
+def _engine(seed):
+    rng = random.Random(seed)
+    ind, px = Indicators(), 100.0
+    for i in range(40):
+        c = px + rng.gauss(0, 0.5)
+        ind.update(Bar(60.0 * i, px, max(px, c) + 0.1, min(px, c) - 0.1, c, 1, 1))
+        px = c
+    return ind
+
+
+def test_next_advice_many_matches_sequential(monkeypatch):
+    symbols = [f"S{i}-USD" for i in range(40)]
+    rows = {s: i for i, s in enumerate(symbols)}
+    engines = {s: _engine(i) for s, i in rows.items()}
+    md = types.SimpleNamespace(indicators=engines.__getitem__)
+    for mod in (mom, bo):
+        monkeypatch.setattr(mod, "get_market", lambda *a: md)
+
+    def imbalance(sym):
+        time.sleep(0)  # yield so workers interleave mid-decision
+        return (rows[sym] % 7 - 3) / 3
+
+    monkeypatch.setattr(de, "imbalance", imbalance)
+    monkeypatch.setattr(de, "macro_bias", lambda s: 0.1)
+    monkeypatch.setattr(de, "fetch_price", lambda s: 50.0 + rows[s])
+    monkeypatch.setattr(de, "get_spread_bps", lambda s: 0.5 * (rows[s] % 4))
+    monkeypatch.setattr(de, "log_decision", lambda rec: None)
+    monkeypatch.setattr(de, "_states", {})
+    rng = random.Random(1)
+    for sym, i in rows.items():
+        for t in range(30):
+            de.symbol_state(sym).update(50.0 + i + rng.gauss(0, 0.05 * (i + 1)), t)
+
+    engine = de.DecisionEngine()
+    engine._last_adapt = float("inf")
+    sequential = {sym: engine.next_advice(sym) for sym in symbols}
+    assert len({a["edge"] for a in sequential.values()}) > 10
+    for _ in range(25):
+        assert engine.next_advice_many(symbols, workers=8) == sequential
@@ -0,0 +1,54 @@
+import atlasbot.config as cfg
+from atlasbot import clock, metrics
+from atlasbot.position_manager import PositionManager
+
+
+class DummyExec:
+    def __init__(self, fail=()):
+        self.calls = []
+        self.fail = set(fail)
+
+    def submit_order(self, side: str, size_usd: float, symbol: str):
+        if symbol in self.fail:
+            self.fail.discard(symbol)
+            raise RuntimeError("rejected")
+        self.calls.append((side, size_usd, symbol))
+
+
+def _count(name):
+    return getattr(metrics, name)._value.get()
+
+
+def test_exits_many_positions_in_one_check(monkeypatch):
+    vc = clock.VirtualClock(0.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    monkeypatch.setattr(cfg, "K_TP", 2.0)
+    monkeypatch.setattr(cfg, "K_SL", 2.0)
+    monkeypatch.setattr(cfg, "MAX_HOLD_MIN", 10)
+    pm = PositionManager()
+    pm.open("A-USD", "buy", 1.0, 100.0, 1.0)  # tp 102, sl 98
+    pm.open("B-USD", "sell", 2.0, 50.0, 1.0)  # tp 48, sl 52
+    pm.open("C-USD", "buy", 1.0, 10.0, 1.0)
+    pm.open("D-USD", "buy", 1.0, 10.0, 1.0)
+    before = [_count(f"exit_{r}_total") for r in ("tp", "sl", "timeout")]
+
+    ex = DummyExec()
+    prices = {"A-USD": 101.0, "B-USD": 51.0, "C-USD": 10.0, "D-USD": 10.0}
+    assert pm.check(prices, ex) == [] and len(pm) == 4
+    prices.update({"A-USD": 102.5, "B-USD": 52.0})
+    assert pm.check(prices, ex) == [("A-USD", "tp"), ("B-USD", "sl")]
+    assert ex.calls == [("sell", 102.5, "A-USD"), ("buy", 104.0, "B-USD")]
+
+    vc.advance_to(600.0)
+    assert pm.check({"C-USD": 10.5}, ex) == [("C-USD", "timeout"), ("D-USD", "timeout")]
+    assert ex.calls[-1] == ("sell", 10.0, "D-USD")  # last seen price
+    after = [_count(f"exit_{r}_total") for r in ("tp", "sl", "timeout")]
+    assert [a - b for a, b in zip(after, before)] == [1, 1, 2]
+
+
+def test_failed_exit_stays_open():
+    pm = PositionManager()
+    pm.open("A-USD", "buy", 1.0, 100.0, 1.0)
+    ex = DummyExec(fail={"A-USD"})
+    assert pm.on_price("A-USD", 200.0, ex) is None and pm.holds("A-USD")
+    assert pm.on_price("A-USD", 200.0, ex) == "tp" and not pm.holds("A-USD")
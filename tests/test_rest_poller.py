@@ -0,0 +1,83 @@
+import asyncio
+import threading
+import time
+
+import atlasbot.market_data as md
+from atlasbot import http_client as http
+
+
+class Hub:
+    """Runs the poller for *rounds* rounds, then leaves REST mode."""
+
+    def __init__(self, market, rounds):
+        self.market = market
+        self.rounds = rounds
+        self.delays = []
+
+    async def sleep(self, delay, conn="hub"):
+        self.delays.append(delay)
+        if len(self.delays) >= self.rounds:
+            self.market.mode = "websocket"
+        await asyncio.sleep(delay)
+
+
+def _market(symbols):
+    m = object.__new__(md.MarketData)
+    m._symbols = symbols
+    m._prices, m._price_ts, m._rest_ts = {}, {}, {}
+    m._last_update = 0.0
+    m.mode = "rest"
+    m.trades = []
+    m._on_trade = lambda sym, ts, price: m.trades.append(sym)
+    return m
+
+
+def test_round_takes_the_slowest_request_and_held_symbols_poll_faster(monkeypatch):
+    symbols = [f"S{i}-USD" for i in range(8)]
+    lock = threading.Lock()
+    inflight, peak, calls = [0], [0], []
+
+    def slow_get(url, timeout=5):
+        sym = url.split("/")[-2]
+        with lock:
+            calls.append(sym)
+            inflight[0] += 1
+            peak[0] = max(peak[0], inflight[0])
+        time.sleep(0.2)
+        with lock:
+            inflight[0] -= 1
+
+        class Resp:
+            ok = True
+
+            def json(self):
+                return {"price": "100"}
+
+        return Resp()
+
+    monkeypatch.setattr(http, "get", slow_get)
+    monkeypatch.setattr(md, "REST_CONCURRENCY", 4)
+    monkeypatch.setattr(md, "REST_POLL_INTERVAL", 60)
+    monkeypatch.setattr(md, "REST_HOT_INTERVAL", 0.05)
+    monkeypatch.setattr(md, "_held", lambda syms: {"S3-USD"} & set(syms))
+    m = _market(symbols)
+    m._hub = Hub(m, rounds=2)
+
+    t0 = time.monotonic()
+    asyncio.run(m._rest_poller())
+    elapsed = time.monotonic() - t0
+
+    assert peak[0] == 4  # bounded window
+    assert elapsed < 8 * 0.2  # two windows of four plus the hot re-poll
+    assert sorted(calls[:8]) == symbols and calls[8:] == ["S3-USD"]
+    assert m._prices == dict.fromkeys(symbols, 100.0)
+    assert set(m.rest_ages()) == set(symbols) and m.rest_age("S3-USD") < 1.0
+    assert m.rest_age("NEW-USD") == float("inf")
+
+
+def test_held_does_not_wait_for_the_risk_lock(monkeypatch):
+    from atlasbot import risk
+
+    monkeypatch.setattr(risk._risk, "lots", {"A-USD": [(1.0, 10.0)], "B-USD": []})
+    with risk._risk._lock:  # a fill being booked on another thread
+        assert md._held(["A-USD", "B-USD", "C-USD"]) == {"A-USD"}
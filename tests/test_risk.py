@@ -9,3 +9,12 @@ def test_limits(monkeypatch):
     order = {"symbol": "BTC-USD", "side": "buy", "size_usd": 600}
     assert not risk.check_risk(order)
     risk.record_fill("BTC-USD", "sell", 500, 100, 0.0, 0.0)
+
+
+def test_annotate_trade_by_order_id():
+    risk.record_fill("BTC-USD", "buy", 100, 100, 0.0, 0.0, order_id="entry-1")
+    risk.record_fill("ETH-USD", "sell", 100, 10, 0.0, 0.0, order_id="exit-1")
+    assert risk.annotate_trade("entry-1", signals={"momentum": 0.5})
+    entry, exit_ = risk.last_fills(2)
+    assert entry["signals"] == {"momentum": 0.5} and "signals" not in exit_
+    assert not risk.annotate_trade("unknown", ret=0.0)
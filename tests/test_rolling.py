@@ -0,0 +1,70 @@
+import random
+from collections import deque
+
+import atlasbot.decision_engine as de
+from atlasbot import clock, rolling
+from atlasbot.rolling import RollingMean, RollingStats
+
+
+def _zscore(seq):
+    if len(seq) < 2:
+        return 0.0
+    mean = sum(seq) / len(seq)
+    std = (sum((x - mean) ** 2 for x in seq) / len(seq)) ** 0.5
+    return 0.0 if std == 0 else (seq[-1] - mean) / std
+
+
+def _std(seq):
+    if len(seq) < 2:
+        return 0.0
+    mean = sum(seq) / len(seq)
+    return (sum((x - mean) ** 2 for x in seq) / len(seq)) ** 0.5
+
+
+def test_hybrid_signal_and_vol_match_list_recompute(monkeypatch):
+    vc = clock.VirtualClock(1_000.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    monkeypatch.setattr(rolling, "RESYNC_EVERY", 97)
+    monkeypatch.setattr(de, "_states", {})
+    rng = random.Random(7)
+    px = {"price": 30_000.0}
+    monkeypatch.setattr(de, "fetch_price", lambda sym: px["price"])
+
+    window, ticks = deque(), deque(maxlen=10)
+    for i in range(3_000):
+        vc.advance_to(vc.now() + rng.choice((0.2, 0.5, 1.0, 1.0, 3.0)))
+        if i % 400 < 40:  # flat stretches exercise the zero-variance guard
+            px["price"] = round(px["price"], 0)
+        else:
+            px["price"] = round(px["price"] * (1 + rng.gauss(0, 3e-4)), 2)
+        price, now = px["price"], vc.now()
+
+        ticks.append(price)
+        window.append((now, price))
+        while window and now - window[0][0] > 30:
+            window.popleft()
+        prices = [p for _, p in window]
+        avg = sum(ticks) / len(ticks)
+        want = max(-1.0, min(1.0, _zscore(prices) - (price - avg) / avg))
+
+        got = de.hybrid_signal("BTC-USD")
+        assert abs(got - want) < 1e-6
+        vol = de.vol_window_std(symbol="BTC-USD")
+        assert abs(vol - _std(prices[-30:])) < 1e-6 * max(vol, 1.0)
+        assert de.vol_window_std(10, symbol="BTC-USD") == _std(prices[-10:])
+
+
+def test_welford_eviction_and_resync():
+    stats = RollingStats(maxlen=5)
+    for x in (1, 2, 3, 4, 5, 6, 7):
+        stats.push(x)
+    assert len(stats) == 5 and stats.mean == 5.0
+    assert abs(stats.variance() - 2.0) < 1e-12
+    for _ in range(5):
+        stats.push(9.0)
+    assert stats.std() == 0.0 and stats.zscore() == 0.0
+
+    mean = RollingMean(3)
+    for x in (1.0, 2.0, 3.0, 10.0):
+        mean.push(x)
+    assert mean.mean() == 5.0
@@ -0,0 +1,99 @@
+import pytest
+
+import atlasbot.decision_engine as de
+from atlasbot import clock
+from atlasbot.signals import registry
+
+
+@pytest.fixture()
+def engine(monkeypatch):
+    calls = []
+
+    def spy(name, v):
+        def fn(sym):
+            calls.append(name)
+            return v
+
+        return fn
+
+    for name, v in (("imbalance", 1.0), ("momentum", 1.0), ("macro_bias", 1.0)):
+        monkeypatch.setattr(de, name, spy(name, v))
+    monkeypatch.setattr(de, "breakout", spy("breakout", 0.0))
+    monkeypatch.setattr(de, "fetch_price", lambda s: 100.0)
+    monkeypatch.setattr(de, "get_spread_bps", lambda s: 1.0)
+    monkeypatch.setattr(de, "log_decision", lambda rec: None)
+    monkeypatch.setattr(de, "_states", {})
+    for t, px in enumerate((100.0, 101.0, 99.0, 102.0)):
+        de.symbol_state("BTC-USD").update(px, t)
+    eng = de.DecisionEngine()
+    eng._last_adapt = float("inf")
+    return eng, calls
+
+
+def test_plugin_signal_joins_the_ensemble(engine, monkeypatch):
+    eng, calls = engine
+    registry.register("funding", lambda s: -1.0, weight=0.5, cost=2.0)
+    try:
+        adv = eng.next_advice("BTC-USD")
+        assert adv["rationale"]["funding"] == -1.0
+        assert calls[-1] == "macro_bias"  # most expensive runs last
+    finally:
+        registry.unregister("funding")
+
+
+def test_decision_log_matches_baseline_when_gain_is_zero(engine, monkeypatch):
+    eng, calls = engine
+    monkeypatch.setattr(de, "_states", {})  # no price std -> gain is 0
+    logged = []
+    monkeypatch.setattr(de, "log_decision", logged.append)
+    adv = eng.next_advice("BTC-USD")
+    w = eng.weights
+    score = w["orderflow"] + w["momentum"] + w["macro"]  # breakout reads 0.0
+    assert sorted(calls) == ["breakout", "imbalance", "macro_bias", "momentum"]
+    assert adv["bias"] == "flat" and abs(adv["confidence"] - score) < 1e-12
+    assert adv["rationale"] == {
+        "orderflow": 1.0,
+        "momentum": 1.0,
+        "macro": 1.0,
+        "breakout": 0.0,
+    }
+    (rec,) = logged
+    assert rec["side"] == "long" and abs(rec["score"] - score) < 1e-12
+    assert rec["edge_bps"] == de.expected_edge_bps(score, 100.0, 1.0, "BTC-USD")
+
+
+def test_zero_weight_signal_is_not_evaluated(engine):
+    eng, calls = engine
+    eng.weights = {**eng.weights, "macro": 0.0}
+    before = registry.skips[("macro", "weight")]
+    adv = eng.next_advice("BTC-USD")
+    assert "macro_bias" not in calls and adv["rationale"]["macro"] == 0.0
+    assert adv["bias"] == "long"
+    assert registry.skips[("macro", "weight")] == before + 1
+
+
+def test_in_place_weight_edit_replans(engine):
+    eng, calls = engine
+    eng.next_advice("BTC-USD")
+    eng.weights["macro"] = 0.0  # same dict object: the plan must still change
+    calls.clear()
+    eng.next_advice("BTC-USD")
+    assert "macro_bias" not in calls
+
+
+def test_refresh_cadence(monkeypatch):
+    vc = clock.VirtualClock(0.0)
+    monkeypatch.setattr(clock, "_clock", vc)
+    seen = []
+    sig = registry.register(
+        "slow", lambda s: seen.append(s) or float(len(seen)), refresh_sec=10.0
+    )
+    try:
+        assert registry.value(sig, "X") == 1.0
+        vc.advance_to(9.0)
+        assert registry.value(sig, "X") == 1.0
+        vc.advance_to(10.0)
+        assert registry.value(sig, "X") == 2.0
+        assert registry.evals["slow"] == 2
+    finally:
+        registry.unregister("slow")
@@ -2,6 +2,7 @@ import importlib
 from collections import deque
 
 import atlasbot.signals.orderflow as of
+from atlasbot.bar_store import BarStore
 
 mom = importlib.import_module("atlasbot.signals.momentum")
 
@@ -10,6 +11,9 @@ class FakeMarket:
     def minute_bars(self, _):
         return deque([(1, 2, 0, 1)] * 20)
 
+    def bar_window(self, _, n=None):
+        return BarStore.from_bars(self.minute_bars(_)).window(n)
+
 
 def test_imbalance_range(monkeypatch):
     monkeypatch.setattr(of, "_orderflow", of.OrderFlow([]))
@@ -2,7 +2,9 @@ import pytest
 
 import atlasbot.config as cfg
 import atlasbot.trader as tr
+from atlasbot.bar_store import BarStore
 from atlasbot.execution.base import Fill
+from atlasbot.snapshot import MarketSnapshot
 
 
 class DummyExec:
@@ -18,6 +20,9 @@ class DummyMarket:
     def minute_bars(self, symbol: str) -> list[tuple[int, int, int, int]]:
         return [(1, 1, 1, 1)] * 60
 
+    def bar_window(self, symbol: str, n: int | None = None):
+        return BarStore.from_bars(self.minute_bars(symbol)).window(n)
+
 
 def _setup_bot(
     monkeypatch: "pytest.MonkeyPatch",
@@ -33,9 +38,17 @@ def _setup_bot(
     import atlasbot.decision_engine as de_mod
 
     de_mod = _importlib.reload(de_mod)
-    monkeypatch.setattr(tr, "fetch_price", lambda s: 100.0)
+    monkeypatch.setattr(
+        tr,
+        "market_snapshot",
+        lambda syms: MarketSnapshot.of(
+            dict.fromkeys(syms, 100.0), dict.fromkeys(syms, 8)
+        ),
+    )
     monkeypatch.setattr(tr, "calculate_atr", lambda s: 1.0)
-    monkeypatch.setattr(tr.risk, "check_risk", lambda order: True)
+    monkeypatch.setattr(
+        tr.risk, "check_risk_batch", lambda orders: [True] * len(orders)
+    )
     dummy = DummyExec()
     monkeypatch.setattr(tr, "get_backend", lambda name=None: dummy)
     dummy_market = DummyMarket()
@@ -0,0 +1,59 @@
+import random
+
+from atlasbot.tick_recorder import (
+    DAY,
+    TickRecorder,
+    decode_blocks,
+    encode_block,
+    read_segment,
+    segments,
+)
+from atlasbot.ws_decode import Tick
+
+SYMS = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+
+def _stream(n, t0=1_700_000_000.0):
+    rng = random.Random(7)
+    px = {"BTC-USD": 64000.01, "ETH-USD": 3100.55, "SOL-USD": 145.123}
+    out = []
+    for i in range(n):
+        sym = SYMS[i % 3]
+        px[sym] = round(px[sym] + rng.choice((-0.01, 0.0, 0.01)), 8)
+        p = px[sym]
+        ts = t0 + i * 0.05
+        size = round(rng.random(), 8)
+        bid, ask = round(p - 0.01, 8), round(p + 0.01, 8)
+        out.append((100.0 + i * 0.05, Tick(sym, p, size, ts, bid, ask, 0)))
+    return out
+
+
+def test_block_roundtrip_is_lossless_and_compact():
+    ticks = _stream(3_000)
+    blob = encode_block(ticks)
+    back = list(decode_blocks(blob))
+    assert len(back) == len(ticks)
+    for (r0, t0), (r1, t1) in zip(ticks, back):
+        assert abs(r0 - r1) < 1e-6 and abs(t0.ts - t1.ts) < 1e-6
+        assert (t0.symbol, t0.price, t0.size) == (t1.symbol, t1.price, t1.size)
+        assert (t0.bid, t0.ask) == (t1.bid, t1.ask)
+    assert len(blob) / len(ticks) < 20
+
+
+def test_torn_tail_is_skipped():
+    ticks = _stream(10)
+    blob = encode_block(ticks[:5]) + encode_block(ticks[5:])
+    assert len(list(decode_blocks(blob[:-3]))) == 5
+
+
+def test_recorder_writes_daily_segments(tmp_path):
+    rec = TickRecorder(tmp_path, flush_sec=0.05)
+    ticks = _stream(6, t0=3 * DAY - 0.15)  # crosses midnight UTC
+    for recv, tick in ticks:
+        rec.record(tick, recv)
+    rec.close()
+    files = segments(tmp_path)
+    assert [f.name for f in files] == ["ticks-1970-01-03.atk", "ticks-1970-01-04.atk"]
+    got = [t for f in files for _, t in read_segment(f)]
+    assert [t.price for t in got] == [t.price for _, t in ticks]
+    assert rec.written == 6
@@ -3,6 +3,7 @@ from types import SimpleNamespace
 import atlasbot.config as cfg
 import atlasbot.trader as tr
 from atlasbot.execution.base import Fill
+from atlasbot.snapshot import MarketSnapshot
 
 
 class DummyExec:
@@ -18,17 +19,24 @@ class DummyEngine:
     def __init__(self, advice):
         self._advice = advice
 
-    def next_advice(self, _):
+    def next_advice(self, _, snap=None):
         return self._advice
 
 
 def _setup(monkeypatch, advice):
     monkeypatch.setattr(tr, "SYMBOLS", ["BTC-USD"])
     monkeypatch.setattr(cfg, "SYMBOLS", ["BTC-USD"])
-    monkeypatch.setattr(tr, "fetch_price", lambda s: 100.0)
+    monkeypatch.setattr(
+        tr,
+        "market_snapshot",
+        lambda syms: MarketSnapshot.of(
+            dict.fromkeys(syms, 100.0), dict.fromkeys(syms, 8)
+        ),
+    )
     monkeypatch.setattr(tr, "calculate_atr", lambda s: 1.0)
-    monkeypatch.setattr(tr.risk, "check_risk", lambda order: True)
-    monkeypatch.setattr(tr.IntradayTrader, "_exit_position", lambda *a, **k: None)
+    monkeypatch.setattr(
+        tr.risk, "check_risk_batch", lambda orders: [True] * len(orders)
+    )
     dummy_market = SimpleNamespace(
         minute_bars=lambda s: [(1, 1, 1, 1)] * 60,
         wait_ready=lambda t=0: True,
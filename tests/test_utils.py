@@ -5,6 +5,7 @@ import atlasbot.utils as utils
 
 def test_ensure_ready_ci(monkeypatch, caplog):
     monkeypatch.setenv("CI", "true")
+    monkeypatch.setattr(utils, "_ready_md", None)  # un-latch
     caplog.set_level("WARNING")
     utils._ensure_ready()
     assert any("skipping market-data" in rec.message for rec in caplog.records)
@@ -25,3 +26,31 @@ def test_ensure_ready_retries(monkeypatch):
     with pytest.raises(RuntimeError):
         utils._ensure_ready(0)
     assert len(calls) == 3
+
+
+def test_ready_latch_and_stale_price(monkeypatch):
+    waits = []
+
+    class Market:
+        mode = "test"
+
+        def wait_ready(self, timeout=15):
+            waits.append(timeout)
+            return True
+
+        def latest_trade(self, sym):
+            return 100.0
+
+        def price_age(self, sym):
+            return 90.0
+
+    monkeypatch.setenv("CI", "false")
+    market = Market()
+    monkeypatch.setattr(utils, "_md", market)
+    monkeypatch.setattr(utils, "_get_md", lambda: market)
+    assert [utils.fetch_price("BTC-USD") for _ in range(3)] == [100.0] * 3
+    assert len(waits) == 1  # latched after the first successful wait
+    assert utils.fetch_price("BTC-USD", max_age=120) == 100.0
+    with pytest.raises(utils.StalePrice) as err:
+        utils.fetch_price("BTC-USD", max_age=60)
+    assert err.value.age == 90.0 and isinstance(err.value, RuntimeError)
@@ -1,20 +1,36 @@
 import os
 
+import pytest
+
 import atlasbot.market_data as md
+from atlasbot import http_client as http
 from atlasbot.config import SYMBOLS
 
 os.environ["USE_REAL_MD"] = "1"
 
 
-class FakeWS:
-    def run_forever(self, *a, **k):
-        raise md.websocket._exceptions.WebSocketBadStatusException("err", 403)
+@pytest.fixture(autouse=True)
+def _close_market():
+    """Stop each test's hub so its pollers cannot leak into later tests."""
+    yield
+    if md._market is not None:
+        md._market.close()
+    md._market = None
+    md.MarketData._instance = None
 
-    def close(self):
+
+class FakeWS:
+    def __init__(self, *a, **k):
         pass
 
+    async def __aenter__(self):
+        raise ConnectionError("403")
 
-def fake_get(url, timeout=5):
+    async def __aexit__(self, *exc):
+        return False
+
+
+def fake_get(url, timeout=5, **kw):
     class Resp:
         ok = True
 
@@ -27,11 +43,35 @@ def fake_get(url, timeout=5):
 
 
 def test_warm_start(monkeypatch):
-    monkeypatch.setattr(md.websocket, "WebSocketApp", lambda *a, **k: FakeWS())
+    monkeypatch.setattr(md.websockets, "connect", FakeWS)
     monkeypatch.setattr(md, "SEED_TIMEOUT", 0)
-    import requests
-
-    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(http, "get", fake_get)
     md._market = None
     market = md.get_market(SYMBOLS)
     assert market.wait_ready(2)
+
+
+def test_failed_tail_fetch_keeps_cached_history(monkeypatch, tmp_path):
+    import time
+
+    from atlasbot.candle_cache import CandleCache
+
+    now = time.time()
+    base = now - now % 60 - 600
+    cache = CandleCache(tmp_path)
+    for sym in SYMBOLS:
+        cache.append(sym, [(base + 60 * i, 1, 3, 2, 2.5, 1) for i in range(5)])
+
+    def failing_get(url, timeout=5, **kw):
+        if "candles" in url:
+            raise ConnectionError("timed out")
+        return fake_get(url, timeout)
+
+    monkeypatch.setattr(md, "CandleCache", lambda keep: CandleCache(tmp_path, keep))
+    monkeypatch.setattr(md.websockets, "connect", FakeWS)
+    monkeypatch.setattr(md, "SEED_TIMEOUT", 0)
+    monkeypatch.setattr(http, "get", failing_get)
+    md._market = None
+    market = md.get_market(SYMBOLS)
+    assert market.warmup_complete
+    assert all(len(market.minute_bars(s)) == 5 for s in SYMBOLS)
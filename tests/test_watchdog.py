@@ -1,4 +1,6 @@
 import importlib
+import threading
+import time
 
 import atlasbot.metrics as metrics_mod
 
@@ -6,27 +8,55 @@ import atlasbot.metrics as metrics_mod
 class DummyMarket:
     def __init__(self):
         self._symbols = ["BTC-USD"]
+        self.priced = []
+
+    def _on_rest_price(self, sym, price, ts=None):
+        self.priced.append((sym, price, ts))
 
     def feed_latency(self):
         return 130.0
 
 
-def test_watchdog(monkeypatch):
-    metrics = importlib.reload(metrics_mod)
-    dummy = DummyMarket()
-    monkeypatch.setattr(metrics, "get_market", lambda: dummy)
+def fake_get(url, timeout=5):
+    class Resp:
+        ok = True
 
-    def fake_get(url, timeout=5):
-        class Resp:
-            ok = True
+        def json(self):
+            return {"price": "101", "time": "2025-05-30T00:00:01Z"}
 
-            def json(self):
-                return {"price": "101"}
+    return Resp()
 
-        return Resp()
 
-    monkeypatch.setattr(metrics.requests, "get", fake_get)
+def test_watchdog(monkeypatch):
+    metrics = importlib.reload(metrics_mod)
+    dummy = DummyMarket()
+    monkeypatch.setattr(metrics, "get_market", lambda: dummy)
+    monkeypatch.setattr(metrics.http, "get", fake_get)
     before = metrics.feed_watchdog_total._value.get()
     metrics.feed_watchdog_check()
     after = metrics.feed_watchdog_total._value.get()
     assert after == before + 1
+    # priced like a REST poll, so the price age and bars see it too
+    assert dummy.priced == [("BTC-USD", 101.0, "2025-05-30T00:00:01Z")]
+
+
+def test_watchdog_prices_on_the_hub(monkeypatch):
+    import atlasbot.market_data as md
+
+    hub = md.MarketDataHub("WatchdogHub")
+    try:
+        dummy = DummyMarket()
+        dummy._hub = hub
+        threads = []
+        dummy._on_rest_price = lambda *a: threads.append(
+            (a, threading.current_thread().name)
+        )
+        monkeypatch.setattr(metrics_mod, "get_market", lambda: dummy)
+        monkeypatch.setattr(metrics_mod.http, "get", fake_get)
+        metrics_mod._refresh_prices(dummy._symbols)
+        deadline = time.monotonic() + 2
+        while not threads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert threads == [(("BTC-USD", 101.0, "2025-05-30T00:00:01Z"), "WatchdogHub")]
+    finally:
+        hub.stop()
@@ -0,0 +1,43 @@
+import json
+
+import atlasbot.ws_decode as wd
+
+TICKER = json.dumps(
+    {
+        "type": "ticker",
+        "sequence": 7,
+        "product_id": "BTC-USD",
+        "price": "100.5",
+        "best_bid": "100.4",
+        "best_ask": "100.6",
+        "time": "2025-05-30T00:00:01Z",
+        "last_size": "0.25",
+    }
+)
+
+
+def test_sniff_type_without_parsing():
+    assert wd.sniff_type(TICKER) == "ticker"
+    assert wd.sniff_type(b'{"type": "heartbeat","x":1}') == "heartbeat"
+    assert wd.sniff_type("not json") == ""
+    frame = '{"channel":"ticker","events":[{"type":"update","tickers":[]}]}'
+    assert wd.sniff_channel(frame) == "ticker"
+    assert wd.sniff_channel(b'{"events":[], "channel": "heartbeats"}') == "heartbeats"
+
+
+def test_decoders_produce_same_tick():
+    ticks = [wd.get_decoder(n).tick(TICKER) for n in wd.available()]
+    assert ticks[0] == wd.Tick("BTC-USD", 100.5, 0.25, 1748563201.0, 100.4, 100.6, 7)
+    assert all(t == ticks[0] for t in ticks)
+
+
+def test_non_ticker_messages_skip_full_decode():
+    calls = []
+    from atlasbot.market_data import _WSClient
+
+    dec = wd.Decoder(loads=lambda m: calls.append(m) or json.loads(m))
+    ticks = []
+    ws = _WSClient("x", [], {}, on_tick_cb=ticks.append, decoder=dec)
+    ws._on_msg(None, '{"type":"heartbeat","sequence":1}')
+    ws._on_msg(None, TICKER)
+    assert len(calls) == 1 and ticks[0].price == 100.5